@@ -0,0 +1,38 @@
+"""
+Helpers shared by the Water Harvesting Flask applications
+(v01/app.py, app_enhanced.py and app_complete_web.py)
+"""
+
+import time
+from datetime import datetime
+from flask.json.provider import JSONProvider
+import orjson
+
+
+class OrjsonProvider(JSONProvider):
+    """JSON provider backed by orjson; jsonify() and request.get_json() use it"""
+
+    def dumps(self, obj, **kwargs) -> str:
+        return orjson.dumps(obj).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(orjson.dumps(obj), mimetype='application/json')
+
+
+# (second, ISO string) for response timestamps; replaced whole so threads see a consistent pair
+_timestamp_cache = (0, '')
+
+
+def iso_timestamp() -> str:
+    """Current local time in ISO format at one-second resolution, formatted once per second"""
+    global _timestamp_cache
+    second = int(time.time())
+    cached_second, timestamp = _timestamp_cache
+    if cached_second != second:
+        timestamp = datetime.fromtimestamp(second).isoformat()
+        _timestamp_cache = (second, timestamp)
+    return timestamp
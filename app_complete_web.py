@@ -4,65 +4,103 @@ Complete Flask application with form-based interface and JSON API
 """
 
 import os
-import json
-from datetime import datetime, timedelta
-from flask import Flask, request, jsonify, render_template, redirect, url_for
+import time
+import functools
+import heapq
+from bisect import bisect_left
+from dataclasses import dataclass
+from flask import Flask, Response, request, jsonify, render_template, redirect, url_for
 from flask_cors import CORS
+from flask_compress import Compress
+import orjson
 import requests
 import math
+from types import MappingProxyType
 from typing import Dict, List, Optional, Tuple
 import logging
+from app_common import OrjsonProvider, iso_timestamp
+from urllib.parse import urlencode
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+
 app = Flask(__name__)
+app.json = OrjsonProvider(app)
 CORS(app)
 
+# Compress the results page and JSON responses (mostly repeated English text)
+app.config['COMPRESS_MIMETYPES'] = ['text/html', 'application/json']
+app.config['COMPRESS_ALGORITHM'] = ['br', 'gzip']
+app.config['COMPRESS_MIN_SIZE'] = 1024
+Compress(app)
+
+# Form analyses are cached per grid cell (2 decimals ~ 1 km) and input set for an hour;
+# rainfall and soil lookups are cached per grid cell for a day
+COORDINATE_PRECISION = 2
+ANALYSIS_CACHE_TTL_SECONDS = 3600
+ANALYSIS_CACHE_SIZE = 4096
+LOCATION_CACHE_TTL_SECONDS = 86400
+LOCATION_CACHE_SIZE = 50000
+
+
+def _cache_window(ttl_seconds: int = ANALYSIS_CACHE_TTL_SECONDS) -> int:
+    """Current TTL window; part of the cache key so entries expire"""
+    return int(time.time() // ttl_seconds)
+
+
+# Discount factors (1 + r) ** year for the 20-year NPV, computed once
+NPV_DISCOUNT_RATE = 0.10
+NPV_PROJECT_LIFE_YEARS = 20
+NPV_DISCOUNT_FACTORS = tuple((1 + NPV_DISCOUNT_RATE) ** year
+                             for year in range(1, NPV_PROJECT_LIFE_YEARS + 1))
+
+
 # Import the enhanced calculator classes from our previous implementation
 class WaterHarvestingCalculator:
     """Enhanced calculation engine for water harvesting analysis"""
 
-    def __init__(self):
-        # Runoff coefficients by roof material
-        self.runoff_coefficients = {
-            'concrete': 0.85,
-            'metal': 0.90,
-            'tile': 0.75,
-            'asbestos': 0.80,
-            'thatch': 0.60,
-            'other': 0.70
-        }
+    __slots__ = ()
 
-        # Collection efficiency by system quality
-        self.collection_efficiency = {
-            'advanced': 0.90,
-            'standard': 0.80,
-            'basic': 0.70
-        }
+    # Runoff coefficients by roof material
+    RUNOFF_COEFFICIENTS = MappingProxyType({
+        'concrete': 0.85,
+        'metal': 0.90,
+        'tile': 0.75,
+        'asbestos': 0.80,
+        'thatch': 0.60,
+        'other': 0.70
+    })
 
-        # Enhanced cost estimates (INR)
-        self.cost_estimates = {
-            'tank_cost_per_liter': 85,
-            'filtration_basic': 25000,
-            'filtration_advanced': 40000,
-            'pump_0_5hp': 12000,
-            'pump_1hp': 18000,
-            'installation_base': 20000,
-            'contingency_factor': 0.10,
-            'recharge_pit_per_cum': 2500,
-            'percolation_tank_per_cum': 1800,
-            'injection_well_base': 45000,
-            'recharge_trench_per_meter': 1200,
-            'check_dam_base': 75000
-        }
+    # Collection efficiency by system quality
+    COLLECTION_EFFICIENCY = MappingProxyType({
+        'advanced': 0.90,
+        'standard': 0.80,
+        'basic': 0.70
+    })
 
-        self.water_pricing = {
-            'urban': 15,
-            'suburban': 12,
-            'rural': 8
-        }
+    # Enhanced cost estimates (INR)
+    COST_ESTIMATES = MappingProxyType({
+        'tank_cost_per_liter': 85,
+        'filtration_basic': 25000,
+        'filtration_advanced': 40000,
+        'pump_0_5hp': 12000,
+        'pump_1hp': 18000,
+        'installation_base': 20000,
+        'contingency_factor': 0.10,
+        'recharge_pit_per_cum': 2500,
+        'percolation_tank_per_cum': 1800,
+        'injection_well_base': 45000,
+        'recharge_trench_per_meter': 1200,
+        'check_dam_base': 75000
+    })
+
+    WATER_PRICING = MappingProxyType({
+        'urban': 15,
+        'suburban': 12,
+        'rural': 8
+    })
 
     def calculate_feasibility_score(self, annual_rainfall: float, roof_area: float, 
                                   soil_data: Dict, household_size: int) -> Dict:
@@ -232,63 +270,7 @@ class WaterHarvestingCalculator:
     def get_aquifer_information(self, lat: float, lng: float, soil_data: Dict) -> Dict:
         """Get principal aquifer information based on location and soil type"""
 
-        aquifer_info = {}
-
-        if 20 <= lat <= 30 and 68 <= lng <= 78:
-            if lng < 74:
-                aquifer_info = {
-                    'principal_aquifer': 'Thar Desert Aquifer System',
-                    'aquifer_type': 'Unconfined to semi-confined',
-                    'lithology': 'Sand and sandstone with clay lenses',
-                    'water_quality': 'Saline to fresh (TDS: 500-5000 mg/L)',
-                    'yield_characteristics': 'Low to moderate (5-20 m³/hr)',
-                    'sustainability': 'Over-exploited in most areas'
-                }
-            else:
-                aquifer_info = {
-                    'principal_aquifer': 'Indo-Gangetic Alluvial Aquifer',
-                    'aquifer_type': 'Unconfined to confined multi-layered',
-                    'lithology': 'Fine to coarse alluvium with clay layers',
-                    'water_quality': 'Fresh to brackish (TDS: 200-1500 mg/L)',
-                    'yield_characteristics': 'High (20-100 m³/hr)',
-                    'sustainability': 'Over-exploited to critical'
-                }
-        elif 18 <= lat <= 25 and 72 <= lng <= 85:
-            aquifer_info = {
-                'principal_aquifer': 'Deccan Trap Aquifer',
-                'aquifer_type': 'Fractured hard rock',
-                'lithology': 'Basaltic lava flows with vesicular zones',
-                'water_quality': 'Fresh to slightly saline (TDS: 300-2000 mg/L)',
-                'yield_characteristics': 'Moderate (10-50 m³/hr)',
-                'sustainability': 'Semi-critical to critical'
-            }
-        elif lat < 18:
-            aquifer_info = {
-                'principal_aquifer': 'Crystalline Rock Aquifer',
-                'aquifer_type': 'Fractured and weathered hard rock',
-                'lithology': 'Granite, gneiss with weathered overburden',
-                'water_quality': 'Fresh (TDS: 200-1000 mg/L)',
-                'yield_characteristics': 'Low to moderate (5-30 m³/hr)',
-                'sustainability': 'Semi-critical to safe'
-            }
-        elif lng > 85:
-            aquifer_info = {
-                'principal_aquifer': 'Bengal Basin Aquifer',
-                'aquifer_type': 'Multi-layered confined/unconfined',
-                'lithology': 'Quaternary alluvium with clay aquitards',
-                'water_quality': 'Fresh but arsenic contamination risk',
-                'yield_characteristics': 'High (30-150 m³/hr)',
-                'sustainability': 'Safe to semi-critical'
-            }
-        else:
-            aquifer_info = {
-                'principal_aquifer': 'Himalayan Rock Aquifer',
-                'aquifer_type': 'Fractured rock with limited storage',
-                'lithology': 'Metamorphic and sedimentary rocks',
-                'water_quality': 'Fresh (TDS: 100-500 mg/L)',
-                'yield_characteristics': 'Low (2-15 m³/hr)',
-                'sustainability': 'Safe but limited availability'
-            }
+        aquifer_info = dict(find_region(AQUIFER_REGIONS, lat, lng, AQUIFER_SYSTEMS['himalayan']))
 
         soil_type = soil_data.get('soil_type', '').lower()
         if 'alluvial' in soil_type:
@@ -306,7 +288,7 @@ class WaterHarvestingCalculator:
                                 roof_material: str) -> Dict:
         """Calculate detailed runoff generation capacity"""
 
-        runoff_coeff = self.runoff_coefficients.get(roof_material.lower(), 0.75)
+        runoff_coeff = self.RUNOFF_COEFFICIENTS.get(roof_material.lower(), 0.75)
         annual_rainfall = rainfall_data.get('annual', 800)
         monthly_distribution = rainfall_data.get('distribution', {})
 
@@ -435,13 +417,11 @@ class WaterHarvestingCalculator:
         else:
             payback_period = float('inf')
 
-        discount_rate = 0.10
-        project_life = 20
+        cash_flow = annual_savings + (recharge_benefit * 0.1)
 
         npv = 0
-        for year in range(1, project_life + 1):
-            cash_flow = annual_savings + (recharge_benefit * 0.1)
-            npv += cash_flow / ((1 + discount_rate) ** year)
+        for discount_factor in NPV_DISCOUNT_FACTORS:
+            npv += cash_flow / discount_factor
 
         npv = npv - system_cost
 
@@ -511,8 +491,8 @@ class WaterHarvestingCalculator:
     def calculate_harvestable_water(self, roof_area_sqft: float, annual_rainfall_mm: float, 
                                   roof_material: str = 'concrete', system_quality: str = 'standard') -> float:
         roof_area_sqm = roof_area_sqft * 0.092903
-        runoff_coeff = self.runoff_coefficients.get(roof_material.lower(), 0.75)
-        collection_eff = self.collection_efficiency.get(system_quality.lower(), 0.80)
+        runoff_coeff = self.RUNOFF_COEFFICIENTS.get(roof_material.lower(), 0.75)
+        collection_eff = self.COLLECTION_EFFICIENCY.get(system_quality.lower(), 0.80)
         harvestable_liters = roof_area_sqm * annual_rainfall_mm * runoff_coeff * collection_eff
         return round(harvestable_liters, 0)
 
@@ -535,18 +515,18 @@ class WaterHarvestingCalculator:
         }
 
     def calculate_system_cost(self, tank_capacity: int, system_type: str = 'standard') -> Dict[str, float]:
-        tank_cost = tank_capacity * self.cost_estimates['tank_cost_per_liter']
+        tank_cost = tank_capacity * self.COST_ESTIMATES['tank_cost_per_liter']
 
         if system_type == 'advanced':
-            filtration_cost = self.cost_estimates['filtration_advanced']
-            pump_cost = self.cost_estimates['pump_1hp']
+            filtration_cost = self.COST_ESTIMATES['filtration_advanced']
+            pump_cost = self.COST_ESTIMATES['pump_1hp']
         else:
-            filtration_cost = self.cost_estimates['filtration_basic']
-            pump_cost = self.cost_estimates['pump_0_5hp']
+            filtration_cost = self.COST_ESTIMATES['filtration_basic']
+            pump_cost = self.COST_ESTIMATES['pump_0_5hp']
 
-        installation_cost = self.cost_estimates['installation_base']
+        installation_cost = self.COST_ESTIMATES['installation_base']
         subtotal = tank_cost + filtration_cost + pump_cost + installation_cost
-        contingency = subtotal * self.cost_estimates['contingency_factor']
+        contingency = subtotal * self.COST_ESTIMATES['contingency_factor']
         total_cost = subtotal + contingency
 
         return {
@@ -562,7 +542,7 @@ class WaterHarvestingCalculator:
                                    region_type: str = 'urban') -> Dict[str, float]:
         utilization_rate = 0.70
         usable_water = annual_harvest * utilization_rate
-        water_rate = self.water_pricing.get(region_type, 12)
+        water_rate = self.WATER_PRICING.get(region_type, 12)
         annual_savings = (usable_water / 1000) * water_rate
 
         payback_period = total_cost / annual_savings if annual_savings > 0 else float('inf')
@@ -583,34 +563,36 @@ class WaterHarvestingCalculator:
 class WeatherDataService:
     """Service to fetch weather and rainfall data"""
 
-    def __init__(self):
-        self.open_meteo_base_url = "https://api.open-meteo.com/v1"
-
-        self.fallback_rainfall_data = {
-            'mumbai': {'annual': 2200, 'distribution': {'jan': 0.1, 'feb': 0.1, 'mar': 0.3, 'apr': 0.5, 'may': 1.8, 'jun': 18.5, 'jul': 28.2, 'aug': 26.8, 'sep': 16.4, 'oct': 4.1, 'nov': 1.3, 'dec': 0.2}},
-            'delhi': {'annual': 797, 'distribution': {'jan': 2.1, 'feb': 2.5, 'mar': 4.2, 'apr': 3.7, 'may': 6.2, 'jun': 18.6, 'jul': 44.7, 'aug': 39.2, 'sep': 22.6, 'oct': 9.2, 'nov': 3.2, 'dec': 1.9}},
-            'bangalore': {'annual': 970, 'distribution': {'jan': 0.3, 'feb': 0.5, 'mar': 2.1, 'apr': 4.8, 'may': 9.2, 'jun': 8.4, 'jul': 9.6, 'aug': 11.2, 'sep': 16.8, 'oct': 18.7, 'nov': 5.2, 'dec': 0.8}},
-            'chennai': {'annual': 1400, 'distribution': {'jan': 1.8, 'feb': 0.7, 'mar': 1.1, 'apr': 2.3, 'may': 4.2, 'jun': 4.8, 'jul': 7.2, 'aug': 9.6, 'sep': 11.2, 'oct': 24.3, 'nov': 28.6, 'dec': 12.1}},
-            'kolkata': {'annual': 1582, 'distribution': {'jan': 0.9, 'feb': 1.8, 'mar': 2.1, 'apr': 3.4, 'may': 7.2, 'jun': 19.8, 'jul': 26.4, 'aug': 25.6, 'sep': 18.9, 'oct': 7.8, 'nov': 1.2, 'dec': 0.3}},
-            'hyderabad': {'annual': 812, 'distribution': {'jan': 0.6, 'feb': 1.2, 'mar': 1.8, 'apr': 2.4, 'may': 4.2, 'jun': 11.2, 'jul': 16.8, 'aug': 17.4, 'sep': 18.2, 'oct': 12.6, 'nov': 2.1, 'dec': 0.8}},
-            'pune': {'annual': 722, 'distribution': {'jan': 0.2, 'feb': 0.3, 'mar': 0.8, 'apr': 1.2, 'may': 2.1, 'jun': 16.8, 'jul': 26.4, 'aug': 24.2, 'sep': 15.6, 'oct': 6.2, 'nov': 1.8, 'dec': 0.4}},
-            'ahmedabad': {'annual': 803, 'distribution': {'jan': 0.3, 'feb': 0.2, 'mar': 0.6, 'apr': 0.8, 'may': 1.2, 'jun': 13.4, 'jul': 28.6, 'aug': 26.8, 'sep': 14.2, 'oct': 2.4, 'nov': 0.8, 'dec': 0.2}},
-            'jaipur': {'annual': 650, 'distribution': {'jan': 1.8, 'feb': 1.2, 'mar': 2.1, 'apr': 2.8, 'may': 4.2, 'jun': 16.2, 'jul': 32.4, 'aug': 28.6, 'sep': 18.4, 'oct': 3.8, 'nov': 1.2, 'dec': 0.8}},
-            'kochi': {'annual': 3055, 'distribution': {'jan': 0.8, 'feb': 1.2, 'mar': 2.4, 'apr': 4.8, 'may': 12.6, 'jun': 21.4, 'jul': 22.8, 'aug': 18.4, 'sep': 11.2, 'oct': 10.8, 'nov': 5.2, 'dec': 1.8}}
-        }
+    __slots__ = ()
+
+    OPEN_METEO_BASE_URL = "https://api.open-meteo.com/v1"
+
+    # Returned as-is in responses, so plain dicts; treat as read-only
+    FALLBACK_RAINFALL_DATA = {
+        'mumbai': {'annual': 2200, 'distribution': {'jan': 0.1, 'feb': 0.1, 'mar': 0.3, 'apr': 0.5, 'may': 1.8, 'jun': 18.5, 'jul': 28.2, 'aug': 26.8, 'sep': 16.4, 'oct': 4.1, 'nov': 1.3, 'dec': 0.2}},
+        'delhi': {'annual': 797, 'distribution': {'jan': 2.1, 'feb': 2.5, 'mar': 4.2, 'apr': 3.7, 'may': 6.2, 'jun': 18.6, 'jul': 44.7, 'aug': 39.2, 'sep': 22.6, 'oct': 9.2, 'nov': 3.2, 'dec': 1.9}},
+        'bangalore': {'annual': 970, 'distribution': {'jan': 0.3, 'feb': 0.5, 'mar': 2.1, 'apr': 4.8, 'may': 9.2, 'jun': 8.4, 'jul': 9.6, 'aug': 11.2, 'sep': 16.8, 'oct': 18.7, 'nov': 5.2, 'dec': 0.8}},
+        'chennai': {'annual': 1400, 'distribution': {'jan': 1.8, 'feb': 0.7, 'mar': 1.1, 'apr': 2.3, 'may': 4.2, 'jun': 4.8, 'jul': 7.2, 'aug': 9.6, 'sep': 11.2, 'oct': 24.3, 'nov': 28.6, 'dec': 12.1}},
+        'kolkata': {'annual': 1582, 'distribution': {'jan': 0.9, 'feb': 1.8, 'mar': 2.1, 'apr': 3.4, 'may': 7.2, 'jun': 19.8, 'jul': 26.4, 'aug': 25.6, 'sep': 18.9, 'oct': 7.8, 'nov': 1.2, 'dec': 0.3}},
+        'hyderabad': {'annual': 812, 'distribution': {'jan': 0.6, 'feb': 1.2, 'mar': 1.8, 'apr': 2.4, 'may': 4.2, 'jun': 11.2, 'jul': 16.8, 'aug': 17.4, 'sep': 18.2, 'oct': 12.6, 'nov': 2.1, 'dec': 0.8}},
+        'pune': {'annual': 722, 'distribution': {'jan': 0.2, 'feb': 0.3, 'mar': 0.8, 'apr': 1.2, 'may': 2.1, 'jun': 16.8, 'jul': 26.4, 'aug': 24.2, 'sep': 15.6, 'oct': 6.2, 'nov': 1.8, 'dec': 0.4}},
+        'ahmedabad': {'annual': 803, 'distribution': {'jan': 0.3, 'feb': 0.2, 'mar': 0.6, 'apr': 0.8, 'may': 1.2, 'jun': 13.4, 'jul': 28.6, 'aug': 26.8, 'sep': 14.2, 'oct': 2.4, 'nov': 0.8, 'dec': 0.2}},
+        'jaipur': {'annual': 650, 'distribution': {'jan': 1.8, 'feb': 1.2, 'mar': 2.1, 'apr': 2.8, 'may': 4.2, 'jun': 16.2, 'jul': 32.4, 'aug': 28.6, 'sep': 18.4, 'oct': 3.8, 'nov': 1.2, 'dec': 0.8}},
+        'kochi': {'annual': 3055, 'distribution': {'jan': 0.8, 'feb': 1.2, 'mar': 2.4, 'apr': 4.8, 'may': 12.6, 'jun': 21.4, 'jul': 22.8, 'aug': 18.4, 'sep': 11.2, 'oct': 10.8, 'nov': 5.2, 'dec': 1.8}}
+    }
 
-    def get_city_from_coordinates(self, lat: float, lng: float) -> str:
-        cities = {
-            'mumbai': (19.0760, 72.8777), 'delhi': (28.6139, 77.2090), 'bangalore': (12.9716, 77.5946),
-            'chennai': (13.0827, 80.2707), 'kolkata': (22.5726, 88.3639), 'hyderabad': (17.3850, 78.4867),
-            'pune': (18.5204, 73.8567), 'ahmedabad': (23.0225, 72.5714), 'jaipur': (26.9124, 75.7873),
-            'kochi': (9.9312, 76.2673)
-        }
+    CITY_COORDINATES = MappingProxyType({
+        'mumbai': (19.0760, 72.8777), 'delhi': (28.6139, 77.2090), 'bangalore': (12.9716, 77.5946),
+        'chennai': (13.0827, 80.2707), 'kolkata': (22.5726, 88.3639), 'hyderabad': (17.3850, 78.4867),
+        'pune': (18.5204, 73.8567), 'ahmedabad': (23.0225, 72.5714), 'jaipur': (26.9124, 75.7873),
+        'kochi': (9.9312, 76.2673)
+    })
 
+    def get_city_from_coordinates(self, lat: float, lng: float) -> str:
         min_distance = float('inf')
         nearest_city = 'delhi'
 
-        for city, (city_lat, city_lng) in cities.items():
+        for city, (city_lat, city_lng) in self.CITY_COORDINATES.items():
             distance = math.sqrt((lat - city_lat)**2 + (lng - city_lng)**2)
             if distance < min_distance:
                 min_distance = distance
@@ -619,91 +601,215 @@ class WeatherDataService:
         return nearest_city
 
     def get_rainfall_data(self, lat: float, lng: float) -> Dict:
+        """Get rainfall data with fallback options (cached per grid cell)"""
+        return self.fetch_rainfall_data(lat, lng)[0]
+
+    def fetch_rainfall_data(self, lat: float, lng: float) -> Tuple[Dict, bool]:
+        """Rainfall data for a location and whether it came from Open-Meteo (False: city fallback)"""
         try:
-            response = requests.get(
-                f"{self.open_meteo_base_url}/historical-weather",
-                params={
-                    'latitude': lat, 'longitude': lng, 'start_date': '2020-01-01',
-                    'end_date': '2023-12-31', 'daily': 'precipitation_sum',
-                    'timezone': 'Asia/Kolkata'
-                }, timeout=10
-            )
-
-            if response.status_code == 200:
-                data = response.json()
-                return self._process_open_meteo_data(data)
-
-        except Exception as e:
+            return self._get_cell_rainfall_data(
+                round(lat, COORDINATE_PRECISION), round(lng, COORDINATE_PRECISION),
+                _cache_window(LOCATION_CACHE_TTL_SECONDS)
+            ), True
+        except (requests.RequestException, ValueError) as e:
             logger.warning(f"Failed to fetch from Open-Meteo: {str(e)}")
 
         nearest_city = self.get_city_from_coordinates(lat, lng)
-        return self.fallback_rainfall_data.get(nearest_city, self.fallback_rainfall_data['delhi'])
-
-    def _process_open_meteo_data(self, data: Dict) -> Dict:
-        try:
-            daily_data = data.get('daily', {})
-            precipitation = daily_data.get('precipitation_sum', [])
-            dates = daily_data.get('time', [])
-
-            if not precipitation or not dates:
-                return self.fallback_rainfall_data['delhi']
-
-            monthly_totals = {month: 0 for month in ['jan', 'feb', 'mar', 'apr', 'may', 'jun', 
-                                                   'jul', 'aug', 'sep', 'oct', 'nov', 'dec']}
-
-            month_names = ['jan', 'feb', 'mar', 'apr', 'may', 'jun', 
-                          'jul', 'aug', 'sep', 'oct', 'nov', 'dec']
+        return self.FALLBACK_RAINFALL_DATA.get(nearest_city, self.FALLBACK_RAINFALL_DATA['delhi']), False
+
+    @functools.lru_cache(maxsize=LOCATION_CACHE_SIZE)
+    def _get_cell_rainfall_data(self, lat: float, lng: float, cache_window: int) -> Dict:
+        """Open-Meteo rainfall for a grid cell; failures raise, so only real results are cached"""
+        response = requests.get(
+            f"{self.OPEN_METEO_BASE_URL}/historical-weather",
+            params={
+                'latitude': lat, 'longitude': lng, 'start_date': '2020-01-01',
+                'end_date': '2023-12-31', 'daily': 'precipitation_sum',
+                'timezone': 'Asia/Kolkata'
+            }, timeout=10
+        )
 
-            for i, date_str in enumerate(dates):
-                if i < len(precipitation):
-                    month_idx = int(date_str.split('-')[1]) - 1
-                    monthly_totals[month_names[month_idx]] += precipitation[i]
+        if response.status_code != 200:
+            raise requests.HTTPError(f"Open-Meteo returned HTTP {response.status_code}")
 
-            annual_total = sum(monthly_totals.values())
-            distribution = {}
-            for month, total in monthly_totals.items():
-                distribution[month] = round((total / annual_total * 100), 1) if annual_total > 0 else 0
+        return self._process_open_meteo_data(response.json())
 
-            return {'annual': round(annual_total, 0), 'distribution': distribution}
+    def _process_open_meteo_data(self, data: Dict) -> Dict:
+        """Monthly distribution from Open-Meteo history; raises ValueError if missing or malformed"""
+        try:
+            daily_data = data.get('daily') or {}
+            precipitation = daily_data.get('precipitation_sum') or []
+            dates = daily_data.get('time') or []
+
+            # Accumulate by month index, then key the result by MONTHS; days without a reading are skipped
+            monthly_totals = [0] * len(MONTHS)
+            for date_str, amount in zip(dates, precipitation):
+                if amount is not None:
+                    monthly_totals[int(date_str.split('-')[1]) - 1] += amount
+        except (AttributeError, TypeError, IndexError) as e:
+            raise ValueError(f"Malformed Open-Meteo data: {e}") from e
+
+        if not precipitation or not dates:
+            raise ValueError("Open-Meteo data has no daily precipitation")
+
+        annual_total = sum(monthly_totals)
+        distribution = {
+            month: round((total / annual_total * 100), 1) if annual_total > 0 else 0
+            for month, total in zip(MONTHS, monthly_totals)
+        }
 
-        except Exception as e:
-            logger.error(f"Error processing Open-Meteo data: {str(e)}")
-            return self.fallback_rainfall_data['delhi']
+        return {'annual': round(annual_total, 0), 'distribution': distribution}
+
+
+# Region tables: inclusive (lat_lo, lat_hi, lng_lo, lng_hi, value) boxes checked
+# in order, first match wins. Strict bounds are encoded with math.nextafter.
+_INF = math.inf
+
+
+def _below(x: float) -> float:
+    return math.nextafter(x, -_INF)
+
+
+def _above(x: float) -> float:
+    return math.nextafter(x, _INF)
+
+
+SOIL_REGIONS = (
+    (20, 30, 68, _below(74), 'desert'),
+    (20, 30, 74, 78, 'alluvial'),
+    (18, 25, 72, 85, 'black'),
+    (8, 18, 75, 80, 'red'),
+    (-_INF, _below(18), _above(75), _INF, 'red'),
+    (_above(25), _INF, _above(85), _INF, 'alluvial'),
+    (_above(28), _INF, -_INF, _INF, 'mountain'),
+)
+
+GROUNDWATER_DEPTH_REGIONS = (
+    (20, 30, -_INF, _below(75), "20-50 meters"),
+    (18, 25, -_INF, _INF, "10-30 meters"),
+    (-_INF, _below(18), -_INF, _INF, "5-20 meters"),
+    (-_INF, _INF, _above(85), _INF, "5-15 meters"),
+)
+
+
+# Principal aquifer systems and the regions they underlie
+AQUIFER_SYSTEMS = {
+    'thar': {
+        'principal_aquifer': 'Thar Desert Aquifer System',
+        'aquifer_type': 'Unconfined to semi-confined',
+        'lithology': 'Sand and sandstone with clay lenses',
+        'water_quality': 'Saline to fresh (TDS: 500-5000 mg/L)',
+        'yield_characteristics': 'Low to moderate (5-20 m³/hr)',
+        'sustainability': 'Over-exploited in most areas'
+    },
+    'indo_gangetic': {
+        'principal_aquifer': 'Indo-Gangetic Alluvial Aquifer',
+        'aquifer_type': 'Unconfined to confined multi-layered',
+        'lithology': 'Fine to coarse alluvium with clay layers',
+        'water_quality': 'Fresh to brackish (TDS: 200-1500 mg/L)',
+        'yield_characteristics': 'High (20-100 m³/hr)',
+        'sustainability': 'Over-exploited to critical'
+    },
+    'deccan': {
+        'principal_aquifer': 'Deccan Trap Aquifer',
+        'aquifer_type': 'Fractured hard rock',
+        'lithology': 'Basaltic lava flows with vesicular zones',
+        'water_quality': 'Fresh to slightly saline (TDS: 300-2000 mg/L)',
+        'yield_characteristics': 'Moderate (10-50 m³/hr)',
+        'sustainability': 'Semi-critical to critical'
+    },
+    'crystalline': {
+        'principal_aquifer': 'Crystalline Rock Aquifer',
+        'aquifer_type': 'Fractured and weathered hard rock',
+        'lithology': 'Granite, gneiss with weathered overburden',
+        'water_quality': 'Fresh (TDS: 200-1000 mg/L)',
+        'yield_characteristics': 'Low to moderate (5-30 m³/hr)',
+        'sustainability': 'Semi-critical to safe'
+    },
+    'bengal': {
+        'principal_aquifer': 'Bengal Basin Aquifer',
+        'aquifer_type': 'Multi-layered confined/unconfined',
+        'lithology': 'Quaternary alluvium with clay aquitards',
+        'water_quality': 'Fresh but arsenic contamination risk',
+        'yield_characteristics': 'High (30-150 m³/hr)',
+        'sustainability': 'Safe to semi-critical'
+    },
+    'himalayan': {
+        'principal_aquifer': 'Himalayan Rock Aquifer',
+        'aquifer_type': 'Fractured rock with limited storage',
+        'lithology': 'Metamorphic and sedimentary rocks',
+        'water_quality': 'Fresh (TDS: 100-500 mg/L)',
+        'yield_characteristics': 'Low (2-15 m³/hr)',
+        'sustainability': 'Safe but limited availability'
+    }
+}
+
+AQUIFER_REGIONS = (
+    (20, 30, 68, _below(74), AQUIFER_SYSTEMS['thar']),
+    (20, 30, 74, 78, AQUIFER_SYSTEMS['indo_gangetic']),
+    (18, 25, 72, 85, AQUIFER_SYSTEMS['deccan']),
+    (-_INF, _below(18), -_INF, _INF, AQUIFER_SYSTEMS['crystalline']),
+    (-_INF, _INF, _above(85), _INF, AQUIFER_SYSTEMS['bengal']),
+)
+
+# Administrative regions (metro boxes first, then broad latitude bands)
+ADMINISTRATIVE_REGIONS = (
+    (28.4, 28.9, 76.8, 77.3, {'state': 'Delhi', 'region': 'National Capital Territory'}),
+    (18.9, 19.3, 72.7, 73.0, {'state': 'Maharashtra', 'region': 'Mumbai Metropolitan'}),
+    (12.8, 13.1, 77.4, 77.8, {'state': 'Karnataka', 'region': 'Bangalore Urban'}),
+    (22.4, 22.7, 88.2, 88.5, {'state': 'West Bengal', 'region': 'Kolkata Metropolitan'}),
+    (13.0, 13.2, 80.1, 80.4, {'state': 'Tamil Nadu', 'region': 'Chennai Metropolitan'}),
+    (28, _INF, -_INF, _INF, {'state': 'Northern India', 'region': 'Himalayan/Plains'}),
+    (-_INF, 15, -_INF, _INF, {'state': 'Southern India', 'region': 'Peninsular'}),
+)
+DEFAULT_ADMINISTRATIVE_REGION = {'state': 'Central India', 'region': 'Deccan Plateau'}
+
+
+def find_region(regions, lat: float, lng: float, default):
+    """Return the value of the first region box containing (lat, lng)"""
+    for lat_lo, lat_hi, lng_lo, lng_hi, value in regions:
+        if lat_lo <= lat <= lat_hi and lng_lo <= lng <= lng_hi:
+            return value
+    return default
+
+
+AQUIFER_PROSPECTS = {
+    'alluvial': 'Excellent', 'black': 'Good', 'red': 'Moderate to Good',
+    'laterite': 'Moderate', 'desert': 'Poor to Moderate', 'mountain': 'Variable'
+}
 
 
 class SoilDataService:
     """Service to get soil and groundwater information"""
 
-    def __init__(self):
-        self.soil_data = {
-            'alluvial': {'infiltration_rate': 'Medium (5-15 mm/hr)', 'suitability': 'Good for both storage and recharge'},
-            'black': {'infiltration_rate': 'Low (1-5 mm/hr)', 'suitability': 'Better for storage systems'},
-            'red': {'infiltration_rate': 'High (15-30 mm/hr)', 'suitability': 'Excellent for recharge'},
-            'laterite': {'infiltration_rate': 'Medium-High (10-20 mm/hr)', 'suitability': 'Good for recharge'},
-            'desert': {'infiltration_rate': 'Very High (20-50 mm/hr)', 'suitability': 'Excellent for recharge'},
-            'mountain': {'infiltration_rate': 'Variable (5-25 mm/hr)', 'suitability': 'Site-specific assessment needed'}
-        }
+    __slots__ = ()
+
+    SOIL_DATA = MappingProxyType({
+        'alluvial': {'infiltration_rate': 'Medium (5-15 mm/hr)', 'suitability': 'Good for both storage and recharge'},
+        'black': {'infiltration_rate': 'Low (1-5 mm/hr)', 'suitability': 'Better for storage systems'},
+        'red': {'infiltration_rate': 'High (15-30 mm/hr)', 'suitability': 'Excellent for recharge'},
+        'laterite': {'infiltration_rate': 'Medium-High (10-20 mm/hr)', 'suitability': 'Good for recharge'},
+        'desert': {'infiltration_rate': 'Very High (20-50 mm/hr)', 'suitability': 'Excellent for recharge'},
+        'mountain': {'infiltration_rate': 'Variable (5-25 mm/hr)', 'suitability': 'Site-specific assessment needed'}
+    })
+
+    # Display labels, built once rather than title-casing on every lookup
+    SOIL_TYPE_LABELS = MappingProxyType({soil_type: soil_type.title() for soil_type in SOIL_DATA})
 
     def get_soil_type(self, lat: float, lng: float) -> Dict:
-        if 20 <= lat <= 30 and 68 <= lng <= 78:
-            soil_type = 'desert' if lng < 74 else 'alluvial'
-        elif 18 <= lat <= 25 and 72 <= lng <= 85:
-            soil_type = 'black'
-        elif 8 <= lat <= 18 and 75 <= lng <= 80:
-            soil_type = 'red'
-        elif lat < 18 and lng > 75:
-            soil_type = 'red'
-        elif lat > 25 and lng > 85:
-            soil_type = 'alluvial'
-        elif lat > 28:
-            soil_type = 'mountain'
-        else:
-            soil_type = 'alluvial'
+        """Get soil type based on geographical location (cached per grid cell)"""
+        return self._get_cell_soil_type(
+            round(lat, COORDINATE_PRECISION), round(lng, COORDINATE_PRECISION),
+            _cache_window(LOCATION_CACHE_TTL_SECONDS)
+        )
 
-        soil_info = self.soil_data.get(soil_type, self.soil_data['alluvial'])
+    @functools.lru_cache(maxsize=LOCATION_CACHE_SIZE)
+    def _get_cell_soil_type(self, lat: float, lng: float, cache_window: int) -> Dict:
+        soil_type = find_region(SOIL_REGIONS, lat, lng, 'alluvial')
+        soil_info = self.SOIL_DATA.get(soil_type, self.SOIL_DATA['alluvial'])
 
         return {
-            'soil_type': soil_type.title(),
+            'soil_type': self.SOIL_TYPE_LABELS[soil_type],
             'infiltration_rate': soil_info['infiltration_rate'],
             'recharge_suitability': soil_info['suitability'],
             'groundwater_depth': self._estimate_groundwater_depth(lat, lng),
@@ -711,23 +817,10 @@ class SoilDataService:
         }
 
     def _estimate_groundwater_depth(self, lat: float, lng: float) -> str:
-        if 20 <= lat <= 30 and lng < 75:
-            return "20-50 meters"
-        elif 18 <= lat <= 25:
-            return "10-30 meters"
-        elif lat < 18:
-            return "5-20 meters"
-        elif lng > 85:
-            return "5-15 meters"
-        else:
-            return "10-25 meters"
+        return find_region(GROUNDWATER_DEPTH_REGIONS, lat, lng, "10-25 meters")
 
     def _assess_aquifer_prospects(self, soil_type: str) -> str:
-        prospects = {
-            'alluvial': 'Excellent', 'black': 'Good', 'red': 'Moderate to Good',
-            'laterite': 'Moderate', 'desert': 'Poor to Moderate', 'mountain': 'Variable'
-        }
-        return prospects.get(soil_type, 'Moderate')
+        return AQUIFER_PROSPECTS.get(soil_type, 'Moderate')
 
 
 # Create service instances
@@ -739,6 +832,18 @@ print("Enhanced services initialized successfully!")
 
 
 # Helper functions for the web interface
+def form_value(form_data, name: str, cast, default=None):
+    """Read one form field and convert it with cast, naming the field on failure"""
+    value = form_data.get(name, default)
+    try:
+        return cast(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"Invalid value for {name}: {value!r}") from None
+
+# Fields the form must supply; everything else has a default
+REQUIRED_FORM_FIELDS = ('latitude', 'longitude', 'roof_area_sqft')
+
+
 def process_form_data(form_data):
     """Process form data and convert to API format"""
 
@@ -749,20 +854,20 @@ def process_form_data(form_data):
     # Convert form data to API request format
     api_request = {
         'location': {
-            'lat': float(form_data.get('latitude')),
-            'lng': float(form_data.get('longitude')),
+            'lat': form_value(form_data, 'latitude', float),
+            'lng': form_value(form_data, 'longitude', float),
             'address': form_data.get('address', '')
         },
         'property': {
             'type': form_data.get('property_type', 'residential'),
-            'roof_area_sqft': float(form_data.get('roof_area_sqft')),
-            'plot_area_sqft': float(form_data.get('plot_area_sqft', 0)) or None,
-            'floors': int(form_data.get('floors', 2)),
+            'roof_area_sqft': form_value(form_data, 'roof_area_sqft', float),
+            'plot_area_sqft': form_value(form_data, 'plot_area_sqft', float, 0) or None,
+            'floors': form_value(form_data, 'floors', int, 2),
             'roof_material': form_data.get('roof_material', 'concrete')
         },
         'usage': {
-            'household_size': int(form_data.get('household_size', 4)),
-            'daily_consumption_liters': int(form_data.get('daily_consumption', 600)) if form_data.get('daily_consumption') else None,
+            'household_size': form_value(form_data, 'household_size', int, 4),
+            'daily_consumption_liters': form_value(form_data, 'daily_consumption', int) if form_data.get('daily_consumption') else None,
             'current_sources': current_sources,
             'intended_use': intended_use
         },
@@ -780,36 +885,29 @@ def process_form_data(form_data):
 def determine_administrative_region(lat: float, lng: float) -> Dict:
     """Determine administrative region for regulatory info"""
 
-    if 28.4 <= lat <= 28.9 and 76.8 <= lng <= 77.3:
-        return {'state': 'Delhi', 'region': 'National Capital Territory'}
-    elif 18.9 <= lat <= 19.3 and 72.7 <= lng <= 73.0:
-        return {'state': 'Maharashtra', 'region': 'Mumbai Metropolitan'}
-    elif 12.8 <= lat <= 13.1 and 77.4 <= lng <= 77.8:
-        return {'state': 'Karnataka', 'region': 'Bangalore Urban'}
-    elif 22.4 <= lat <= 22.7 and 88.2 <= lng <= 88.5:
-        return {'state': 'West Bengal', 'region': 'Kolkata Metropolitan'}
-    elif 13.0 <= lat <= 13.2 and 80.1 <= lng <= 80.4:
-        return {'state': 'Tamil Nadu', 'region': 'Chennai Metropolitan'}
-    else:
-        if lat >= 28:
-            return {'state': 'Northern India', 'region': 'Himalayan/Plains'}
-        elif lat <= 15:
-            return {'state': 'Southern India', 'region': 'Peninsular'}
-        else:
-            return {'state': 'Central India', 'region': 'Deccan Plateau'}
+    return find_region(ADMINISTRATIVE_REGIONS, lat, lng, DEFAULT_ADMINISTRATIVE_REGION)
+
+# Month keys in calendar order and the seasons as slices over them
+MONTHS = ('jan', 'feb', 'mar', 'apr', 'may', 'jun',
+          'jul', 'aug', 'sep', 'oct', 'nov', 'dec')
+WINTER = slice(0, 2)
+PRE_MONSOON = slice(2, 5)
+MONSOON = slice(5, 9)
+POST_MONSOON = slice(9, 12)
+
 
-def analyze_monsoon_pattern(distribution: Dict) -> Dict:
-    """Analyze monsoon characteristics"""
+def monthly_values(distribution: Dict) -> Tuple[float, ...]:
+    """Monthly distribution as a tuple in calendar order (missing months are 0)"""
+    return tuple(distribution.get(month, 0) for month in MONTHS)
 
-    monsoon_months = ['jun', 'jul', 'aug', 'sep']
-    pre_monsoon = ['mar', 'apr', 'may']
-    post_monsoon = ['oct', 'nov', 'dec']
-    winter = ['jan', 'feb']
 
-    monsoon_total = sum(distribution.get(month, 0) for month in monsoon_months)
-    pre_monsoon_total = sum(distribution.get(month, 0) for month in pre_monsoon)
-    post_monsoon_total = sum(distribution.get(month, 0) for month in post_monsoon)
-    winter_total = sum(distribution.get(month, 0) for month in winter)
+def analyze_monsoon_pattern(values: Tuple[float, ...]) -> Dict:
+    """Analyze monsoon characteristics from monthly_values()"""
+
+    monsoon_total = sum(values[MONSOON])
+    pre_monsoon_total = sum(values[PRE_MONSOON])
+    post_monsoon_total = sum(values[POST_MONSOON])
+    winter_total = sum(values[WINTER])
 
     return {
         'monsoon_concentration_percent': round(monsoon_total, 1),
@@ -830,16 +928,15 @@ def determine_pattern_type(monsoon_percent: float, post_monsoon_percent: float)
     else:
         return "Monsoon with Extended Season"
 
-def determine_collection_window(distribution: Dict) -> Dict:
-    """Determine optimal collection window"""
+def determine_collection_window(values: Tuple[float, ...]) -> Dict:
+    """Determine optimal collection window from monthly_values()"""
 
-    significant_months = [month for month, pct in distribution.items() if pct > 10]
-    all_months = ['jan', 'feb', 'mar', 'apr', 'may', 'jun', 'jul', 'aug', 'sep', 'oct', 'nov', 'dec']
-    collection_months = [month for month in all_months if distribution.get(month, 0) > 5]
+    significant_months = [month for month, pct in zip(MONTHS, values) if pct > 10]
+    collection_months = sum(1 for pct in values if pct > 5)
 
-    if len(collection_months) >= 4:
+    if collection_months >= 4:
         collection_season = "Extended (4+ months)"
-    elif len(collection_months) >= 2:
+    elif collection_months >= 2:
         collection_season = "Moderate (2-3 months)"
     else:
         collection_season = "Short (1-2 months)"
@@ -847,23 +944,26 @@ def determine_collection_window(distribution: Dict) -> Dict:
     return {
         'primary_collection_months': significant_months,
         'collection_season_type': collection_season,
-        'optimal_storage_period': f"{len(collection_months)} months",
-        'storage_strategy': get_storage_strategy(len(collection_months))
+        'optimal_storage_period': f"{collection_months} months",
+        'storage_strategy': get_storage_strategy(collection_months)
     }
 
+# Storage strategies for collection windows of <=2, <=4 and more months
+STORAGE_STRATEGY_LIMITS = (2, 4)
+STORAGE_STRATEGIES = (
+    "Large storage capacity needed for dry season supply",
+    "Moderate storage with seasonal usage planning",
+    "Smaller storage with continuous harvesting approach"
+)
+
+
 def get_storage_strategy(collection_months: int) -> str:
     """Get recommended storage strategy"""
-    if collection_months <= 2:
-        return "Large storage capacity needed for dry season supply"
-    elif collection_months <= 4:
-        return "Moderate storage with seasonal usage planning"
-    else:
-        return "Smaller storage with continuous harvesting approach"
+    return STORAGE_STRATEGIES[bisect_left(STORAGE_STRATEGY_LIMITS, collection_months)]
 
-def get_peak_rainfall_months(distribution):
-    """Get peak rainfall months from distribution"""
-    sorted_months = sorted(distribution.items(), key=lambda x: x[1], reverse=True)
-    return [month for month, _ in sorted_months[:3]]
+def get_peak_rainfall_months(values: Tuple[float, ...]) -> List[str]:
+    """Get peak rainfall months from monthly_values()"""
+    return [MONTHS[i] for i in heapq.nlargest(3, range(len(MONTHS)), key=values.__getitem__)]
 
 def generate_enhanced_system_recommendations(roof_area, annual_harvest, storage_sizes, 
                                            cost_analysis, soil_data, feasibility):
@@ -918,139 +1018,169 @@ def generate_enhanced_system_recommendations(roof_area, annual_harvest, storage_
 
     return recommendations
 
-def get_feasibility_improvements(score_breakdown: Dict) -> List[str]:
-    """Get suggestions to improve feasibility"""
-    suggestions = []
-
-    if score_breakdown.get('rainfall', 0) < 15:
-        suggestions.append("Consider water-efficient appliances to maximize limited rainfall")
-
-    if score_breakdown.get('roof_area', 0) < 15:
-        suggestions.append("Explore community or neighborhood-level harvesting")
+# Improvement suggestion for each feasibility factor scoring below LOW_FACTOR_SCORE
+LOW_FACTOR_SCORE = 15
+FEASIBILITY_IMPROVEMENTS = (
+    ('rainfall', "Consider water-efficient appliances to maximize limited rainfall"),
+    ('roof_area', "Explore community or neighborhood-level harvesting"),
+    ('soil_suitability', "Focus on storage systems rather than recharge"),
+    ('water_demand', "Implement water conservation measures before RTRWH")
+)
 
-    if score_breakdown.get('soil_suitability', 0) < 15:
-        suggestions.append("Focus on storage systems rather than recharge")
 
-    if score_breakdown.get('water_demand', 0) < 15:
-        suggestions.append("Implement water conservation measures before RTRWH")
+def get_feasibility_improvements(score_breakdown: Dict) -> List[str]:
+    """Get suggestions to improve feasibility"""
+    suggestions = [suggestion for factor, suggestion in FEASIBILITY_IMPROVEMENTS
+                   if score_breakdown.get(factor, 0) < LOW_FACTOR_SCORE]
 
     if not suggestions:
         suggestions.append("Excellent conditions - proceed with confidence")
 
     return suggestions
 
+# Implementation phases as (phase template, share of total cost, deliverables)
+ENHANCED_IMPLEMENTATION_PHASES = (
+    ({
+        'phase': 1,
+        'name': 'Site Assessment and Design',
+        'duration': '1-2 weeks',
+        'activities': [
+            'Detailed site survey and soil testing',
+            'Structural assessment of roof and foundation',
+            'Final system design and engineering drawings',
+            'Permit applications and approvals'
+        ]
+    }, 0.12,
+     ['Technical drawings', 'Material specifications', 'Work permits']),
+    ({
+        'phase': 2,
+        'name': 'Material Procurement and Preparation',
+        'duration': '1 week',
+        'activities': [
+            'Purchase tanks, pipes, and filtration equipment',
+            'Quality inspection of materials',
+            'Site preparation and temporary arrangements',
+            'Contractor mobilization'
+        ]
+    }, 0.08,
+     ['Material delivery', 'Site readiness', 'Team deployment']),
+    ({
+        'phase': 3,
+        'name': 'Primary Installation',
+        'duration': '2-3 weeks',
+        'activities': [
+            'Excavation and foundation work',
+            'Tank installation and positioning',
+            'Plumbing network installation',
+            'Electrical connections and controls'
+        ]
+    }, 0.55,
+     ['Installed storage system', 'Connected plumbing', 'Basic testing']),
+    ({
+        'phase': 4,
+        'name': 'Filtration and Recharge Systems',
+        'duration': '1-2 weeks',
+        'activities': [
+            'Filtration system installation',
+            'Recharge pit/trench construction',
+            'Pump and automation setup',
+            'System integration and calibration'
+        ]
+    }, 0.15,
+     ['Complete filtration setup', 'Recharge structures', 'Automated controls']),
+    ({
+        'phase': 5,
+        'name': 'Testing and Commissioning',
+        'duration': '1 week',
+        'activities': [
+            'Comprehensive system testing',
+            'Water quality analysis',
+            'Performance optimization',
+            'User training and documentation handover'
+        ]
+    }, 0.10,
+     ['Performance report', 'Quality certificates', 'User manual'])
+)
+
+
 def generate_enhanced_implementation_plan(total_cost, structure_recommendations):
     """Generate enhanced implementation plan"""
 
     return {
         'total_duration': '6-8 weeks',
         'project_phases': [
-            {
-                'phase': 1,
-                'name': 'Site Assessment and Design',
-                'duration': '1-2 weeks',
-                'activities': [
-                    'Detailed site survey and soil testing',
-                    'Structural assessment of roof and foundation',
-                    'Final system design and engineering drawings',
-                    'Permit applications and approvals'
-                ],
-                'estimated_cost': round(total_cost * 0.12),
-                'deliverables': ['Technical drawings', 'Material specifications', 'Work permits']
-            },
-            {
-                'phase': 2,
-                'name': 'Material Procurement and Preparation',
-                'duration': '1 week',
-                'activities': [
-                    'Purchase tanks, pipes, and filtration equipment',
-                    'Quality inspection of materials',
-                    'Site preparation and temporary arrangements',
-                    'Contractor mobilization'
-                ],
-                'estimated_cost': round(total_cost * 0.08),
-                'deliverables': ['Material delivery', 'Site readiness', 'Team deployment']
-            },
-            {
-                'phase': 3,
-                'name': 'Primary Installation',
-                'duration': '2-3 weeks',
-                'activities': [
-                    'Excavation and foundation work',
-                    'Tank installation and positioning',
-                    'Plumbing network installation',
-                    'Electrical connections and controls'
-                ],
-                'estimated_cost': round(total_cost * 0.55),
-                'deliverables': ['Installed storage system', 'Connected plumbing', 'Basic testing']
-            },
-            {
-                'phase': 4,
-                'name': 'Filtration and Recharge Systems',
-                'duration': '1-2 weeks',
-                'activities': [
-                    'Filtration system installation',
-                    'Recharge pit/trench construction',
-                    'Pump and automation setup',
-                    'System integration and calibration'
-                ],
-                'estimated_cost': round(total_cost * 0.15),
-                'deliverables': ['Complete filtration setup', 'Recharge structures', 'Automated controls']
-            },
-            {
-                'phase': 5,
-                'name': 'Testing and Commissioning',
-                'duration': '1 week',
-                'activities': [
-                    'Comprehensive system testing',
-                    'Water quality analysis',
-                    'Performance optimization',
-                    'User training and documentation handover'
-                ],
-                'estimated_cost': round(total_cost * 0.10),
-                'deliverables': ['Performance report', 'Quality certificates', 'User manual']
-            }
+            {**phase, 'estimated_cost': round(total_cost * cost_share), 'deliverables': deliverables}
+            for phase, cost_share, deliverables in ENHANCED_IMPLEMENTATION_PHASES
         ]
     }
 
-def generate_maintenance_schedule():
-    """Generate comprehensive maintenance schedule"""
-
-    return {
-        'routine_maintenance': {
-            'weekly_during_monsoon': [
-                'Clean gutters and remove debris',
-                'Check first flush diverter operation',
-                'Inspect roof surface for damage',
-                'Monitor water levels and quality'
-            ],
-            'monthly_throughout_year': [
-                'Clean mesh filters and leaf guards',
-                'Test pump operation and pressure',
-                'Check pipe joints for leaks',
-                'Inspect storage tank exterior'
-            ],
-            'quarterly_maintenance': [
-                'Replace/clean filter media',
-                'Comprehensive system performance check',
-                'Water quality testing (pH, TDS, bacteria)',
-                'Electrical connections inspection'
-            ]
-        },
-        'annual_major_maintenance': [
-            'Complete tank cleaning and disinfection',
-            'Professional system audit and optimization',
-            'Pump servicing and electrical safety check',
-            'Structural inspection of all components',
-            'Performance evaluation and upgrade recommendations'
+# Static response sections, shared by every response (treat as read-only)
+MAINTENANCE_SCHEDULE = {
+    'routine_maintenance': {
+        'weekly_during_monsoon': [
+            'Clean gutters and remove debris',
+            'Check first flush diverter operation',
+            'Inspect roof surface for damage',
+            'Monitor water levels and quality'
         ],
-        'cost_estimates': {
-            'routine_monthly_cost': '₹500-800',
-            'quarterly_maintenance': '₹1,500-2,500',  
-            'annual_major_service': '₹8,000-12,000',
-            'total_annual_budget': '₹15,000-20,000'
-        }
+        'monthly_throughout_year': [
+            'Clean mesh filters and leaf guards',
+            'Test pump operation and pressure',
+            'Check pipe joints for leaks',
+            'Inspect storage tank exterior'
+        ],
+        'quarterly_maintenance': [
+            'Replace/clean filter media',
+            'Comprehensive system performance check',
+            'Water quality testing (pH, TDS, bacteria)',
+            'Electrical connections inspection'
+        ]
+    },
+    'annual_major_maintenance': [
+        'Complete tank cleaning and disinfection',
+        'Professional system audit and optimization',
+        'Pump servicing and electrical safety check',
+        'Structural inspection of all components',
+        'Performance evaluation and upgrade recommendations'
+    ],
+    'cost_estimates': {
+        'routine_monthly_cost': '₹500-800',
+        'quarterly_maintenance': '₹1,500-2,500',
+        'annual_major_service': '₹8,000-12,000',
+        'total_annual_budget': '₹15,000-20,000'
     }
+}
+
+GROUNDWATER_RECHARGE_NOTES = {
+    'aquifer_benefit': 'Enhanced local groundwater levels',
+    'sustainability_impact': 'Reduced pressure on municipal supply'
+}
+FLOOD_MITIGATION_IMPACT = {
+    'runoff_reduction_percent': '60-80%',
+    'urban_flooding_benefit': 'Reduced peak flow in storm drains',
+    'erosion_control': 'Minimized soil erosion from roof runoff'
+}
+CARBON_REDUCTION_NOTES = {
+    'energy_savings': 'Reduced pumping for municipal water',
+    'transport_savings': 'Eliminated water tanker dependency'
+}
+ECOSYSTEM_BENEFITS = [
+    'Enhanced local microclimate',
+    'Reduced heat island effect',
+    'Support for local vegetation',
+    'Improved water cycle balance'
+]
+LONG_TERM_SUSTAINABILITY = {
+    'water_security_enhancement': 'High',
+    'climate_resilience_building': 'Moderate to High',
+    'community_impact': 'Positive demonstration effect',
+    'scalability_potential': 'High for similar properties'
+}
+
+
+def generate_maintenance_schedule():
+    """Generate comprehensive maintenance schedule"""
+    return MAINTENANCE_SCHEDULE
 
 def assess_environmental_impact(annual_harvest: float, recharge_benefit: float):
     """Assess environmental impact and benefits"""
@@ -1059,230 +1189,351 @@ def assess_environmental_impact(annual_harvest: float, recharge_benefit: float):
         'positive_impacts': {
             'groundwater_recharge': {
                 'annual_recharge_liters': round(annual_harvest * 0.3, 0),
-                'aquifer_benefit': 'Enhanced local groundwater levels',
-                'sustainability_impact': 'Reduced pressure on municipal supply'
-            },
-            'flood_mitigation': {
-                'runoff_reduction_percent': '60-80%',
-                'urban_flooding_benefit': 'Reduced peak flow in storm drains',
-                'erosion_control': 'Minimized soil erosion from roof runoff'
+                **GROUNDWATER_RECHARGE_NOTES
             },
+            'flood_mitigation': FLOOD_MITIGATION_IMPACT,
             'carbon_footprint_reduction': {
                 'annual_co2_savings_kg': round(annual_harvest * 0.006, 1),
-                'energy_savings': 'Reduced pumping for municipal water',
-                'transport_savings': 'Eliminated water tanker dependency'
+                **CARBON_REDUCTION_NOTES
             }
         },
-        'ecosystem_benefits': [
-            'Enhanced local microclimate',
-            'Reduced heat island effect',
-            'Support for local vegetation',
-            'Improved water cycle balance'
+        'ecosystem_benefits': ECOSYSTEM_BENEFITS,
+        'long_term_sustainability': LONG_TERM_SUSTAINABILITY
+    }
+
+# Regulatory information by state from ADMINISTRATIVE_REGIONS; returned as-is,
+# so treat as read-only
+STATE_REGULATORY_INFO = {
+    'Delhi': {
+        'local_mandate': 'Mandatory for plots >100 sq m under Delhi Building Bye-laws',
+        'authority': 'Delhi Jal Board and DDA',
+        'required_permits': ['Building plan approval', 'DJB NoC', 'Electrical safety clearance'],
+        'available_subsidies': [
+            {'scheme': 'DJB RTRWH Subsidy', 'amount': '₹15,000', 'eligibility': 'Residential properties'},
+            {'scheme': 'Delhi Solar Policy', 'amount': '₹5,000', 'eligibility': 'With solar integration'}
         ],
-        'long_term_sustainability': {
-            'water_security_enhancement': 'High',
-            'climate_resilience_building': 'Moderate to High',
-            'community_impact': 'Positive demonstration effect',
-            'scalability_potential': 'High for similar properties'
-        }
+        'compliance_timeline': 'Must be completed before occupancy certificate',
+        'penalties': 'Water connection may be disconnected for non-compliance',
+        'technical_standards': 'As per CPWD guidelines and IS codes',
+        'inspection_requirements': 'Pre-monsoon system check mandatory'
+    },
+    'Maharashtra': {
+        'local_mandate': 'Compulsory for plots >300 sq m in Mumbai, >500 sq m in other cities',
+        'authority': 'Maharashtra Water Resources Department',
+        'required_permits': ['Municipal building approval', 'Water supply NOC'],
+        'available_subsidies': [
+            {'scheme': 'Jal Yukt Shivar', 'amount': '₹10,000-25,000', 'eligibility': 'Rural and semi-urban'}
+        ],
+        'compliance_timeline': 'Within 6 months of building construction',
+        'technical_standards': 'Maharashtra RTRWH guidelines 2019',
+        'inspection_requirements': 'Annual compliance certificate'
     }
+}
 
-def generate_enhanced_regulatory_info(lat: float, lng: float):
-    """Generate enhanced regulatory information"""
+DEFAULT_REGULATORY_INFO = {
+    'local_mandate': 'Check with local municipal corporation/panchayat',
+    'authority': 'State Water Resources Department',
+    'required_permits': ['Building plan approval', 'Local body NOC'],
+    'available_subsidies': 'Contact state/district water authority',
+    'compliance_timeline': 'Usually before occupancy certificate',
+    'technical_standards': 'Follow BIS and CPWD guidelines',
+    'inspection_requirements': 'As per local regulations'
+}
 
-    admin_region = determine_administrative_region(lat, lng)
-    state = admin_region.get('state', 'Unknown')
 
-    if 'Delhi' in state:
-        return {
-            'local_mandate': 'Mandatory for plots >100 sq m under Delhi Building Bye-laws',
-            'authority': 'Delhi Jal Board and DDA',
-            'required_permits': ['Building plan approval', 'DJB NoC', 'Electrical safety clearance'],
-            'available_subsidies': [
-                {'scheme': 'DJB RTRWH Subsidy', 'amount': '₹15,000', 'eligibility': 'Residential properties'},
-                {'scheme': 'Delhi Solar Policy', 'amount': '₹5,000', 'eligibility': 'With solar integration'}
-            ],
-            'compliance_timeline': 'Must be completed before occupancy certificate',
-            'penalties': 'Water connection may be disconnected for non-compliance',
-            'technical_standards': 'As per CPWD guidelines and IS codes',
-            'inspection_requirements': 'Pre-monsoon system check mandatory'
-        }
-    elif 'Maharashtra' in state:
-        return {
-            'local_mandate': 'Compulsory for plots >300 sq m in Mumbai, >500 sq m in other cities',
-            'authority': 'Maharashtra Water Resources Department',
-            'required_permits': ['Municipal building approval', 'Water supply NOC'],
-            'available_subsidies': [
-                {'scheme': 'Jal Yukt Shivar', 'amount': '₹10,000-25,000', 'eligibility': 'Rural and semi-urban'}
-            ],
-            'compliance_timeline': 'Within 6 months of building construction',
-            'technical_standards': 'Maharashtra RTRWH guidelines 2019',
-            'inspection_requirements': 'Annual compliance certificate'
-        }
-    else:
-        return {
-            'local_mandate': 'Check with local municipal corporation/panchayat',
-            'authority': 'State Water Resources Department',
-            'required_permits': ['Building plan approval', 'Local body NOC'],
-            'available_subsidies': 'Contact state/district water authority',
-            'compliance_timeline': 'Usually before occupancy certificate',
-            'technical_standards': 'Follow BIS and CPWD guidelines',
-            'inspection_requirements': 'As per local regulations'
-        }
-
-
-# Web Routes
-@app.route('/')
-def index():
-    """Home page with the form"""
-    return render_template('form.html')
+def generate_enhanced_regulatory_info(lat: float, lng: float):
+    """Generate enhanced regulatory information"""
 
-@app.route('/analyze', methods=['POST'])
-def analyze_form():
-    """Process form submission and show results"""
+    state = determine_administrative_region(lat, lng).get('state', 'Unknown')
+    return STATE_REGULATORY_INFO.get(state, DEFAULT_REGULATORY_INFO)
+
+
+@dataclass
+class HarvestCore:
+    """Rainfall, soil and storage sizing for one site, shared by the full analysis and the JSON API"""
+    rainfall_data: Dict
+    soil_data: Dict
+    annual_harvest: float
+    monthly_harvest: Dict
+    storage_sizes: Dict
+    cost_analysis: Dict
+    from_open_meteo: bool
+
+
+def compute_harvest_core(lat: float, lng: float, roof_area_sqft: float,
+                         system_type: str, roof_material: str) -> HarvestCore:
+    """Harvest potential, storage and cost for a site (rainfall and soil lookups are cached)"""
+    rainfall_data, from_open_meteo = weather_service.fetch_rainfall_data(lat, lng)
+    soil_data = soil_service.get_soil_type(lat, lng)
+
+    annual_harvest = calculator.calculate_harvestable_water(
+        roof_area_sqft=roof_area_sqft,
+        annual_rainfall_mm=rainfall_data['annual'],
+        roof_material=roof_material,
+        system_quality=system_type
+    )
+
+    monthly_harvest = calculator.calculate_monthly_potential(
+        annual_harvest, rainfall_data['distribution']
+    )
+
+    storage_sizes = calculator.calculate_optimal_storage_size(monthly_harvest)
+    cost_analysis = calculator.calculate_system_cost(storage_sizes['optimal_liters'], system_type)
+
+    return HarvestCore(
+        rainfall_data=rainfall_data,
+        soil_data=soil_data,
+        annual_harvest=annual_harvest,
+        monthly_harvest=monthly_harvest,
+        storage_sizes=storage_sizes,
+        cost_analysis=cost_analysis,
+        from_open_meteo=from_open_meteo
+    )
+
+
+@dataclass
+class AnalysisBundle:
+    """Intermediate results of one full analysis, shared by the form and API views"""
+    lat: float
+    lng: float
+    rainfall_data: Dict
+    monthly_rainfall: Tuple[float, ...]
+    soil_data: Dict
+    feasibility_analysis: Dict
+    annual_harvest: float
+    runoff_capacity: Dict
+    monthly_harvest: Dict
+    storage_sizes: Dict
+    structure_recommendations: Dict
+    aquifer_info: Dict
+    recharge_designs: Dict
+    cost_analysis: Dict
+    basic_financial: Dict
+    recharge_benefit: float
+    enhanced_cost_benefit: Dict
+    system_recommendations: Dict
+    implementation_plan: Dict
+
+
+class _UncachedAnalysis(Exception):
+    """Carries an analysis out of _compute_full_analysis so lru_cache does not keep it"""
+
+    def __init__(self, analysis: AnalysisBundle):
+        super().__init__()
+        self.analysis = analysis
+
+
+@functools.lru_cache(maxsize=ANALYSIS_CACHE_SIZE)
+def _compute_full_analysis(lat: float, lng: float, roof_area_sqft: float, household_size: int,
+                           system_type: str, region_type: str, roof_material: str, budget_range: str,
+                           plot_area_sqft: Optional[float], cache_window: int) -> AnalysisBundle:
+    """Run the full analysis for a grid cell and input set (cached; treat as read-only).
+
+    Analyses built on city fallback rainfall are raised as _UncachedAnalysis instead, so the
+    next request retries Open-Meteo rather than reusing them for the whole cache window.
+    """
+
+    core = compute_harvest_core(lat, lng, roof_area_sqft, system_type, roof_material)
+    rainfall_data = core.rainfall_data
+    soil_data = core.soil_data
+    annual_harvest = core.annual_harvest
+    monthly_harvest = core.monthly_harvest
+    storage_sizes = core.storage_sizes
+    cost_analysis = core.cost_analysis
+
+    # Perform comprehensive analysis
+    feasibility_analysis = calculator.calculate_feasibility_score(
+        annual_rainfall=rainfall_data['annual'],
+        roof_area=roof_area_sqft,
+        soil_data=soil_data,
+        household_size=household_size
+    )
+
+    runoff_capacity = calculator.calculate_runoff_capacity(
+        roof_area=roof_area_sqft,
+        rainfall_data=rainfall_data,
+        roof_material=roof_material
+    )
+
+    structure_recommendations = calculator.suggest_rtrwh_structures(
+        annual_harvest=annual_harvest,
+        soil_data=soil_data,
+        roof_area=roof_area_sqft,
+        budget=budget_range
+    )
+
+    aquifer_info = calculator.get_aquifer_information(lat, lng, soil_data)
+
+    recharge_designs = calculator.design_recharge_structures(
+        annual_runoff=annual_harvest,
+        soil_data=soil_data,
+        available_space=plot_area_sqft
+    )
+
+    basic_financial = calculator.calculate_financial_analysis(
+        annual_harvest, cost_analysis['total_cost'], region_type
+    )
+
+    recharge_benefit = annual_harvest * 0.3 * 2
+    enhanced_cost_benefit = calculator.enhanced_cost_benefit_analysis(
+        system_cost=cost_analysis['total_cost'],
+        annual_harvest=annual_harvest,
+        annual_savings=basic_financial['annual_cost_savings_inr'],
+        recharge_benefit=recharge_benefit
+    )
+
+    system_recommendations = generate_enhanced_system_recommendations(
+        roof_area_sqft, annual_harvest, storage_sizes, cost_analysis,
+        soil_data, feasibility_analysis
+    )
+
+    implementation_plan = generate_enhanced_implementation_plan(
+        cost_analysis['total_cost'], structure_recommendations
+    )
+
+    analysis = AnalysisBundle(
+        lat=lat,
+        lng=lng,
+        rainfall_data=rainfall_data,
+        monthly_rainfall=monthly_values(rainfall_data['distribution']),
+        soil_data=soil_data,
+        feasibility_analysis=feasibility_analysis,
+        annual_harvest=annual_harvest,
+        runoff_capacity=runoff_capacity,
+        monthly_harvest=monthly_harvest,
+        storage_sizes=storage_sizes,
+        structure_recommendations=structure_recommendations,
+        aquifer_info=aquifer_info,
+        recharge_designs=recharge_designs,
+        cost_analysis=cost_analysis,
+        basic_financial=basic_financial,
+        recharge_benefit=recharge_benefit,
+        enhanced_cost_benefit=enhanced_cost_benefit,
+        system_recommendations=system_recommendations,
+        implementation_plan=implementation_plan
+    )
+    if not core.from_open_meteo:
+        raise _UncachedAnalysis(analysis)
+    return analysis
+
+
+def run_analysis(api_request: Dict) -> AnalysisBundle:
+    """Analyze an API-format request, snapping it to the cached grid cell"""
+    location = api_request['location']
+    property_details = api_request['property']
+    preferences = api_request['preferences']
 
     try:
-        # Process form data
-        form_data = request.form
-        api_request = process_form_data(form_data)
-
-        # Extract key parameters
-        lat = api_request['location']['lat']
-        lng = api_request['location']['lng']
-        roof_area_sqft = api_request['property']['roof_area_sqft']
-        household_size = api_request['usage']['household_size']
-        system_type = api_request['preferences']['system_type']
-        region_type = api_request['preferences']['region_type']
-        roof_material = api_request['property']['roof_material']
-
-        logger.info(f"Processing form analysis for location: {lat}, {lng}")
-
-        # Get external data
-        rainfall_data = weather_service.get_rainfall_data(lat, lng)
-        soil_data = soil_service.get_soil_type(lat, lng)
-
-        # Perform comprehensive analysis
-        feasibility_analysis = calculator.calculate_feasibility_score(
-            annual_rainfall=rainfall_data['annual'],
-            roof_area=roof_area_sqft,
-            soil_data=soil_data,
-            household_size=household_size
+        return _compute_full_analysis(
+            round(location['lat'], COORDINATE_PRECISION), round(location['lng'], COORDINATE_PRECISION),
+            property_details['roof_area_sqft'], api_request['usage']['household_size'],
+            preferences['system_type'], preferences['region_type'], property_details['roof_material'],
+            preferences['budget_range'], property_details.get('plot_area_sqft', 2000), _cache_window()
         )
+    except _UncachedAnalysis as uncached:
+        return uncached.analysis
 
-        annual_harvest = calculator.calculate_harvestable_water(
-            roof_area_sqft=roof_area_sqft,
-            annual_rainfall_mm=rainfall_data['annual'],
-            roof_material=roof_material,
-            system_quality=system_type
-        )
 
-        runoff_capacity = calculator.calculate_runoff_capacity(
-            roof_area=roof_area_sqft,
-            rainfall_data=rainfall_data,
-            roof_material=roof_material
-        )
+def build_form_results(api_request: Dict) -> Dict:
+    """Full results for a form submission (already converted by process_form_data)"""
 
-        monthly_harvest = calculator.calculate_monthly_potential(
-            annual_harvest, rainfall_data['distribution']
-        )
+    # Extract key parameters
+    lat = api_request['location']['lat']
+    lng = api_request['location']['lng']
+    roof_area_sqft = api_request['property']['roof_area_sqft']
+    region_type = api_request['preferences']['region_type']
 
-        storage_sizes = calculator.calculate_optimal_storage_size(monthly_harvest)
+    analysis = run_analysis(api_request)
+    rainfall_data = analysis.rainfall_data
+    soil_data = analysis.soil_data
+    aquifer_info = analysis.aquifer_info
 
-        structure_recommendations = calculator.suggest_rtrwh_structures(
-            annual_harvest=annual_harvest,
-            soil_data=soil_data,
-            roof_area=roof_area_sqft,
-            budget=api_request['preferences']['budget_range']
-        )
+    # Build comprehensive response
+    return {
+        'status': 'success',
+        'timestamp': iso_timestamp(),
+        'api_version': '2.0',
 
-        aquifer_info = calculator.get_aquifer_information(lat, lng, soil_data)
+        'location': {
+            'coordinates': {'lat': lat, 'lng': lng},
+            'address': api_request['location'].get('address', f'Location {lat}, {lng}'),
+            'region_type': region_type,
+            'administrative_info': determine_administrative_region(analysis.lat, analysis.lng)
+        },
 
-        recharge_designs = calculator.design_recharge_structures(
-            annual_runoff=annual_harvest,
-            soil_data=soil_data,
-            available_space=api_request['property'].get('plot_area_sqft', 2000)
-        )
+        'feasibility_analysis': analysis.feasibility_analysis,
 
-        optimal_capacity = storage_sizes['optimal_liters']
-        cost_analysis = calculator.calculate_system_cost(optimal_capacity, system_type)
+        'rainfall_data': {
+            'annual_rainfall_mm': rainfall_data['annual'],
+            'monthly_distribution': rainfall_data['distribution'],
+            'peak_months': get_peak_rainfall_months(analysis.monthly_rainfall),
+            'monsoon_characteristics': analyze_monsoon_pattern(analysis.monthly_rainfall),
+            'collection_window': determine_collection_window(analysis.monthly_rainfall)
+        },
 
-        basic_financial = calculator.calculate_financial_analysis(
-            annual_harvest, cost_analysis['total_cost'], region_type
-        )
+        'runoff_capacity': analysis.runoff_capacity,
 
-        recharge_benefit = annual_harvest * 0.3 * 2
-        enhanced_cost_benefit = calculator.enhanced_cost_benefit_analysis(
-            system_cost=cost_analysis['total_cost'],
-            annual_harvest=annual_harvest,
-            annual_savings=basic_financial['annual_cost_savings_inr'],
-            recharge_benefit=recharge_benefit
-        )
+        'groundwater_and_aquifer': {
+            'depth_to_groundwater': soil_data['groundwater_depth'],
+            'aquifer_prospects': soil_data['aquifer_prospects'],
+            'principal_aquifer_info': aquifer_info,
+            'recharge_potential': aquifer_info.get('recharge_potential', 'Moderate')
+        },
 
-        system_recommendations = generate_enhanced_system_recommendations(
-            roof_area_sqft, annual_harvest, storage_sizes, cost_analysis, 
-            soil_data, feasibility_analysis
-        )
+        'soil_and_geology': soil_data,
 
-        implementation_plan = generate_enhanced_implementation_plan(
-            cost_analysis['total_cost'], structure_recommendations
-        )
+        'harvesting_potential': {
+            'roof_area_sqft': roof_area_sqft,
+            'annual_harvestable_liters': analysis.annual_harvest,
+            'monthly_potential': analysis.monthly_harvest,
+            'storage_recommendations': analysis.storage_sizes
+        },
 
-        # Build comprehensive response
-        results = {
-            'status': 'success',
-            'timestamp': datetime.now().isoformat(),
-            'api_version': '2.0',
-
-            'location': {
-                'coordinates': {'lat': lat, 'lng': lng},
-                'address': api_request['location'].get('address', f'Location {lat}, {lng}'),
-                'region_type': region_type,
-                'administrative_info': determine_administrative_region(lat, lng)
-            },
+        'suggested_structures': analysis.structure_recommendations,
+        'recharge_structure_designs': analysis.recharge_designs,
+        'system_recommendations': analysis.system_recommendations,
+        'cost_estimation': analysis.cost_analysis,
+        'cost_benefit_analysis': analysis.enhanced_cost_benefit,
+        'implementation_plan': analysis.implementation_plan,
+        'maintenance_schedule': generate_maintenance_schedule(),
+        'regulatory_compliance': generate_enhanced_regulatory_info(analysis.lat, analysis.lng),
+        'environmental_impact': assess_environmental_impact(analysis.annual_harvest, analysis.recharge_benefit)
+    }
 
-            'feasibility_analysis': feasibility_analysis,
 
-            'rainfall_data': {
-                'annual_rainfall_mm': rainfall_data['annual'],
-                'monthly_distribution': rainfall_data['distribution'],
-                'peak_months': get_peak_rainfall_months(rainfall_data['distribution']),
-                'monsoon_characteristics': analyze_monsoon_pattern(rainfall_data['distribution']),
-                'collection_window': determine_collection_window(rainfall_data['distribution'])
-            },
+# Web Routes
+@app.route('/')
+def index():
+    """Home page with the form"""
+    return render_template('form.html')
 
-            'runoff_capacity': runoff_capacity,
+@app.route('/analyze', methods=['POST'])
+def analyze_form():
+    """Process form submission and show results"""
 
-            'groundwater_and_aquifer': {
-                'depth_to_groundwater': soil_data['groundwater_depth'],
-                'aquifer_prospects': soil_data['aquifer_prospects'],
-                'principal_aquifer_info': aquifer_info,
-                'recharge_potential': aquifer_info.get('recharge_potential', 'Moderate')
-            },
+    form_data = request.form
+    missing = [field for field in REQUIRED_FORM_FIELDS if not form_data.get(field)]
+    if missing:
+        error_message = f"Missing required fields: {', '.join(missing)}"
+        return render_template('results.html', results=None, error=error_message), 400
 
-            'soil_and_geology': soil_data,
+    try:
+        # Process form data
+        try:
+            api_request = process_form_data(form_data)
+        except ValueError as e:
+            return render_template('results.html', results=None, error=str(e)), 400
 
-            'harvesting_potential': {
-                'roof_area_sqft': roof_area_sqft,
-                'annual_harvestable_liters': annual_harvest,
-                'monthly_potential': monthly_harvest,
-                'storage_recommendations': storage_sizes
-            },
+        location = api_request['location']
+        logger.info(f"Processing form analysis for location: {location['lat']}, {location['lng']}")
 
-            'suggested_structures': structure_recommendations,
-            'recharge_structure_designs': recharge_designs,
-            'system_recommendations': system_recommendations,
-            'cost_estimation': cost_analysis,
-            'cost_benefit_analysis': enhanced_cost_benefit,
-            'implementation_plan': implementation_plan,
-            'maintenance_schedule': generate_maintenance_schedule(),
-            'regulatory_compliance': generate_enhanced_regulatory_info(lat, lng),
-            'environmental_impact': assess_environmental_impact(annual_harvest, recharge_benefit)
-        }
+        results = build_form_results(api_request)
 
-        # Convert results to JSON string for template
-        results_json = json.dumps(results, indent=2)
+        # The page renders from results; /analyze/raw.json rebuilds the full JSON from the
+        # same form inputs when asked, so any worker process can serve it
+        raw_json_url = f"{url_for('analyze_raw_json')}?{urlencode(list(form_data.items(multi=True)))}"
 
-        return render_template('results.html', results=results, results_json=results_json)
+        return render_template('results.html', results=results, raw_json_url=raw_json_url)
 
     except Exception as e:
         logger.error(f"Error in form analysis: {str(e)}")
@@ -1290,13 +1541,28 @@ def analyze_form():
         return render_template('results.html', results=None, error=error_message)
 
 
+@app.route('/analyze/raw.json', methods=['GET'])
+def analyze_raw_json():
+    """Full JSON for a form analysis, rebuilt from the form inputs in the query string"""
+    missing = [field for field in REQUIRED_FORM_FIELDS if not request.args.get(field)]
+    if missing:
+        return jsonify({'error': f"Missing required fields: {', '.join(missing)}"}), 400
+
+    try:
+        results = build_form_results(process_form_data(request.args))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    return Response(orjson.dumps(results, option=orjson.OPT_INDENT_2), mimetype='application/json')
+
+
 # Keep existing API routes for backward compatibility
 @app.route('/health', methods=['GET'])
 def health_check():
     """Health check endpoint"""
     return jsonify({
         'status': 'healthy',
-        'timestamp': datetime.now().isoformat(),
+        'timestamp': iso_timestamp(),
         'version': '2.0',
         'features': [
             'Web Interface',
@@ -1333,42 +1599,35 @@ def analyze_water_harvesting_api():
         if not roof_area_sqft:
             return jsonify({'error': 'Roof area is required'}), 400
 
+        try:
+            lat, lng, roof_area_sqft = float(lat), float(lng), float(roof_area_sqft)
+        except (TypeError, ValueError):
+            return jsonify({'error': 'Latitude, longitude and roof area must be numbers'}), 400
+
         # Extract other parameters with defaults
-        usage = data.get('usage', {})
-        household_size = usage.get('household_size', 4)
         preferences = data.get('preferences', {})
         system_type = preferences.get('system_type', 'standard')
-        region_type = preferences.get('region_type', 'urban')
         roof_material = property_details.get('roof_material', 'concrete')
 
-        # Perform the same analysis as the form
-        rainfall_data = weather_service.get_rainfall_data(lat, lng)
-        soil_data = soil_service.get_soil_type(lat, lng)
-
-        # ... (same analysis code as in analyze_form)
-        # For brevity, using simplified version - you can copy the full analysis from above
+        if not isinstance(system_type, str) or not isinstance(roof_material, str):
+            return jsonify({'error': 'system_type and roof_material must be strings'}), 400
 
-        annual_harvest = calculator.calculate_harvestable_water(
-            roof_area_sqft, rainfall_data['annual'], roof_material, system_type
+        # Only the sizing core of the form analysis; the rest would be discarded here
+        analysis = compute_harvest_core(
+            round(lat, COORDINATE_PRECISION), round(lng, COORDINATE_PRECISION),
+            roof_area_sqft, system_type, roof_material
         )
 
-        monthly_harvest = calculator.calculate_monthly_potential(
-            annual_harvest, rainfall_data['distribution']
-        )
-
-        storage_sizes = calculator.calculate_optimal_storage_size(monthly_harvest)
-        cost_analysis = calculator.calculate_system_cost(storage_sizes['optimal_liters'], system_type)
-
         # Return simplified response for API
         response = {
             'status': 'success',
             'harvesting_potential': {
-                'annual_harvestable_liters': annual_harvest,
-                'storage_recommendations': storage_sizes
+                'annual_harvestable_liters': analysis.annual_harvest,
+                'storage_recommendations': analysis.storage_sizes
             },
-            'cost_analysis': cost_analysis,
-            'rainfall_data': rainfall_data,
-            'soil_data': soil_data
+            'cost_analysis': analysis.cost_analysis,
+            'rainfall_data': analysis.rainfall_data,
+            'soil_data': analysis.soil_data
         }
 
         return jsonify(response)
@@ -1379,4 +1638,6 @@ def analyze_water_harvesting_api():
 
 
 if __name__ == '__main__':
-    app.run(debug=True, host='0.0.0.0', port=8080)
+    # Development server only; run under gunicorn for concurrent requests:
+    #   PORT=8080 gunicorn -c setup/gunicorn.conf.py app_complete_web:app
+    app.run(debug=os.environ.get('FLASK_DEBUG', 'False').lower() == 'true', host='0.0.0.0', port=8080)
@@ -5,67 +5,436 @@ Updated with comprehensive feasibility analysis and structure recommendations
 """
 
 import os
-import json
-from datetime import datetime, timedelta
+import functools
+import heapq
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass
 from flask import Flask, request, jsonify
 from flask_cors import CORS
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
 import math
+import sqlite3
+import threading
+import time
+from types import MappingProxyType
 from typing import Dict, List, Optional, Tuple
 import logging
+from app_common import OrjsonProvider, iso_timestamp
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+
 app = Flask(__name__)
+app.json = OrjsonProvider(app)
 CORS(app)
 
-class WaterHarvestingCalculator:
-    """Enhanced calculation engine for water harvesting analysis"""
+# Open-Meteo rainfall is cached per 0.25 degree grid cell (the ERA5 archive resolution)
+# for a week; after a failed fetch the fallback data is served for a minute before
+# retrying. Full analyses are cached per exact input set for an hour, except those
+# built on fallback rainfall.
+RAINFALL_GRID_STEP_DEGREES = 0.25
+RAINFALL_CACHE_TTL_SECONDS = 7 * 86400
+RAINFALL_CACHE_SIZE = 4096
+RAINFALL_RETRY_AFTER_SECONDS = 60
 
-    def __init__(self):
-        # Runoff coefficients by roof material
-        self.runoff_coefficients = {
-            'concrete': 0.85,
-            'metal': 0.90,
-            'tile': 0.75,
-            'asbestos': 0.80,
-            'thatch': 0.60,
-            'other': 0.70
-        }
+# Processed rainfall is also kept on disk so restarts and other worker processes reuse it;
+# set RAINFALL_CACHE_PATH to an empty string to disable
+RAINFALL_DISK_CACHE_PATH = os.environ.get('RAINFALL_CACHE_PATH', os.path.join('.cache', 'rainfall.sqlite3'))
+ANALYSIS_CACHE_TTL_SECONDS = 3600
+ANALYSIS_CACHE_SIZE = 4096
 
-        # Collection efficiency by system quality
-        self.collection_efficiency = {
-            'advanced': 0.90,
-            'standard': 0.80,
-            'basic': 0.70
-        }
+# Maximum number of sites accepted by the batch endpoint (same limit as v01/app.py)
+MAX_BATCH_SITES = 100
 
-        # Enhanced cost estimates (INR)
-        self.cost_estimates = {
-            'tank_cost_per_liter': 85,
-            'filtration_basic': 25000,
-            'filtration_advanced': 40000,
-            'pump_0_5hp': 12000,
-            'pump_1hp': 18000,
-            'installation_base': 20000,
-            'contingency_factor': 0.10,
-            
-            # Recharge structure costs
-            'recharge_pit_per_cum': 2500,
-            'percolation_tank_per_cum': 1800,
-            'injection_well_base': 45000,
-            'recharge_trench_per_meter': 1200,
-            'check_dam_base': 75000
-        }
+# Reject oversized request bodies before parsing: room for a full batch at up to 2 KB per site
+app.config['MAX_CONTENT_LENGTH'] = MAX_BATCH_SITES * 2 * 1024
+
+# Per-thread flag set when _compute_enhanced_analysis actually runs (a cache miss)
+_analysis_state = threading.local()
+
+
+def _cache_window(ttl_seconds: int) -> int:
+    """Current TTL window; part of the cache key so entries expire"""
+    return int(time.time() // ttl_seconds)
+
+
+class RainfallDiskCache:
+    """SQLite-backed cache of processed Open-Meteo rainfall by grid cell, with per-entry expiry"""
+
+    # Renamed from "rainfall" so entries written by older code, which could hold city
+    # fallback data, are never read
+    TABLE = 'open_meteo_rainfall'
+
+    def __init__(self, path: str, ttl_seconds: int):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+
+    def _connect(self) -> sqlite3.Connection:
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        connection = sqlite3.connect(self.path, timeout=5)
+        connection.execute(
+            f'CREATE TABLE IF NOT EXISTS {self.TABLE} (cell TEXT PRIMARY KEY, expires_at REAL, data BLOB)'
+        )
+        return connection
+
+    def get(self, lat: float, lng: float) -> Optional[Dict]:
+        """Cached rainfall data for a grid cell, or None if missing, expired or unreadable"""
+        if not self.path:
+            return None
+        try:
+            connection = self._connect()
+            try:
+                row = connection.execute(
+                    f'SELECT data FROM {self.TABLE} WHERE cell = ? AND expires_at > ?',
+                    (f'{lat},{lng}', time.time())
+                ).fetchone()
+            finally:
+                connection.close()
+        except (sqlite3.Error, OSError) as e:
+            logger.warning(f"Rainfall disk cache read failed: {str(e)}")
+            return None
+        return orjson.loads(row[0]) if row else None
+
+    def set(self, lat: float, lng: float, data: Dict) -> None:
+        """Store Open-Meteo rainfall for a grid cell (never fallback data); failures are logged and ignored"""
+        if not self.path:
+            return
+        try:
+            connection = self._connect()
+            try:
+                with connection:
+                    connection.execute(
+                        f'INSERT OR REPLACE INTO {self.TABLE} (cell, expires_at, data) VALUES (?, ?, ?)',
+                        (f'{lat},{lng}', time.time() + self.ttl_seconds, orjson.dumps(data))
+                    )
+            finally:
+                connection.close()
+        except (sqlite3.Error, OSError) as e:
+            logger.warning(f"Rainfall disk cache write failed: {str(e)}")
+
+
+def _snap_to_grid(value: float, step: float = RAINFALL_GRID_STEP_DEGREES) -> float:
+    """Round a coordinate to the nearest grid line"""
+    return round(value / step) * step
+
+# Discount factors (1 + r) ** year for the 20-year NPV, computed once
+NPV_DISCOUNT_RATE = 0.10
+NPV_PROJECT_LIFE_YEARS = 20
+NPV_DISCOUNT_FACTORS = tuple((1 + NPV_DISCOUNT_RATE) ** year
+                             for year in range(1, NPV_PROJECT_LIFE_YEARS + 1))
+
+# Runoff coefficients by roof material (read-only tables shared by calculators)
+RUNOFF_COEFFICIENTS = MappingProxyType({
+    'concrete': 0.85,
+    'metal': 0.90,
+    'tile': 0.75,
+    'asbestos': 0.80,
+    'thatch': 0.60,
+    'other': 0.70
+})
+
+SQFT_TO_SQM = 0.092903
+
+
+def roof_area_sqm(roof_area_sqft: float) -> float:
+    """Convert a roof area from square feet to square meters"""
+    return roof_area_sqft * SQFT_TO_SQM
+
+# Collection efficiency by system quality
+COLLECTION_EFFICIENCY = MappingProxyType({
+    'advanced': 0.90,
+    'standard': 0.80,
+    'basic': 0.70
+})
+
+# Enhanced cost estimates (INR)
+COST_ESTIMATES = MappingProxyType({
+    'tank_cost_per_liter': 85,
+    'filtration_basic': 25000,
+    'filtration_advanced': 40000,
+    'pump_0_5hp': 12000,
+    'pump_1hp': 18000,
+    'installation_base': 20000,
+    'contingency_factor': 0.10,
+
+    # Recharge structure costs
+    'recharge_pit_per_cum': 2500,
+    'percolation_tank_per_cum': 1800,
+    'injection_well_base': 45000,
+    'recharge_trench_per_meter': 1200,
+    'check_dam_base': 75000
+})
+
+# (filtration, pump) costs by system type; any other system type gets the basic kit
+SYSTEM_EQUIPMENT_COSTS = MappingProxyType({
+    'advanced': (COST_ESTIMATES['filtration_advanced'], COST_ESTIMATES['pump_1hp'])
+})
+BASIC_EQUIPMENT_COSTS = (COST_ESTIMATES['filtration_basic'], COST_ESTIMATES['pump_0_5hp'])
+
+# Water pricing (INR per 1000 liters) by region
+WATER_PRICING = MappingProxyType({
+    'urban': 15,
+    'suburban': 12,
+    'rural': 8
+})
+
+# Feasibility scoring bands: SCORES[i] applies between THRESHOLDS[i-1] and THRESHOLDS[i]
+RAINFALL_SCORE_THRESHOLDS = (300, 500, 750, 1000)    # mm/year, lower bound inclusive
+RAINFALL_SCORES = (5, 10, 15, 20, 25)
+ROOF_AREA_SCORE_THRESHOLDS = (300, 600, 1000, 1500)  # sq ft, lower bound inclusive
+ROOF_AREA_SCORES = (5, 10, 15, 20, 25)
+DEMAND_SCORE_THRESHOLDS = (10000, 20000, 30000)      # liters/month, upper bound inclusive
+DEMAND_SCORES = (25, 20, 15, 10)
+
+# Soil suitability by soil name fragment, checked in order
+SOIL_SUITABILITY_SCORES = (('alluvial', 25), ('red', 20), ('black', 15), ('laterite', 18))
+DEFAULT_SOIL_SUITABILITY_SCORE = 12
+
+
+# Region tables: inclusive (lat_lo, lat_hi, lng_lo, lng_hi, value) boxes checked
+# in order, first match wins. Strict bounds are encoded with math.nextafter.
+_INF = math.inf
+
+
+def _below(x: float) -> float:
+    return math.nextafter(x, -_INF)
+
+
+def _above(x: float) -> float:
+    return math.nextafter(x, _INF)
+
+
+SOIL_REGIONS = (
+    (20, 30, 68, _below(74), 'desert'),
+    (20, 30, 74, 78, 'alluvial'),
+    (18, 25, 72, 85, 'black'),
+    (8, 18, 75, 80, 'red'),
+    (-_INF, _below(18), _above(75), _INF, 'red'),
+    (_above(25), _INF, _above(85), _INF, 'alluvial'),
+    (_above(28), _INF, -_INF, _INF, 'mountain'),
+)
+
+GROUNDWATER_DEPTH_REGIONS = (
+    (20, 30, -_INF, _below(75), "20-50 meters"),
+    (18, 25, -_INF, _INF, "10-30 meters"),
+    (-_INF, _below(18), -_INF, _INF, "5-20 meters"),
+    (-_INF, _INF, _above(85), _INF, "5-15 meters"),
+)
+
+
+# Principal aquifer systems and the regions they underlie
+AQUIFER_SYSTEMS = {
+    'thar': {
+        'principal_aquifer': 'Thar Desert Aquifer System',
+        'aquifer_type': 'Unconfined to semi-confined',
+        'lithology': 'Sand and sandstone with clay lenses',
+        'water_quality': 'Saline to fresh (TDS: 500-5000 mg/L)',
+        'yield_characteristics': 'Low to moderate (5-20 m³/hr)',
+        'sustainability': 'Over-exploited in most areas'
+    },
+    'indo_gangetic': {
+        'principal_aquifer': 'Indo-Gangetic Alluvial Aquifer',
+        'aquifer_type': 'Unconfined to confined multi-layered',
+        'lithology': 'Fine to coarse alluvium with clay layers',
+        'water_quality': 'Fresh to brackish (TDS: 200-1500 mg/L)',
+        'yield_characteristics': 'High (20-100 m³/hr)',
+        'sustainability': 'Over-exploited to critical'
+    },
+    'deccan': {
+        'principal_aquifer': 'Deccan Trap Aquifer',
+        'aquifer_type': 'Fractured hard rock',
+        'lithology': 'Basaltic lava flows with vesicular zones',
+        'water_quality': 'Fresh to slightly saline (TDS: 300-2000 mg/L)',
+        'yield_characteristics': 'Moderate (10-50 m³/hr)',
+        'sustainability': 'Semi-critical to critical'
+    },
+    'crystalline': {
+        'principal_aquifer': 'Crystalline Rock Aquifer',
+        'aquifer_type': 'Fractured and weathered hard rock',
+        'lithology': 'Granite, gneiss with weathered overburden',
+        'water_quality': 'Fresh (TDS: 200-1000 mg/L)',
+        'yield_characteristics': 'Low to moderate (5-30 m³/hr)',
+        'sustainability': 'Semi-critical to safe'
+    },
+    'bengal': {
+        'principal_aquifer': 'Bengal Basin Aquifer',
+        'aquifer_type': 'Multi-layered confined/unconfined',
+        'lithology': 'Quaternary alluvium with clay aquitards',
+        'water_quality': 'Fresh but arsenic contamination risk',
+        'yield_characteristics': 'High (30-150 m³/hr)',
+        'sustainability': 'Safe to semi-critical'
+    },
+    'himalayan': {
+        'principal_aquifer': 'Himalayan Rock Aquifer',
+        'aquifer_type': 'Fractured rock with limited storage',
+        'lithology': 'Metamorphic and sedimentary rocks',
+        'water_quality': 'Fresh (TDS: 100-500 mg/L)',
+        'yield_characteristics': 'Low (2-15 m³/hr)',
+        'sustainability': 'Safe but limited availability'
+    }
+}
+
+AQUIFER_REGIONS = (
+    (20, 30, 68, _below(74), AQUIFER_SYSTEMS['thar']),
+    (20, 30, 74, 78, AQUIFER_SYSTEMS['indo_gangetic']),
+    (18, 25, 72, 85, AQUIFER_SYSTEMS['deccan']),
+    (-_INF, _below(18), -_INF, _INF, AQUIFER_SYSTEMS['crystalline']),
+    (-_INF, _INF, _above(85), _INF, AQUIFER_SYSTEMS['bengal']),
+)
+
+# Administrative regions (metro boxes first, then broad latitude bands)
+ADMINISTRATIVE_REGIONS = (
+    (28.4, 28.9, 76.8, 77.3, {'state': 'Delhi', 'region': 'National Capital Territory'}),
+    (18.9, 19.3, 72.7, 73.0, {'state': 'Maharashtra', 'region': 'Mumbai Metropolitan'}),
+    (12.8, 13.1, 77.4, 77.8, {'state': 'Karnataka', 'region': 'Bangalore Urban'}),
+    (22.4, 22.7, 88.2, 88.5, {'state': 'West Bengal', 'region': 'Kolkata Metropolitan'}),
+    (13.0, 13.2, 80.1, 80.4, {'state': 'Tamil Nadu', 'region': 'Chennai Metropolitan'}),
+    (28, _INF, -_INF, _INF, {'state': 'Northern India', 'region': 'Himalayan/Plains'}),
+    (-_INF, 15, -_INF, _INF, {'state': 'Southern India', 'region': 'Peninsular'}),
+)
+DEFAULT_ADMINISTRATIVE_REGION = {'state': 'Central India', 'region': 'Deccan Plateau'}
+
+# Recharge potential by soil name fragment, checked in order
+RECHARGE_POTENTIAL_BY_SOIL = (
+    ('alluvial', 'High - Good connectivity with surface'),
+    ('black', 'Moderate - Limited vertical percolation'),
+    ('red', 'High - Good infiltration capacity'),
+)
+DEFAULT_RECHARGE_POTENTIAL = 'Variable - Site-specific assessment needed'
+
+
+@dataclass(frozen=True)
+class SoilTraits:
+    """Lowercased soil type and the infiltration flags the recommendations branch on"""
+    soil_type: str
+    high_infiltration: bool
+    medium_infiltration: bool
+    excellent_recharge: bool
+
+
+@functools.lru_cache(maxsize=None)
+def _soil_traits(soil_type: str, infiltration_rate: str, recharge_suitability: str) -> SoilTraits:
+    infiltration_rate = infiltration_rate.lower()
+    return SoilTraits(
+        soil_type=soil_type.lower(),
+        high_infiltration='high' in infiltration_rate,
+        medium_infiltration='medium' in infiltration_rate,
+        excellent_recharge='excellent' in recharge_suitability.lower()
+    )
+
+
+def soil_traits(soil_data: Dict) -> SoilTraits:
+    """Normalized soil traits, computed once per distinct soil description"""
+    return _soil_traits(
+        soil_data.get('soil_type', ''),
+        soil_data.get('infiltration_rate', ''),
+        soil_data.get('recharge_suitability', '')
+    )
+
+
+def find_region(regions, lat: float, lng: float, default):
+    """Return the value of the first region box containing (lat, lng)"""
+    for lat_lo, lat_hi, lng_lo, lng_hi, value in regions:
+        if lat_lo <= lat <= lat_hi and lng_lo <= lng <= lng_hi:
+            return value
+    return default
+
+
+# Structure templates shared by every suggest_rtrwh_structures() result (never mutated)
+UNDERGROUND_STORAGE_TANK = {
+    'type': 'Underground Storage Tank',
+    'capacity_range': '8000-15000 liters',
+    'suitability': 'High water yield areas',
+    'advantages': ['Reliable water supply', 'Space efficient', 'Good water quality'],
+    'disadvantages': ['Higher initial cost', 'Regular maintenance needed']
+}
+
+OVERHEAD_STORAGE_TANK = {
+    'type': 'Overhead Storage Tank',
+    'capacity_range': '3000-8000 liters',
+    'suitability': 'All roof areas',
+    'advantages': ['Lower installation cost', 'Easy maintenance', 'Gravity feed'],
+    'disadvantages': ['Space requirement', 'Limited capacity']
+}
+
+HIGH_INFILTRATION_RECHARGE_STRUCTURES = (
+    {
+        'type': 'Recharge Pit',
+        'dimensions': '2m x 2m x 3m depth',
+        'suitability': 'High infiltration soils',
+        'capacity': '12 cubic meters',
+        'cost_estimate': 30000,
+        'maintenance': 'Annual cleaning and de-silting'
+    },
+    {
+        'type': 'Percolation Tank',
+        'dimensions': '10m x 5m x 2.5m depth',
+        'suitability': 'Large catchment areas',
+        'capacity': '125 cubic meters',
+        'cost_estimate': 225000,
+        'maintenance': 'Bi-annual cleaning'
+    }
+)
+
+MEDIUM_INFILTRATION_RECHARGE_STRUCTURES = (
+    {
+        'type': 'Recharge Trench',
+        'dimensions': '0.5m wide x 1.5m deep x 10m length',
+        'suitability': 'Medium infiltration soils',
+        'capacity': '7.5 cubic meters',
+        'cost_estimate': 12000,
+        'maintenance': 'Quarterly inspection'
+    },
+    {
+        'type': 'Injection Well',
+        'dimensions': '150mm diameter x 30m depth',
+        'suitability': 'Low permeability areas',
+        'capacity': 'Direct injection to aquifer',
+        'cost_estimate': 45000,
+        'maintenance': 'Annual pump testing'
+    }
+)
+
+STORAGE_RECHARGE_HYBRID = {
+    'type': 'Storage + Recharge Combination',
+    'description': 'Small storage tank with overflow to recharge pit',
+    'storage_capacity': '5000 liters',
+    'recharge_capacity': '8 cubic meters',
+    'advantages': ['Water security + groundwater enhancement', 'Cost effective'],
+    'total_cost_estimate': 85000
+}
+
+# Static text shared by every enhanced_cost_benefit_analysis() result (never mutated)
+COST_BENEFIT_ENVIRONMENTAL_BENEFITS = [
+    'Reduced strain on municipal water supply',
+    'Lower carbon footprint (reduced pumping)',
+    'Enhanced local groundwater levels',
+    'Reduced soil erosion and surface runoff'
+]
+
+COST_BENEFIT_MITIGATION_STRATEGIES = [
+    'Apply for government subsidies and incentives',
+    'Consider phased implementation approach',
+    'Implement hybrid storage + recharge system',
+    'Regular maintenance to ensure optimal performance'
+]
 
-        # Water pricing (INR per 1000 liters) by region
-        self.water_pricing = {
-            'urban': 15,
-            'suburban': 12,
-            'rural': 8
-        }
+
+class WaterHarvestingCalculator:
+    """Enhanced calculation engine for water harvesting analysis"""
+
+    def __init__(self):
+        self.runoff_coefficients = RUNOFF_COEFFICIENTS
+        self.collection_efficiency = COLLECTION_EFFICIENCY
+        self.cost_estimates = COST_ESTIMATES
+        self.system_equipment_costs = SYSTEM_EQUIPMENT_COSTS
+        self.water_pricing = WATER_PRICING
 
     def calculate_feasibility_score(self, annual_rainfall: float, roof_area: float, 
                                   soil_data: Dict, household_size: int) -> Dict:
@@ -74,53 +443,22 @@ class WaterHarvestingCalculator:
         scores = {}
 
         # Rainfall feasibility (0-25 points)
-        if annual_rainfall >= 1000:
-            scores['rainfall'] = 25
-        elif annual_rainfall >= 750:
-            scores['rainfall'] = 20
-        elif annual_rainfall >= 500:
-            scores['rainfall'] = 15
-        elif annual_rainfall >= 300:
-            scores['rainfall'] = 10
-        else:
-            scores['rainfall'] = 5
+        scores['rainfall'] = RAINFALL_SCORES[bisect_right(RAINFALL_SCORE_THRESHOLDS, annual_rainfall)]
 
         # Roof area feasibility (0-25 points)
-        if roof_area >= 1500:
-            scores['roof_area'] = 25
-        elif roof_area >= 1000:
-            scores['roof_area'] = 20
-        elif roof_area >= 600:
-            scores['roof_area'] = 15
-        elif roof_area >= 300:
-            scores['roof_area'] = 10
-        else:
-            scores['roof_area'] = 5
+        scores['roof_area'] = ROOF_AREA_SCORES[bisect_right(ROOF_AREA_SCORE_THRESHOLDS, roof_area)]
 
         # Soil suitability (0-25 points)
-        soil_type = soil_data.get('soil_type', '').lower()
-        if 'alluvial' in soil_type:
-            scores['soil_suitability'] = 25
-        elif 'red' in soil_type:
-            scores['soil_suitability'] = 20
-        elif 'black' in soil_type:
-            scores['soil_suitability'] = 15
-        elif 'laterite' in soil_type:
-            scores['soil_suitability'] = 18
-        else:
-            scores['soil_suitability'] = 12
+        soil_type = soil_traits(soil_data).soil_type
+        scores['soil_suitability'] = next(
+            (score for name, score in SOIL_SUITABILITY_SCORES if name in soil_type),
+            DEFAULT_SOIL_SUITABILITY_SCORE
+        )
 
         # Water demand feasibility (0-25 points)
         daily_demand = household_size * 150  # 150L per person
         monthly_demand = daily_demand * 30
-        if monthly_demand <= 10000:
-            scores['water_demand'] = 25
-        elif monthly_demand <= 20000:
-            scores['water_demand'] = 20
-        elif monthly_demand <= 30000:
-            scores['water_demand'] = 15
-        else:
-            scores['water_demand'] = 10
+        scores['water_demand'] = DEMAND_SCORES[bisect_left(DEMAND_SCORE_THRESHOLDS, monthly_demand)]
 
         total_score = sum(scores.values())
 
@@ -161,75 +499,21 @@ class WaterHarvestingCalculator:
 
         # Rooftop Harvesting Options
         if annual_harvest > 15000:
-            structures['rooftop_harvesting'].append({
-                'type': 'Underground Storage Tank',
-                'capacity_range': '8000-15000 liters',
-                'suitability': 'High water yield areas',
-                'advantages': ['Reliable water supply', 'Space efficient', 'Good water quality'],
-                'disadvantages': ['Higher initial cost', 'Regular maintenance needed']
-            })
-
-        structures['rooftop_harvesting'].append({
-            'type': 'Overhead Storage Tank',
-            'capacity_range': '3000-8000 liters',
-            'suitability': 'All roof areas',
-            'advantages': ['Lower installation cost', 'Easy maintenance', 'Gravity feed'],
-            'disadvantages': ['Space requirement', 'Limited capacity']
-        })
+            structures['rooftop_harvesting'].append(UNDERGROUND_STORAGE_TANK)
+
+        structures['rooftop_harvesting'].append(OVERHEAD_STORAGE_TANK)
 
         # Artificial Recharge Options
-        soil_type = soil_data.get('soil_type', '').lower()
-        infiltration = soil_data.get('infiltration_rate', '').lower()
-
-        if 'high' in infiltration or 'excellent' in soil_data.get('recharge_suitability', '').lower():
-            structures['artificial_recharge'].extend([
-                {
-                    'type': 'Recharge Pit',
-                    'dimensions': '2m x 2m x 3m depth',
-                    'suitability': 'High infiltration soils',
-                    'capacity': '12 cubic meters',
-                    'cost_estimate': 30000,
-                    'maintenance': 'Annual cleaning and de-silting'
-                },
-                {
-                    'type': 'Percolation Tank',
-                    'dimensions': '10m x 5m x 2.5m depth',
-                    'suitability': 'Large catchment areas',
-                    'capacity': '125 cubic meters',
-                    'cost_estimate': 225000,
-                    'maintenance': 'Bi-annual cleaning'
-                }
-            ])
-
-        if 'medium' in infiltration:
-            structures['artificial_recharge'].extend([
-                {
-                    'type': 'Recharge Trench',
-                    'dimensions': '0.5m wide x 1.5m deep x 10m length',
-                    'suitability': 'Medium infiltration soils',
-                    'capacity': '7.5 cubic meters',
-                    'cost_estimate': 12000,
-                    'maintenance': 'Quarterly inspection'
-                },
-                {
-                    'type': 'Injection Well',
-                    'dimensions': '150mm diameter x 30m depth',
-                    'suitability': 'Low permeability areas',
-                    'capacity': 'Direct injection to aquifer',
-                    'cost_estimate': 45000,
-                    'maintenance': 'Annual pump testing'
-                }
-            ])
+        traits = soil_traits(soil_data)
+
+        if traits.high_infiltration or traits.excellent_recharge:
+            structures['artificial_recharge'].extend(HIGH_INFILTRATION_RECHARGE_STRUCTURES)
+
+        if traits.medium_infiltration:
+            structures['artificial_recharge'].extend(MEDIUM_INFILTRATION_RECHARGE_STRUCTURES)
 
         # Hybrid Systems
-        structures['hybrid_systems'].append({
-            'type': 'Storage + Recharge Combination',
-            'description': 'Small storage tank with overflow to recharge pit',
-            'storage_capacity': '5000 liters',
-            'recharge_capacity': '8 cubic meters',
-            'advantages': ['Water security + groundwater enhancement', 'Cost effective'],
-            'total_cost_estimate': 85000
-        })
+        structures['hybrid_systems'].append(STORAGE_RECHARGE_HYBRID)
 
         return structures
 
@@ -237,112 +521,62 @@ class WaterHarvestingCalculator:
         """Get principal aquifer information based on location and soil type"""
 
         # Regional aquifer mapping (simplified)
-        aquifer_info = {}
-
-        # Determine region-based aquifer characteristics
-        if 20 <= lat <= 30 and 68 <= lng <= 78:  # Northwestern India
-            if lng < 74:  # Rajasthan/Gujarat
-                aquifer_info = {
-                    'principal_aquifer': 'Thar Desert Aquifer System',
-                    'aquifer_type': 'Unconfined to semi-confined',
-                    'lithology': 'Sand and sandstone with clay lenses',
-                    'water_quality': 'Saline to fresh (TDS: 500-5000 mg/L)',
-                    'yield_characteristics': 'Low to moderate (5-20 m³/hr)',
-                    'sustainability': 'Over-exploited in most areas'
-                }
-            else:  # Punjab/Haryana/UP plains
-                aquifer_info = {
-                    'principal_aquifer': 'Indo-Gangetic Alluvial Aquifer',
-                    'aquifer_type': 'Unconfined to confined multi-layered',
-                    'lithology': 'Fine to coarse alluvium with clay layers',
-                    'water_quality': 'Fresh to brackish (TDS: 200-1500 mg/L)',
-                    'yield_characteristics': 'High (20-100 m³/hr)',
-                    'sustainability': 'Over-exploited to critical'
-                }
-        elif 18 <= lat <= 25 and 72 <= lng <= 85:  # Central India
-            aquifer_info = {
-                'principal_aquifer': 'Deccan Trap Aquifer',
-                'aquifer_type': 'Fractured hard rock',
-                'lithology': 'Basaltic lava flows with vesicular zones',
-                'water_quality': 'Fresh to slightly saline (TDS: 300-2000 mg/L)',
-                'yield_characteristics': 'Moderate (10-50 m³/hr)',
-                'sustainability': 'Semi-critical to critical'
-            }
-        elif lat < 18:  # South India
-            aquifer_info = {
-                'principal_aquifer': 'Crystalline Rock Aquifer',
-                'aquifer_type': 'Fractured and weathered hard rock',
-                'lithology': 'Granite, gneiss with weathered overburden',
-                'water_quality': 'Fresh (TDS: 200-1000 mg/L)',
-                'yield_characteristics': 'Low to moderate (5-30 m³/hr)',
-                'sustainability': 'Semi-critical to safe'
-            }
-        elif lng > 85:  # Eastern India
-            aquifer_info = {
-                'principal_aquifer': 'Bengal Basin Aquifer',
-                'aquifer_type': 'Multi-layered confined/unconfined',
-                'lithology': 'Quaternary alluvium with clay aquitards',
-                'water_quality': 'Fresh but arsenic contamination risk',
-                'yield_characteristics': 'High (30-150 m³/hr)',
-                'sustainability': 'Safe to semi-critical'
-            }
-        else:  # Default/Himalayan region
-            aquifer_info = {
-                'principal_aquifer': 'Himalayan Rock Aquifer',
-                'aquifer_type': 'Fractured rock with limited storage',
-                'lithology': 'Metamorphic and sedimentary rocks',
-                'water_quality': 'Fresh (TDS: 100-500 mg/L)',
-                'yield_characteristics': 'Low (2-15 m³/hr)',
-                'sustainability': 'Safe but limited availability'
-            }
+        aquifer_info = dict(find_region(AQUIFER_REGIONS, lat, lng, AQUIFER_SYSTEMS['himalayan']))
 
         # Add recharge potential assessment
-        soil_type = soil_data.get('soil_type', '').lower()
-        if 'alluvial' in soil_type:
-            aquifer_info['recharge_potential'] = 'High - Good connectivity with surface'
-        elif 'black' in soil_type:
-            aquifer_info['recharge_potential'] = 'Moderate - Limited vertical percolation'
-        elif 'red' in soil_type:
-            aquifer_info['recharge_potential'] = 'High - Good infiltration capacity'
-        else:
-            aquifer_info['recharge_potential'] = 'Variable - Site-specific assessment needed'
+        soil_type = soil_traits(soil_data).soil_type
+        aquifer_info['recharge_potential'] = next(
+            (potential for name, potential in RECHARGE_POTENTIAL_BY_SOIL if name in soil_type),
+            DEFAULT_RECHARGE_POTENTIAL
+        )
 
         return aquifer_info
 
     def calculate_runoff_capacity(self, roof_area: float, rainfall_data: Dict, 
-                                roof_material: str) -> Dict:
-        """Calculate detailed runoff generation capacity"""
+                                roof_material: str, area_sqm: Optional[float] = None) -> Dict:
+        """Calculate detailed runoff generation capacity
+
+        ``area_sqm`` may carry the already converted roof area to skip the conversion.
+        """
 
         runoff_coeff = self.runoff_coefficients.get(roof_material.lower(), 0.75)
         annual_rainfall = rainfall_data.get('annual', 800)
         monthly_distribution = rainfall_data.get('distribution', {})
 
         # Convert roof area to square meters
-        roof_area_sqm = roof_area * 0.092903
+        if area_sqm is None:
+            area_sqm = roof_area_sqm(roof_area)
 
-        # Calculate monthly runoff
+        # Calculate monthly runoff, tracking the (first) wettest month in the same pass
         monthly_runoff = {}
         total_annual_runoff = 0
+        peak_month = None
+        peak_percentage = None
+        peak_monthly_runoff = None
 
         for month, percentage in monthly_distribution.items():
             monthly_rainfall = annual_rainfall * (percentage / 100)
-            monthly_runoff_vol = roof_area_sqm * monthly_rainfall * runoff_coeff / 1000  # in cubic meters
+            monthly_runoff_vol = area_sqm * monthly_rainfall * runoff_coeff / 1000  # in cubic meters
+            monthly_runoff_liters = round(monthly_runoff_vol * 1000, 0)
             monthly_runoff[month] = {
                 'rainfall_mm': round(monthly_rainfall, 1),
-                'runoff_volume_liters': round(monthly_runoff_vol * 1000, 0),
+                'runoff_volume_liters': monthly_runoff_liters,
                 'runoff_volume_cubic_meters': round(monthly_runoff_vol, 2)
             }
             total_annual_runoff += monthly_runoff_vol
 
-        # Peak runoff calculations
-        peak_month = max(monthly_distribution.items(), key=lambda x: x[1])
-        peak_monthly_runoff = monthly_runoff[peak_month[0]]['runoff_volume_liters']
+            if peak_month is None or percentage > peak_percentage:
+                peak_month, peak_percentage = month, percentage
+                peak_monthly_runoff = monthly_runoff_liters
+
+        if peak_month is None:
+            raise ValueError("Rainfall distribution is empty")
 
         # Daily peak calculations (assuming 20% of monthly rain in peak day)
         peak_daily_runoff = peak_monthly_runoff * 0.20
 
         return {
-            'roof_area_sqm': round(roof_area_sqm, 2),
+            'roof_area_sqm': round(area_sqm, 2),
             'runoff_coefficient': runoff_coeff,
             'annual_runoff_capacity': {
                 'total_liters': round(total_annual_runoff * 1000, 0),
@@ -350,7 +584,7 @@ class WaterHarvestingCalculator:
             },
             'monthly_runoff_details': monthly_runoff,
             'peak_runoff': {
-                'peak_month': peak_month[0],
+                'peak_month': peak_month,
                 'peak_monthly_liters': peak_monthly_runoff,
                 'estimated_peak_daily_liters': round(peak_daily_runoff, 0)
             },
@@ -366,13 +600,12 @@ class WaterHarvestingCalculator:
         """Design specifications for recharge pits, trenches, and shafts"""
 
         designs = {}
-        soil_type = soil_data.get('soil_type', '').lower()
-        infiltration_rate = soil_data.get('infiltration_rate', '').lower()
+        traits = soil_traits(soil_data)
 
         # Determine infiltration rate in mm/hr for calculations
-        if 'high' in infiltration_rate:
+        if traits.high_infiltration:
             inf_rate_mm_hr = 20
-        elif 'medium' in infiltration_rate:
+        elif traits.medium_infiltration:
             inf_rate_mm_hr = 10
         else:
             inf_rate_mm_hr = 5
@@ -466,16 +699,14 @@ class WaterHarvestingCalculator:
         if annual_savings > 0:
             payback_period = system_cost / annual_savings
         else:
-            payback_period = float('inf')
+            payback_period = math.inf
 
         # NPV calculation (10% discount rate)
-        discount_rate = 0.10
-        project_life = 20
+        cash_flow = annual_savings + (recharge_benefit * 0.1)  # 10% of recharge value
 
         npv = 0
-        for year in range(1, project_life + 1):
-            cash_flow = annual_savings + (recharge_benefit * 0.1)  # 10% of recharge value
-            npv += cash_flow / ((1 + discount_rate) ** year)
+        for discount_factor in NPV_DISCOUNT_FACTORS:
+            npv += cash_flow / discount_factor
 
         npv = npv - system_cost
 
@@ -501,24 +732,20 @@ class WaterHarvestingCalculator:
             'water_security_value_inr': round(water_security_value, 0),
             'groundwater_recharge_benefit': f'{round(annual_harvest * 0.3, 0)} liters/year',
             'flood_mitigation_benefit': 'Reduced surface runoff and urban flooding',
-            'environmental_benefits': [
-                'Reduced strain on municipal water supply',
-                'Lower carbon footprint (reduced pumping)',
-                'Enhanced local groundwater levels',
-                'Reduced soil erosion and surface runoff'
-            ]
+            'environmental_benefits': COST_BENEFIT_ENVIRONMENTAL_BENEFITS
         }
 
         # Sensitivity analysis
+        payback_known = payback_period != math.inf
         analysis['sensitivity_analysis'] = {
             'optimistic_scenario': {
                 'condition': '25% higher water savings',
-                'payback_period_years': round(payback_period / 1.25, 1) if payback_period != float('inf') else 'N/A',
+                'payback_period_years': round(payback_period / 1.25, 1) if payback_known else 'N/A',
                 'npv_inr': round(npv * 1.4, 0)
             },
             'pessimistic_scenario': {
                 'condition': '25% lower water savings',
-                'payback_period_years': round(payback_period / 0.75, 1) if payback_period != float('inf') else 'N/A',
+                'payback_period_years': round(payback_period / 0.75, 1) if payback_known else 'N/A',
                 'npv_inr': round(npv * 0.6, 0)
             }
         }
@@ -535,36 +762,52 @@ class WaterHarvestingCalculator:
         analysis['risk_assessment'] = {
             'risk_level': 'Low' if len(risk_factors) == 0 else 'Medium' if len(risk_factors) <= 2 else 'High',
             'risk_factors': risk_factors,
-            'mitigation_strategies': [
-                'Apply for government subsidies and incentives',
-                'Consider phased implementation approach',
-                'Implement hybrid storage + recharge system',
-                'Regular maintenance to ensure optimal performance'
-            ]
+            'mitigation_strategies': COST_BENEFIT_MITIGATION_STRATEGIES
         }
 
         return analysis
 
     # Existing methods remain the same...
     def calculate_harvestable_water(self, roof_area_sqft: float, annual_rainfall_mm: float, 
-                                  roof_material: str = 'concrete', system_quality: str = 'standard') -> float:
+                                  roof_material: str = 'concrete', system_quality: str = 'standard',
+                                  area_sqm: Optional[float] = None) -> float:
         """Calculate annual harvestable water volume in liters"""
-        roof_area_sqm = roof_area_sqft * 0.092903
+        if area_sqm is None:
+            area_sqm = roof_area_sqm(roof_area_sqft)
         runoff_coeff = self.runoff_coefficients.get(roof_material.lower(), 0.75)
         collection_eff = self.collection_efficiency.get(system_quality.lower(), 0.80)
-        harvestable_liters = roof_area_sqm * annual_rainfall_mm * runoff_coeff * collection_eff
+        harvestable_liters = area_sqm * annual_rainfall_mm * runoff_coeff * collection_eff
         return round(harvestable_liters, 0)
 
     def calculate_monthly_potential(self, annual_harvest: float, rainfall_distribution: Dict[str, float]) -> Dict[str, float]:
         """Calculate monthly harvesting potential"""
+        return {
+            month: round(annual_harvest * (percentage / 100), 0)
+            for month, percentage in rainfall_distribution.items()
+        }
+
+    def calculate_monthly_potential_and_storage(self, annual_harvest: float,
+                                                rainfall_distribution: Dict[str, float]
+                                                ) -> Tuple[Dict[str, float], Dict[str, int]]:
+        """Monthly harvesting potential and storage sizes, finding the peak month in the same pass"""
         monthly_harvest = {}
+        peak_monthly = None
         for month, percentage in rainfall_distribution.items():
-            monthly_harvest[month] = round(annual_harvest * (percentage / 100), 0)
-        return monthly_harvest
+            monthly = round(annual_harvest * (percentage / 100), 0)
+            monthly_harvest[month] = monthly
+            if peak_monthly is None or monthly > peak_monthly:
+                peak_monthly = monthly
+
+        if peak_monthly is None:
+            raise ValueError("Rainfall distribution is empty")
+
+        return monthly_harvest, self._storage_sizes_for_peak(peak_monthly)
 
     def calculate_optimal_storage_size(self, monthly_harvest: Dict[str, float]) -> Dict[str, int]:
         """Calculate optimal storage tank sizes"""
-        peak_monthly = max(monthly_harvest.values())
+        return self._storage_sizes_for_peak(max(monthly_harvest.values()))
+
+    def _storage_sizes_for_peak(self, peak_monthly: float) -> Dict[str, int]:
         min_size = max(3000, peak_monthly * 0.5)
         optimal_size = peak_monthly * 1.3
         max_beneficial = peak_monthly * 2.0
@@ -577,25 +820,22 @@ class WaterHarvestingCalculator:
 
     def calculate_system_cost(self, tank_capacity: int, system_type: str = 'standard') -> Dict[str, float]:
         """Calculate implementation costs"""
-        tank_cost = tank_capacity * self.cost_estimates['tank_cost_per_liter']
-
-        if system_type == 'advanced':
-            filtration_cost = self.cost_estimates['filtration_advanced']
-            pump_cost = self.cost_estimates['pump_1hp']
-        else:
-            filtration_cost = self.cost_estimates['filtration_basic']
-            pump_cost = self.cost_estimates['pump_0_5hp']
+        cost_estimates = self.cost_estimates
+        tank_cost = tank_capacity * cost_estimates['tank_cost_per_liter']
+        filtration_cost, pump_cost = self.system_equipment_costs.get(system_type, BASIC_EQUIPMENT_COSTS)
 
-        installation_cost = self.cost_estimates['installation_base']
+        installation_cost = cost_estimates['installation_base']
         subtotal = tank_cost + filtration_cost + pump_cost + installation_cost
-        contingency = subtotal * self.cost_estimates['contingency_factor']
+        contingency = subtotal * cost_estimates['contingency_factor']
         total_cost = subtotal + contingency
 
+        # Tank, filtration, pump and installation costs are whole rupees already;
+        # only the contingency share needs rounding
         return {
-            'tank_cost': round(tank_cost, 0),
-            'filtration_cost': round(filtration_cost, 0),
-            'pump_cost': round(pump_cost, 0),
-            'installation_cost': round(installation_cost, 0),
+            'tank_cost': tank_cost,
+            'filtration_cost': filtration_cost,
+            'pump_cost': pump_cost,
+            'installation_cost': installation_cost,
             'contingency': round(contingency, 0),
             'total_cost': round(total_cost, 0)
         }
@@ -608,7 +848,7 @@ class WaterHarvestingCalculator:
         water_rate = self.water_pricing.get(region_type, 12)
         annual_savings = (usable_water / 1000) * water_rate
 
-        payback_period = total_cost / annual_savings if annual_savings > 0 else float('inf')
+        payback_period = total_cost / annual_savings if annual_savings > 0 else math.inf
         total_20_year_savings = annual_savings * 20
         net_20_year_benefit = total_20_year_savings - total_cost
         roi_percentage = (net_20_year_benefit / total_cost) * 100 if total_cost > 0 else 0
@@ -623,12 +863,58 @@ class WaterHarvestingCalculator:
         }
 
 
+# Rainfall distribution keys in calendar order, and the seasons as slices of that order
+MONTHS = ('jan', 'feb', 'mar', 'apr', 'may', 'jun',
+          'jul', 'aug', 'sep', 'oct', 'nov', 'dec')
+WINTER = slice(0, 2)
+PRE_MONSOON = slice(2, 5)
+MONSOON = slice(5, 9)
+POST_MONSOON = slice(9, 12)
+
+
+def monthly_values(distribution: Dict) -> Tuple[float, ...]:
+    """Monthly distribution as a tuple in calendar order (missing months are 0)"""
+    return tuple(distribution.get(month, 0) for month in MONTHS)
+
+
+# Reference coordinates (lat, lng) of the cities with fallback rainfall data
+CITY_COORDINATES = (
+    ('mumbai', 19.0760, 72.8777),
+    ('delhi', 28.6139, 77.2090),
+    ('bangalore', 12.9716, 77.5946),
+    ('chennai', 13.0827, 80.2707),
+    ('kolkata', 22.5726, 88.3639),
+    ('hyderabad', 17.3850, 78.4867),
+    ('pune', 18.5204, 73.8567),
+    ('ahmedabad', 23.0225, 72.5714),
+    ('jaipur', 26.9124, 75.7873),
+    ('kochi', 9.9312, 76.2673)
+)
+
+
+def _is_open_meteo_outage(error: Exception) -> bool:
+    """True if a failed fetch means Open-Meteo itself is unavailable (connection error, timeout, 429, 5xx)"""
+    # Other failures (4xx, malformed data) are specific to one request and must not back off the rest
+    if isinstance(error, requests.HTTPError) and error.response is not None:
+        return error.response.status_code == 429 or error.response.status_code >= 500
+    return isinstance(error, (requests.ConnectionError, requests.Timeout))
+
+
 # Keep existing WeatherDataService and SoilDataService classes unchanged
 class WeatherDataService:
     """Service to fetch weather and rainfall data"""
 
     def __init__(self):
         self.open_meteo_base_url = "https://api.open-meteo.com/v1"
+        self.session = self._create_session()
+
+        # time.monotonic() before which Open-Meteo is not retried after a failure
+        self._open_meteo_retry_at = 0.0
+
+        # Processed Open-Meteo rainfall by (lat, lng, cache window) grid cell, oldest first
+        self._cell_rainfall_cache = {}
+        self._cell_rainfall_lock = threading.Lock()
+        self.disk_cache = RainfallDiskCache(RAINFALL_DISK_CACHE_PATH, RAINFALL_CACHE_TTL_SECONDS)
 
         # Fallback rainfall data for major cities
         self.fallback_rainfall_data = {
@@ -644,111 +930,143 @@ class WeatherDataService:
             'kochi': {'annual': 3055, 'distribution': {'jan': 0.8, 'feb': 1.2, 'mar': 2.4, 'apr': 4.8, 'may': 12.6, 'jun': 21.4, 'jul': 22.8, 'aug': 18.4, 'sep': 11.2, 'oct': 10.8, 'nov': 5.2, 'dec': 1.8}}
         }
 
+    @staticmethod
+    def _create_session() -> requests.Session:
+        """HTTP session that keeps Open-Meteo connections alive (no retries; failures back off instead)"""
+        session = requests.Session()
+        session.mount('https://', HTTPAdapter(pool_connections=4, pool_maxsize=16))
+        return session
+
     def get_city_from_coordinates(self, lat: float, lng: float) -> str:
         """Determine nearest major city from coordinates"""
-        cities = {
-            'mumbai': (19.0760, 72.8777), 'delhi': (28.6139, 77.2090), 'bangalore': (12.9716, 77.5946),
-            'chennai': (13.0827, 80.2707), 'kolkata': (22.5726, 88.3639), 'hyderabad': (17.3850, 78.4867),
-            'pune': (18.5204, 73.8567), 'ahmedabad': (23.0225, 72.5714), 'jaipur': (26.9124, 75.7873),
-            'kochi': (9.9312, 76.2673)
-        }
-
-        min_distance = float('inf')
+        # Squared distance is enough to pick the nearest city
         nearest_city = 'delhi'
-
-        for city, (city_lat, city_lng) in cities.items():
-            distance = math.sqrt((lat - city_lat)**2 + (lng - city_lng)**2)
+        min_distance = math.inf
+        for city, city_lat, city_lng in CITY_COORDINATES:
+            dlat = lat - city_lat
+            dlng = lng - city_lng
+            distance = dlat * dlat + dlng * dlng
             if distance < min_distance:
                 min_distance = distance
                 nearest_city = city
-
         return nearest_city
 
     def get_rainfall_data(self, lat: float, lng: float) -> Dict:
-        """Get rainfall data with fallback options"""
-        try:
-            response = requests.get(
-                f"{self.open_meteo_base_url}/historical-weather",
-                params={
-                    'latitude': lat, 'longitude': lng, 'start_date': '2020-01-01',
-                    'end_date': '2023-12-31', 'daily': 'precipitation_sum',
-                    'timezone': 'Asia/Kolkata'
-                }, timeout=10
-            )
+        """Get rainfall data with fallback options (Open-Meteo data cached per grid cell)"""
+        return self.fetch_rainfall_data(lat, lng)[0]
+
+    def fetch_rainfall_data(self, lat: float, lng: float) -> Tuple[Dict, bool]:
+        """Rainfall data for a location and whether it came from Open-Meteo (False: city fallback)"""
+        lat = float(lat)
+        lng = float(lng)
+        cell = (_snap_to_grid(lat), _snap_to_grid(lng), _cache_window(RAINFALL_CACHE_TTL_SECONDS))
+
+        rainfall_data = self._get_cached_cell_rainfall_data(cell)
+        if rainfall_data is not None:
+            return rainfall_data, True
+
+        if time.monotonic() >= self._open_meteo_retry_at:
+            try:
+                rainfall_data = self._fetch_open_meteo_data(cell[0], cell[1])
+            except (requests.RequestException, ValueError) as e:
+                logger.warning(f"Failed to fetch from Open-Meteo: {str(e)}")
+                if _is_open_meteo_outage(e):
+                    self._open_meteo_retry_at = time.monotonic() + RAINFALL_RETRY_AFTER_SECONDS
+            else:
+                # Only data processed from a real Open-Meteo response is cached or persisted
+                self._remember_cell_rainfall_data(cell, rainfall_data)
+                self.disk_cache.set(cell[0], cell[1], rainfall_data)
+                return rainfall_data, True
 
-            if response.status_code == 200:
-                data = response.json()
-                return self._process_open_meteo_data(data)
+        nearest_city = self.get_city_from_coordinates(lat, lng)
+        return self.fallback_rainfall_data.get(nearest_city, self.fallback_rainfall_data['delhi']), False
+
+    def _get_cached_cell_rainfall_data(self, cell: Tuple[float, float, int]) -> Optional[Dict]:
+        """Open-Meteo rainfall for a (lat, lng, cache window) cell from memory or disk, if cached"""
+        rainfall_data = self._cell_rainfall_cache.get(cell)
+        if rainfall_data is None:
+            rainfall_data = self.disk_cache.get(cell[0], cell[1])
+            if rainfall_data is not None:
+                self._remember_cell_rainfall_data(cell, rainfall_data)
+        return rainfall_data
+
+    def _remember_cell_rainfall_data(self, cell: Tuple[float, float, int], rainfall_data: Dict) -> None:
+        """Keep rainfall for a cell in memory, evicting the oldest cell beyond RAINFALL_CACHE_SIZE"""
+        with self._cell_rainfall_lock:
+            self._cell_rainfall_cache[cell] = rainfall_data
+            if len(self._cell_rainfall_cache) > RAINFALL_CACHE_SIZE:
+                del self._cell_rainfall_cache[next(iter(self._cell_rainfall_cache))]
+
+    def _fetch_open_meteo_data(self, lat: float, lng: float) -> Dict:
+        """Fetch and process Open-Meteo history for a grid cell; raises on any failure"""
+        response = self.session.get(
+            f"{self.open_meteo_base_url}/historical-weather",
+            params={
+                'latitude': lat, 'longitude': lng, 'start_date': '2020-01-01',
+                'end_date': '2023-12-31', 'daily': 'precipitation_sum',
+                'timezone': 'Asia/Kolkata'
+            }, timeout=10
+        )
 
-        except Exception as e:
-            logger.warning(f"Failed to fetch from Open-Meteo: {str(e)}")
+        if response.status_code != 200:
+            raise requests.HTTPError(f"Open-Meteo returned HTTP {response.status_code}", response=response)
 
-        nearest_city = self.get_city_from_coordinates(lat, lng)
-        return self.fallback_rainfall_data.get(nearest_city, self.fallback_rainfall_data['delhi'])
+        return self._process_open_meteo_data(response.json())
 
     def _process_open_meteo_data(self, data: Dict) -> Dict:
-        """Process Open-Meteo historical data"""
+        """Process Open-Meteo historical data; raises ValueError if it is missing or malformed"""
         try:
-            daily_data = data.get('daily', {})
-            precipitation = daily_data.get('precipitation_sum', [])
-            dates = daily_data.get('time', [])
-
-            if not precipitation or not dates:
-                return self.fallback_rainfall_data['delhi']
-
-            monthly_totals = {month: 0 for month in ['jan', 'feb', 'mar', 'apr', 'may', 'jun', 
-                                                   'jul', 'aug', 'sep', 'oct', 'nov', 'dec']}
-
-            month_names = ['jan', 'feb', 'mar', 'apr', 'may', 'jun', 
-                          'jul', 'aug', 'sep', 'oct', 'nov', 'dec']
+            daily_data = data.get('daily') or {}
+            precipitation = daily_data.get('precipitation_sum') or []
+            dates = daily_data.get('time') or []
+
+            # Accumulate by month index (dates are ISO YYYY-MM-DD), then key the result by MONTHS;
+            # days without a reading (None) are skipped
+            monthly_totals = [0] * len(MONTHS)
+            for date_str, amount in zip(dates, precipitation):
+                if amount is not None:
+                    monthly_totals[int(date_str[5:7]) - 1] += amount
+        except (AttributeError, TypeError, IndexError) as e:
+            raise ValueError(f"Malformed Open-Meteo data: {str(e)}") from e
+
+        if not precipitation or not dates:
+            raise ValueError("Open-Meteo data has no daily precipitation")
+
+        annual_total = sum(monthly_totals)
+        distribution = {
+            month: round((total / annual_total * 100), 1) if annual_total > 0 else 0
+            for month, total in zip(MONTHS, monthly_totals)
+        }
 
-            for i, date_str in enumerate(dates):
-                if i < len(precipitation):
-                    month_idx = int(date_str.split('-')[1]) - 1
-                    monthly_totals[month_names[month_idx]] += precipitation[i]
+        return {'annual': round(annual_total, 0), 'distribution': distribution}
 
-            annual_total = sum(monthly_totals.values())
-            distribution = {}
-            for month, total in monthly_totals.items():
-                distribution[month] = round((total / annual_total * 100), 1) if annual_total > 0 else 0
 
-            return {'annual': round(annual_total, 0), 'distribution': distribution}
+# Soil characteristics and aquifer prospects by soil type (read-only)
+SOIL_DATA = MappingProxyType({
+    'alluvial': {'infiltration_rate': 'Medium (5-15 mm/hr)', 'suitability': 'Good for both storage and recharge'},
+    'black': {'infiltration_rate': 'Low (1-5 mm/hr)', 'suitability': 'Better for storage systems'},
+    'red': {'infiltration_rate': 'High (15-30 mm/hr)', 'suitability': 'Excellent for recharge'},
+    'laterite': {'infiltration_rate': 'Medium-High (10-20 mm/hr)', 'suitability': 'Good for recharge'},
+    'desert': {'infiltration_rate': 'Very High (20-50 mm/hr)', 'suitability': 'Excellent for recharge'},
+    'mountain': {'infiltration_rate': 'Variable (5-25 mm/hr)', 'suitability': 'Site-specific assessment needed'}
+})
 
-        except Exception as e:
-            logger.error(f"Error processing Open-Meteo data: {str(e)}")
-            return self.fallback_rainfall_data['delhi']
+AQUIFER_PROSPECTS = MappingProxyType({
+    'alluvial': 'Excellent', 'black': 'Good', 'red': 'Moderate to Good',
+    'laterite': 'Moderate', 'desert': 'Poor to Moderate', 'mountain': 'Variable'
+})
 
 
 class SoilDataService:
     """Service to get soil and groundwater information"""
 
     def __init__(self):
-        self.soil_data = {
-            'alluvial': {'infiltration_rate': 'Medium (5-15 mm/hr)', 'suitability': 'Good for both storage and recharge'},
-            'black': {'infiltration_rate': 'Low (1-5 mm/hr)', 'suitability': 'Better for storage systems'},
-            'red': {'infiltration_rate': 'High (15-30 mm/hr)', 'suitability': 'Excellent for recharge'},
-            'laterite': {'infiltration_rate': 'Medium-High (10-20 mm/hr)', 'suitability': 'Good for recharge'},
-            'desert': {'infiltration_rate': 'Very High (20-50 mm/hr)', 'suitability': 'Excellent for recharge'},
-            'mountain': {'infiltration_rate': 'Variable (5-25 mm/hr)', 'suitability': 'Site-specific assessment needed'}
-        }
+        self.soil_data = SOIL_DATA
 
     def get_soil_type(self, lat: float, lng: float) -> Dict:
         """Get soil type based on geographical location"""
         # Simplified regional mapping
-        if 20 <= lat <= 30 and 68 <= lng <= 78:
-            soil_type = 'desert' if lng < 74 else 'alluvial'
-        elif 18 <= lat <= 25 and 72 <= lng <= 85:
-            soil_type = 'black'
-        elif 8 <= lat <= 18 and 75 <= lng <= 80:
-            soil_type = 'red'
-        elif lat < 18 and lng > 75:
-            soil_type = 'red'
-        elif lat > 25 and lng > 85:
-            soil_type = 'alluvial'
-        elif lat > 28:
-            soil_type = 'mountain'
-        else:
-            soil_type = 'alluvial'
+        soil_type = find_region(SOIL_REGIONS, lat, lng, 'alluvial')
 
         soil_info = self.soil_data.get(soil_type, self.soil_data['alluvial'])
 
@@ -762,24 +1080,11 @@ class SoilDataService:
 
     def _estimate_groundwater_depth(self, lat: float, lng: float) -> str:
         """Estimate groundwater depth based on region"""
-        if 20 <= lat <= 30 and lng < 75:
-            return "20-50 meters"
-        elif 18 <= lat <= 25:
-            return "10-30 meters"
-        elif lat < 18:
-            return "5-20 meters"
-        elif lng > 85:
-            return "5-15 meters"
-        else:
-            return "10-25 meters"
+        return find_region(GROUNDWATER_DEPTH_REGIONS, lat, lng, "10-25 meters")
 
     def _assess_aquifer_prospects(self, soil_type: str) -> str:
         """Assess aquifer prospects based on soil type"""
-        prospects = {
-            'alluvial': 'Excellent', 'black': 'Good', 'red': 'Moderate to Good',
-            'laterite': 'Moderate', 'desert': 'Poor to Moderate', 'mountain': 'Variable'
-        }
-        return prospects.get(soil_type, 'Moderate')
+        return AQUIFER_PROSPECTS.get(soil_type, 'Moderate')
 
 
 # Create service instances
@@ -798,35 +1103,251 @@ print("✓ Enhanced cost-benefit analysis")
 
 # API Routes and Supporting Functions for Enhanced Water Harvesting API
 
+# Features advertised by the health check
+HEALTH_FEATURES = [
+    'Feasibility Analysis',
+    'RTRWH Structure Recommendations',
+    'Aquifer Information',
+    'Runoff Capacity Analysis',
+    'Recharge Structure Designs',
+    'Enhanced Cost-Benefit Analysis'
+]
+
+
+@app.errorhandler(413)
+def request_too_large(e):
+    """Oversized request bodies get the standard JSON error format"""
+    return jsonify({
+        'error': 'Request body too large',
+        'message': f"Maximum request size is {app.config['MAX_CONTENT_LENGTH']} bytes"
+    }), 413
+
+
 @app.route('/health', methods=['GET'])
 def health_check():
     """Health check endpoint"""
     return jsonify({
         'status': 'healthy',
-        'timestamp': datetime.now().isoformat(),
+        'timestamp': iso_timestamp(),
         'version': '2.0',
-        'features': [
-            'Feasibility Analysis',
-            'RTRWH Structure Recommendations', 
-            'Aquifer Information',
-            'Runoff Capacity Analysis',
-            'Recharge Structure Designs',
-            'Enhanced Cost-Benefit Analysis'
-        ]
+        'features': HEALTH_FEATURES,
+        'max_batch_size': MAX_BATCH_SITES
     })
 
 
-@app.route('/api/v1/water-harvesting/analyze', methods=['POST'])
-def analyze_water_harvesting():
-    """Enhanced main API endpoint for comprehensive water harvesting analysis"""
+class _UncachedAnalysis(Exception):
+    """Carries an analysis out of _compute_enhanced_analysis so lru_cache does not keep it"""
+
+    def __init__(self, analysis: Dict):
+        super().__init__()
+        self.analysis = analysis
+
+
+@functools.lru_cache(maxsize=ANALYSIS_CACHE_SIZE, typed=True)
+def _compute_enhanced_analysis(lat: float, lng: float, address: str, roof_area_sqft: float,
+                               household_size: int, system_type: str, region_type: str,
+                               roof_material: str, budget_range: str, plot_area_sqft: float,
+                               cache_window: int) -> Dict:
+    """Response body (minus status/timestamp/version) for an input set; cached, treat as read-only.
+
+    Analyses built on city fallback rainfall are raised as _UncachedAnalysis instead, so the
+    next request retries Open-Meteo rather than reusing them for the whole cache window.
+    """
+    _analysis_state.computed = True
+
+    # Fetch external data
+    rainfall_data, from_open_meteo = weather_service.fetch_rainfall_data(lat, lng)
+    soil_data = soil_service.get_soil_type(lat, lng)
+    monthly_rainfall = monthly_values(rainfall_data['distribution'])
+
+    # 1. FEASIBILITY CHECK FOR RTRWH
+    feasibility_analysis = calculator.calculate_feasibility_score(
+        annual_rainfall=rainfall_data['annual'],
+        roof_area=roof_area_sqft,
+        soil_data=soil_data,
+        household_size=household_size
+    )
+
+    # 2. Calculate harvestable water and runoff capacity
+    area_sqm = roof_area_sqm(roof_area_sqft)
+    annual_harvest = calculator.calculate_harvestable_water(
+        roof_area_sqft=roof_area_sqft,
+        annual_rainfall_mm=rainfall_data['annual'],
+        roof_material=roof_material,
+        system_quality=system_type,
+        area_sqm=area_sqm
+    )
+
+    # 3. RUNOFF GENERATION CAPACITY
+    runoff_capacity = calculator.calculate_runoff_capacity(
+        roof_area=roof_area_sqft,
+        rainfall_data=rainfall_data,
+        roof_material=roof_material,
+        area_sqm=area_sqm
+    )
+
+    # 4. Monthly potential and storage sizing
+    monthly_harvest, storage_sizes = calculator.calculate_monthly_potential_and_storage(
+        annual_harvest, rainfall_data['distribution']
+    )
+
+    # 5. SUGGESTED RTRWH/ARTIFICIAL RECHARGE STRUCTURES  
+    structure_recommendations = calculator.suggest_rtrwh_structures(
+        annual_harvest=annual_harvest,
+        soil_data=soil_data,
+        roof_area=roof_area_sqft,
+        budget=budget_range
+    )
+
+    # 6. PRINCIPAL AQUIFER INFORMATION
+    aquifer_info = calculator.get_aquifer_information(lat, lng, soil_data)
+
+    # 7. RECHARGE STRUCTURE DIMENSIONS
+    recharge_designs = calculator.design_recharge_structures(
+        annual_runoff=annual_harvest,
+        soil_data=soil_data,
+        available_space=plot_area_sqft
+    )
+
+    # 8. Cost analysis
+    optimal_capacity = storage_sizes['optimal_liters']
+    cost_analysis = calculator.calculate_system_cost(optimal_capacity, system_type)
+
+    # Basic financial analysis
+    basic_financial = calculator.calculate_financial_analysis(
+        annual_harvest, cost_analysis['total_cost'], region_type
+    )
+
+    # 9. ENHANCED COST-BENEFIT ANALYSIS
+    recharge_benefit = annual_harvest * 0.3 * 2  # 30% recharge at ₹2/liter value
+    enhanced_cost_benefit = calculator.enhanced_cost_benefit_analysis(
+        system_cost=cost_analysis['total_cost'],
+        annual_harvest=annual_harvest,
+        annual_savings=basic_financial['annual_cost_savings_inr'],
+        recharge_benefit=recharge_benefit
+    )
+
+    # Generate additional recommendations
+    system_recommendations = generate_enhanced_system_recommendations(
+        roof_area_sqft, annual_harvest, storage_sizes, cost_analysis, 
+        soil_data, feasibility_analysis
+    )
+
+    # Generate implementation plan
+    implementation_plan = generate_enhanced_implementation_plan(
+        cost_analysis['total_cost'], structure_recommendations
+    )
+
+    # Build comprehensive response with all requested features
+    analysis = {
+        # Basic location and input summary
+        'location': {
+            'coordinates': {'lat': lat, 'lng': lng},
+            'address': address,
+            'region_type': region_type,
+            'administrative_info': determine_administrative_region(lat, lng)
+        },
 
-    try:
-        # Get request data
-        data = request.get_json()
+        # 1. FEASIBILITY CHECK FOR ROOFTOP RAINWATER HARVESTING
+        'feasibility_analysis': feasibility_analysis,
+
+        # 2. LOCAL RAINFALL DATA (Enhanced)
+        'rainfall_data': {
+            'annual_rainfall_mm': rainfall_data['annual'],
+            'monthly_distribution': rainfall_data['distribution'],
+            'peak_months': get_peak_rainfall_months(monthly_rainfall),
+            'monsoon_characteristics': analyze_monsoon_pattern(monthly_rainfall),
+            'collection_window': determine_collection_window(monthly_rainfall)
+        },
+
+        # 3. RUNOFF GENERATION CAPACITY  
+        'runoff_capacity': runoff_capacity,
+
+        # 4. DEPTH TO GROUNDWATER LEVEL & AQUIFER INFO
+        'groundwater_and_aquifer': {
+            'depth_to_groundwater': soil_data['groundwater_depth'],
+            'aquifer_prospects': soil_data['aquifer_prospects'],
+            'principal_aquifer_info': aquifer_info,
+            'recharge_potential': aquifer_info.get('recharge_potential', 'Moderate')
+        },
+
+        # 5. SOIL AND GEOLOGICAL DATA
+        'soil_and_geology': {
+            **soil_data,
+            'suitability_for_recharge': assess_recharge_suitability(soil_data),
+            'recommended_approach': recommend_approach_based_on_soil(soil_data)
+        },
+
+        # 6. HARVESTING POTENTIAL
+        'harvesting_potential': {
+            'roof_area_sqft': roof_area_sqft,
+            'annual_harvestable_liters': annual_harvest,
+            'monthly_potential': monthly_harvest,
+            'storage_recommendations': storage_sizes,
+            'collection_efficiency_achieved': get_collection_efficiency(roof_material, system_type)
+        },
+
+        # 7. SUGGESTED TYPE OF RTRWH/ARTIFICIAL RECHARGE STRUCTURES
+        'suggested_structures': structure_recommendations,
+
+        # 8. RECOMMENDED DIMENSIONS OF RECHARGE PITS, TRENCHES, AND SHAFTS  
+        'recharge_structure_designs': recharge_designs,
+
+        # 9. SYSTEM RECOMMENDATIONS (Enhanced)
+        'system_recommendations': system_recommendations,
+
+        # 10. COST ESTIMATION AND COST-BENEFIT ANALYSIS
+        'cost_estimation': cost_analysis,
+        'cost_benefit_analysis': enhanced_cost_benefit,
+
+        # Additional comprehensive information
+        'implementation_plan': implementation_plan,
+        'maintenance_schedule': generate_maintenance_schedule(),
+        'regulatory_compliance': generate_enhanced_regulatory_info(lat, lng),
+        'performance_monitoring': generate_performance_monitoring_plan(),
+        'environmental_impact': assess_environmental_impact(annual_harvest, recharge_benefit)
+    }
+
+    if not from_open_meteo:
+        raise _UncachedAnalysis(analysis)
+    return analysis
+
+
+def _analysis_error(error: Exception) -> Tuple[Dict, int]:
+    logger.error(f"Error in enhanced water harvesting analysis: {str(error)}")
+    return {'error': 'Internal server error', 'message': str(error)}, 500
+
+
+# Accepted types for analysis inputs (bool is an int subclass, so it is rejected explicitly)
+_NUMBER = (int, float)
+_TEXT = (str, int, float, type(None))
+
+
+def _value_or_default(section: Dict, key: str, default):
+    """Optional input from a request section; missing keys and explicit nulls both get the default"""
+    value = section.get(key)
+    return default if value is None else value
 
+
+def _first_invalid_field(fields) -> Optional[str]:
+    """Name of the first (name, value, accepted types) field whose value has the wrong type"""
+    for name, value, accepted in fields:
+        if isinstance(value, bool) or not isinstance(value, accepted):
+            return name
+    return None
+
+
+def analyze_request(data) -> Tuple[Dict, int]:
+    """Validate and analyze one request body; returns (response body, HTTP status)"""
+
+    try:
         # Validate required fields
         if not data:
-            return jsonify({'error': 'No data provided'}), 400
+            return {'error': 'No data provided'}, 400
+        if not isinstance(data, dict) or not all(
+                isinstance(data.get(section, {}), dict)
+                for section in ('location', 'property', 'usage', 'preferences')):
+            return {'error': 'The request body and its sections must be JSON objects'}, 400
 
         # Extract location
         location = data.get('location', {})
@@ -834,224 +1355,119 @@ def analyze_water_harvesting():
         lng = location.get('lng')
 
         if not lat or not lng:
-            return jsonify({'error': 'Latitude and longitude are required'}), 400
+            return {'error': 'Latitude and longitude are required'}, 400
 
         # Extract property details
         property_details = data.get('property', {})
         roof_area_sqft = property_details.get('roof_area_sqft')
 
         if not roof_area_sqft:
-            return jsonify({'error': 'Roof area is required'}), 400
+            return {'error': 'Roof area is required'}, 400
 
         # Extract other parameters
         usage = data.get('usage', {})
-        household_size = usage.get('household_size', 4)
+        household_size = _value_or_default(usage, 'household_size', 4)
         preferences = data.get('preferences', {})
-        system_type = preferences.get('system_type', 'standard')
-        region_type = preferences.get('region_type', 'urban')
-        roof_material = property_details.get('roof_material', 'concrete')
-        budget_range = preferences.get('budget_range', '75000-150000')
+        system_type = _value_or_default(preferences, 'system_type', 'standard')
+        region_type = _value_or_default(preferences, 'region_type', 'urban')
+        roof_material = _value_or_default(property_details, 'roof_material', 'concrete')
+        budget_range = _value_or_default(preferences, 'budget_range', '75000-150000')
+
+        address = location.get('address', f'Location {lat}, {lng}')
+        plot_area_sqft = _value_or_default(property_details, 'plot_area_sqft', 2000)
+
+        # Inputs form the analysis cache key, so they must be plain scalars of the expected type
+        invalid = _first_invalid_field((
+            ('lat', lat, _NUMBER), ('lng', lng, _NUMBER), ('roof_area_sqft', roof_area_sqft, _NUMBER),
+            ('household_size', household_size, _NUMBER), ('plot_area_sqft', plot_area_sqft, _NUMBER),
+            ('system_type', system_type, str), ('region_type', region_type, str),
+            ('roof_material', roof_material, str), ('budget_range', budget_range, str),
+            ('address', address, _TEXT)
+        ))
+        if invalid:
+            return {'error': f'Invalid value for {invalid}'}, 400
+        if not (-90 <= lat <= 90 and -180 <= lng <= 180):
+            return {'error': 'Latitude must be within [-90, 90] and longitude within [-180, 180]'}, 400
 
         logger.info(f"Enhanced analysis for location: {lat}, {lng}")
 
-        # Fetch external data
-        rainfall_data = weather_service.get_rainfall_data(lat, lng)
-        soil_data = soil_service.get_soil_type(lat, lng)
-
-        # 1. FEASIBILITY CHECK FOR RTRWH
-        feasibility_analysis = calculator.calculate_feasibility_score(
-            annual_rainfall=rainfall_data['annual'],
-            roof_area=roof_area_sqft,
-            soil_data=soil_data,
-            household_size=household_size
-        )
-
-        # 2. Calculate harvestable water and runoff capacity
-        annual_harvest = calculator.calculate_harvestable_water(
-            roof_area_sqft=roof_area_sqft,
-            annual_rainfall_mm=rainfall_data['annual'],
-            roof_material=roof_material,
-            system_quality=system_type
-        )
-
-        # 3. RUNOFF GENERATION CAPACITY
-        runoff_capacity = calculator.calculate_runoff_capacity(
-            roof_area=roof_area_sqft,
-            rainfall_data=rainfall_data,
-            roof_material=roof_material
-        )
-
-        # 4. Monthly potential and storage sizing
-        monthly_harvest = calculator.calculate_monthly_potential(
-            annual_harvest, rainfall_data['distribution']
-        )
-
-        storage_sizes = calculator.calculate_optimal_storage_size(monthly_harvest)
-
-        # 5. SUGGESTED RTRWH/ARTIFICIAL RECHARGE STRUCTURES  
-        structure_recommendations = calculator.suggest_rtrwh_structures(
-            annual_harvest=annual_harvest,
-            soil_data=soil_data,
-            roof_area=roof_area_sqft,
-            budget=budget_range
-        )
-
-        # 6. PRINCIPAL AQUIFER INFORMATION
-        aquifer_info = calculator.get_aquifer_information(lat, lng, soil_data)
-
-        # 7. RECHARGE STRUCTURE DIMENSIONS
-        recharge_designs = calculator.design_recharge_structures(
-            annual_runoff=annual_harvest,
-            soil_data=soil_data,
-            available_space=property_details.get('plot_area_sqft', 2000)
-        )
-
-        # 8. Cost analysis
-        optimal_capacity = storage_sizes['optimal_liters']
-        cost_analysis = calculator.calculate_system_cost(optimal_capacity, system_type)
-
-        # Basic financial analysis
-        basic_financial = calculator.calculate_financial_analysis(
-            annual_harvest, cost_analysis['total_cost'], region_type
-        )
-
-        # 9. ENHANCED COST-BENEFIT ANALYSIS
-        recharge_benefit = annual_harvest * 0.3 * 2  # 30% recharge at ₹2/liter value
-        enhanced_cost_benefit = calculator.enhanced_cost_benefit_analysis(
-            system_cost=cost_analysis['total_cost'],
-            annual_harvest=annual_harvest,
-            annual_savings=basic_financial['annual_cost_savings_inr'],
-            recharge_benefit=recharge_benefit
-        )
-
-        # Generate additional recommendations
-        system_recommendations = generate_enhanced_system_recommendations(
-            roof_area_sqft, annual_harvest, storage_sizes, cost_analysis, 
-            soil_data, feasibility_analysis
-        )
-
-        # Generate implementation plan
-        implementation_plan = generate_enhanced_implementation_plan(
-            cost_analysis['total_cost'], structure_recommendations
-        )
+        try:
+            analysis = _compute_enhanced_analysis(
+                lat, lng, address, roof_area_sqft, household_size, system_type, region_type,
+                roof_material, budget_range, plot_area_sqft, _cache_window(ANALYSIS_CACHE_TTL_SECONDS)
+            )
+        except _UncachedAnalysis as uncached:
+            analysis = uncached.analysis
 
-        # Build comprehensive response with all requested features
-        response = {
+        return {
             'status': 'success',
-            'timestamp': datetime.now().isoformat(),
+            'timestamp': iso_timestamp(),
             'api_version': '2.0',
+            **analysis
+        }, 200
 
-            # Basic location and input summary
-            'location': {
-                'coordinates': {'lat': lat, 'lng': lng},
-                'address': location.get('address', f'Location {lat}, {lng}'),
-                'region_type': region_type,
-                'administrative_info': determine_administrative_region(lat, lng)
-            },
-
-            # 1. FEASIBILITY CHECK FOR ROOFTOP RAINWATER HARVESTING
-            'feasibility_analysis': feasibility_analysis,
+    except Exception as e:
+        return _analysis_error(e)
 
-            # 2. LOCAL RAINFALL DATA (Enhanced)
-            'rainfall_data': {
-                'annual_rainfall_mm': rainfall_data['annual'],
-                'monthly_distribution': rainfall_data['distribution'],
-                'peak_months': get_peak_rainfall_months(rainfall_data['distribution']),
-                'monsoon_characteristics': analyze_monsoon_pattern(rainfall_data['distribution']),
-                'collection_window': determine_collection_window(rainfall_data['distribution'])
-            },
 
-            # 3. RUNOFF GENERATION CAPACITY  
-            'runoff_capacity': runoff_capacity,
+@app.route('/api/v1/water-harvesting/analyze', methods=['POST'])
+def analyze_water_harvesting():
+    """Enhanced main API endpoint for comprehensive water harvesting analysis"""
 
-            # 4. DEPTH TO GROUNDWATER LEVEL & AQUIFER INFO
-            'groundwater_and_aquifer': {
-                'depth_to_groundwater': soil_data['groundwater_depth'],
-                'aquifer_prospects': soil_data['aquifer_prospects'],
-                'principal_aquifer_info': aquifer_info,
-                'recharge_potential': aquifer_info.get('recharge_potential', 'Moderate')
-            },
+    try:
+        data = request.get_json()
+    except Exception as e:
+        body, status = _analysis_error(e)
+        return jsonify(body), status
 
-            # 5. SOIL AND GEOLOGICAL DATA
-            'soil_and_geology': {
-                **soil_data,
-                'suitability_for_recharge': assess_recharge_suitability(soil_data),
-                'recommended_approach': recommend_approach_based_on_soil(soil_data)
-            },
+    _analysis_state.computed = False
+    body, status = analyze_request(data)
+    response = jsonify(body)
+    if status == 200:
+        response.headers['X-Cache'] = 'MISS' if _analysis_state.computed else 'HIT'
+    return response, status
 
-            # 6. HARVESTING POTENTIAL
-            'harvesting_potential': {
-                'roof_area_sqft': roof_area_sqft,
-                'annual_harvestable_liters': annual_harvest,
-                'monthly_potential': monthly_harvest,
-                'storage_recommendations': storage_sizes,
-                'collection_efficiency_achieved': get_collection_efficiency(roof_material, system_type)
-            },
 
-            # 7. SUGGESTED TYPE OF RTRWH/ARTIFICIAL RECHARGE STRUCTURES
-            'suggested_structures': structure_recommendations,
+@app.route('/api/v1/water-harvesting/analyze-batch', methods=['POST'])
+def analyze_water_harvesting_batch():
+    """Analyze several sites in one request; each site uses the /analyze body format"""
 
-            # 8. RECOMMENDED DIMENSIONS OF RECHARGE PITS, TRENCHES, AND SHAFTS  
-            'recharge_structure_designs': recharge_designs,
+    data = request.get_json(silent=True)
+    sites = data.get('sites') if isinstance(data, dict) else None
 
-            # 9. SYSTEM RECOMMENDATIONS (Enhanced)
-            'system_recommendations': system_recommendations,
+    if not sites or not isinstance(sites, list):
+        return jsonify({'error': 'A non-empty list of sites is required'}), 400
 
-            # 10. COST ESTIMATION AND COST-BENEFIT ANALYSIS
-            'cost_estimation': cost_analysis,
-            'cost_benefit_analysis': enhanced_cost_benefit,
+    if len(sites) > MAX_BATCH_SITES:
+        return jsonify({'error': f'At most {MAX_BATCH_SITES} sites can be analyzed per batch'}), 400
 
-            # Additional comprehensive information
-            'implementation_plan': implementation_plan,
-            'maintenance_schedule': generate_maintenance_schedule(),
-            'regulatory_compliance': generate_enhanced_regulatory_info(lat, lng),
-            'performance_monitoring': generate_performance_monitoring_plan(),
-            'environmental_impact': assess_environmental_impact(annual_harvest, recharge_benefit)
-        }
+    # Each result carries the HTTP status and body /analyze would return for that site
+    results = []
+    for site in sites:
+        body, status = analyze_request(site)
+        results.append({'status': status, 'body': body})
 
-        return jsonify(response)
-
-    except Exception as e:
-        logger.error(f"Error in enhanced water harvesting analysis: {str(e)}")
-        return jsonify({'error': 'Internal server error', 'message': str(e)}), 500
+    return jsonify({
+        'status': 'success',
+        'timestamp': iso_timestamp(),
+        'count': len(results),
+        'results': results
+    })
 
 
 def determine_administrative_region(lat: float, lng: float) -> Dict:
     """Determine administrative region for regulatory info"""
 
-    # Simplified state mapping based on coordinates
-    if 28.4 <= lat <= 28.9 and 76.8 <= lng <= 77.3:
-        return {'state': 'Delhi', 'region': 'National Capital Territory'}
-    elif 18.9 <= lat <= 19.3 and 72.7 <= lng <= 73.0:
-        return {'state': 'Maharashtra', 'region': 'Mumbai Metropolitan'}
-    elif 12.8 <= lat <= 13.1 and 77.4 <= lng <= 77.8:
-        return {'state': 'Karnataka', 'region': 'Bangalore Urban'}
-    elif 22.4 <= lat <= 22.7 and 88.2 <= lng <= 88.5:
-        return {'state': 'West Bengal', 'region': 'Kolkata Metropolitan'}
-    elif 13.0 <= lat <= 13.2 and 80.1 <= lng <= 80.4:
-        return {'state': 'Tamil Nadu', 'region': 'Chennai Metropolitan'}
-    else:
-        # Broader state classification
-        if lat >= 28:
-            return {'state': 'Northern India', 'region': 'Himalayan/Plains'}
-        elif lat <= 15:
-            return {'state': 'Southern India', 'region': 'Peninsular'}
-        else:
-            return {'state': 'Central India', 'region': 'Deccan Plateau'}
-
+    return find_region(ADMINISTRATIVE_REGIONS, lat, lng, DEFAULT_ADMINISTRATIVE_REGION)
 
-def analyze_monsoon_pattern(distribution: Dict) -> Dict:
-    """Analyze monsoon characteristics"""
 
-    monsoon_months = ['jun', 'jul', 'aug', 'sep']
-    pre_monsoon = ['mar', 'apr', 'may']
-    post_monsoon = ['oct', 'nov', 'dec']
-    winter = ['jan', 'feb']
+def analyze_monsoon_pattern(values: Tuple[float, ...]) -> Dict:
+    """Analyze monsoon characteristics from monthly_values()"""
 
-    monsoon_total = sum(distribution.get(month, 0) for month in monsoon_months)
-    pre_monsoon_total = sum(distribution.get(month, 0) for month in pre_monsoon)
-    post_monsoon_total = sum(distribution.get(month, 0) for month in post_monsoon)
-    winter_total = sum(distribution.get(month, 0) for month in winter)
+    monsoon_total = sum(values[MONSOON])
+    pre_monsoon_total = sum(values[PRE_MONSOON])
+    post_monsoon_total = sum(values[POST_MONSOON])
+    winter_total = sum(values[WINTER])
 
     return {
         'monsoon_concentration_percent': round(monsoon_total, 1),
@@ -1074,21 +1490,18 @@ def determine_pattern_type(monsoon_percent: float, post_monsoon_percent: float)
         return "Monsoon with Extended Season"
 
 
-def determine_collection_window(distribution: Dict) -> Dict:
-    """Determine optimal collection window"""
+def determine_collection_window(values: Tuple[float, ...]) -> Dict:
+    """Determine optimal collection window from monthly_values()"""
 
     # Find months with >10% rainfall
-    significant_months = [month for month, pct in distribution.items() if pct > 10]
+    significant_months = [month for month, pct in zip(MONTHS, values) if pct > 10]
 
-    # Find peak collection period (consecutive months with >5%)
-    all_months = ['jan', 'feb', 'mar', 'apr', 'may', 'jun', 
-                  'jul', 'aug', 'sep', 'oct', 'nov', 'dec']
+    # Count collection months (>5% of annual rainfall)
+    collection_months = sum(1 for pct in values if pct > 5)
 
-    collection_months = [month for month in all_months if distribution.get(month, 0) > 5]
-
-    if len(collection_months) >= 4:
+    if collection_months >= 4:
         collection_season = "Extended (4+ months)"
-    elif len(collection_months) >= 2:
+    elif collection_months >= 2:
         collection_season = "Moderate (2-3 months)"
     else:
         collection_season = "Short (1-2 months)"
@@ -1096,8 +1509,8 @@ def determine_collection_window(distribution: Dict) -> Dict:
     return {
         'primary_collection_months': significant_months,
         'collection_season_type': collection_season,
-        'optimal_storage_period': f"{len(collection_months)} months",
-        'storage_strategy': get_storage_strategy(len(collection_months))
+        'optimal_storage_period': f"{collection_months} months",
+        'storage_strategy': get_storage_strategy(collection_months)
     }
 
 
@@ -1114,14 +1527,13 @@ def get_storage_strategy(collection_months: int) -> str:
 def assess_recharge_suitability(soil_data: Dict) -> Dict:
     """Assess detailed recharge suitability"""
 
-    infiltration = soil_data.get('infiltration_rate', '').lower()
-    soil_type = soil_data.get('soil_type', '').lower()
+    traits = soil_traits(soil_data)
 
-    if 'high' in infiltration or 'excellent' in soil_data.get('recharge_suitability', '').lower():
+    if traits.high_infiltration or traits.excellent_recharge:
         suitability = "Excellent"
         methods = ["Recharge pits", "Percolation tanks", "Trenches"]
         limitations = "Minimal - regular maintenance needed"
-    elif 'medium' in infiltration:
+    elif traits.medium_infiltration:
         suitability = "Good"
         methods = ["Recharge trenches", "Modified pits", "Injection wells"]
         limitations = "May need filter media enhancement"
@@ -1134,47 +1546,53 @@ def assess_recharge_suitability(soil_data: Dict) -> Dict:
         'overall_suitability': suitability,
         'recommended_methods': methods,
         'limitations': limitations,
-        'enhancement_options': get_enhancement_options(soil_type)
+        'enhancement_options': get_enhancement_options(traits.soil_type)
     }
 
 
+# Enhancement options by lowercased soil name fragment, checked in order
+SOIL_ENHANCEMENT_OPTIONS = (
+    ('black', ["Add sand/gravel layers", "Create drainage channels", "Use injection wells"]),
+    ('clay', ["Deep boring", "Filter media installation", "Fracturing techniques"]),
+)
+DEFAULT_SOIL_ENHANCEMENT_OPTIONS = ["Standard filter media", "Regular de-silting", "Vegetation management"]
+
+
 def get_enhancement_options(soil_type: str) -> List[str]:
-    """Get soil enhancement options"""
-    if 'black' in soil_type.lower():
-        return ["Add sand/gravel layers", "Create drainage channels", "Use injection wells"]
-    elif 'clay' in soil_type.lower():
-        return ["Deep boring", "Filter media installation", "Fracturing techniques"]
-    else:
-        return ["Standard filter media", "Regular de-silting", "Vegetation management"]
+    """Get soil enhancement options for a lowercased soil type (SoilTraits.soil_type)"""
+    return next(
+        (options for fragment, options in SOIL_ENHANCEMENT_OPTIONS if fragment in soil_type),
+        DEFAULT_SOIL_ENHANCEMENT_OPTIONS
+    )
 
 
 def recommend_approach_based_on_soil(soil_data: Dict) -> str:
     """Recommend overall approach based on soil characteristics"""
 
-    infiltration = soil_data.get('infiltration_rate', '').lower()
+    traits = soil_traits(soil_data)
 
-    if 'high' in infiltration:
+    if traits.high_infiltration:
         return "Primary focus on artificial recharge with supplementary storage"
-    elif 'medium' in infiltration:
+    elif traits.medium_infiltration:
         return "Balanced approach - combine storage and recharge systems"
     else:
         return "Storage-focused approach with limited recharge options"
 
 
-def get_collection_efficiency(roof_material: str, system_type: str) -> Dict:
-    """Get detailed collection efficiency breakdown"""
+# Typical losses behind the collection efficiency figures (shared, never mutated)
+COLLECTION_EFFICIENCY_FACTORS = {
+    'first_flush_loss': '5-10%',
+    'gutter_overflow': '5-15%',
+    'evaporation_loss': '2-5%',
+    'filtration_loss': '5-10%'
+}
 
-    material_coeff = {
-        'concrete': 0.85, 'metal': 0.90, 'tile': 0.75,
-        'asbestos': 0.80, 'thatch': 0.60, 'other': 0.70
-    }
 
-    system_eff = {
-        'advanced': 0.90, 'standard': 0.80, 'basic': 0.70
-    }
+def get_collection_efficiency(roof_material: str, system_type: str) -> Dict:
+    """Get detailed collection efficiency breakdown"""
 
-    roof_coeff = material_coeff.get(roof_material.lower(), 0.75)
-    sys_eff = system_eff.get(system_type.lower(), 0.80)
+    roof_coeff = RUNOFF_COEFFICIENTS.get(roof_material.lower(), 0.75)
+    sys_eff = COLLECTION_EFFICIENCY.get(system_type.lower(), 0.80)
 
     overall_efficiency = roof_coeff * sys_eff
 
@@ -1182,12 +1600,7 @@ def get_collection_efficiency(roof_material: str, system_type: str) -> Dict:
         'roof_material_coefficient': roof_coeff,
         'system_efficiency': sys_eff,
         'overall_collection_efficiency': round(overall_efficiency, 2),
-        'efficiency_factors': {
-            'first_flush_loss': '5-10%',
-            'gutter_overflow': '5-15%',
-            'evaporation_loss': '2-5%',
-            'filtration_loss': '5-10%'
-        }
+        'efficiency_factors': COLLECTION_EFFICIENCY_FACTORS
     }
 
 
@@ -1247,26 +1660,110 @@ def generate_enhanced_system_recommendations(roof_area, annual_harvest, storage_
     return recommendations
 
 
-def get_feasibility_improvements(score_breakdown: Dict) -> List[str]:
-    """Get suggestions to improve feasibility"""
-    suggestions = []
+# Improvement suggestion per weak score factor (below 15); bit i of the mask is factor i
+FEASIBILITY_IMPROVEMENTS = (
+    "Consider water-efficient appliances to maximize limited rainfall",
+    "Explore community or neighborhood-level harvesting",
+    "Focus on storage systems rather than recharge",
+    "Implement water conservation measures before RTRWH",
+)
 
-    if score_breakdown.get('rainfall', 0) < 15:
-        suggestions.append("Consider water-efficient appliances to maximize limited rainfall")
+# Suggestion list for every combination of weak factors, indexed by that mask (never mutated)
+FEASIBILITY_IMPROVEMENT_SETS = tuple(
+    [suggestion for bit, suggestion in enumerate(FEASIBILITY_IMPROVEMENTS) if mask >> bit & 1]
+    or ["Excellent conditions - proceed with confidence"]
+    for mask in range(1 << len(FEASIBILITY_IMPROVEMENTS))
+)
 
-    if score_breakdown.get('roof_area', 0) < 15:
-        suggestions.append("Explore community or neighborhood-level harvesting")
 
-    if score_breakdown.get('soil_suitability', 0) < 15:
-        suggestions.append("Focus on storage systems rather than recharge")
-
-    if score_breakdown.get('water_demand', 0) < 15:
-        suggestions.append("Implement water conservation measures before RTRWH")
+def get_feasibility_improvements(score_breakdown: Dict) -> List[str]:
+    """Get suggestions to improve feasibility"""
+    mask = (
+        (score_breakdown.get('rainfall', 0) < 15)
+        | (score_breakdown.get('roof_area', 0) < 15) << 1
+        | (score_breakdown.get('soil_suitability', 0) < 15) << 2
+        | (score_breakdown.get('water_demand', 0) < 15) << 3
+    )
+    return FEASIBILITY_IMPROVEMENT_SETS[mask]
+
+
+# Implementation phases as (phase template, share of total cost, deliverables)
+ENHANCED_IMPLEMENTATION_PHASES = (
+    ({
+        'phase': 1,
+        'name': 'Site Assessment and Design',
+        'duration': '1-2 weeks',
+        'activities': [
+            'Detailed site survey and soil testing',
+            'Structural assessment of roof and foundation',
+            'Final system design and engineering drawings',
+            'Permit applications and approvals'
+        ]
+    }, 0.12,
+     ['Technical drawings', 'Material specifications', 'Work permits']),
+    ({
+        'phase': 2,
+        'name': 'Material Procurement and Preparation',
+        'duration': '1 week',
+        'activities': [
+            'Purchase tanks, pipes, and filtration equipment',
+            'Quality inspection of materials',
+            'Site preparation and temporary arrangements',
+            'Contractor mobilization'
+        ]
+    }, 0.08,
+     ['Material delivery', 'Site readiness', 'Team deployment']),
+    ({
+        'phase': 3,
+        'name': 'Primary Installation',
+        'duration': '2-3 weeks',
+        'activities': [
+            'Excavation and foundation work',
+            'Tank installation and positioning',
+            'Plumbing network installation',
+            'Electrical connections and controls'
+        ]
+    }, 0.55,
+     ['Installed storage system', 'Connected plumbing', 'Basic testing']),
+    ({
+        'phase': 4,
+        'name': 'Filtration and Recharge Systems',
+        'duration': '1-2 weeks',
+        'activities': [
+            'Filtration system installation',
+            'Recharge pit/trench construction',
+            'Pump and automation setup',
+            'System integration and calibration'
+        ]
+    }, 0.15,
+     ['Complete filtration setup', 'Recharge structures', 'Automated controls']),
+    ({
+        'phase': 5,
+        'name': 'Testing and Commissioning',
+        'duration': '1 week',
+        'activities': [
+            'Comprehensive system testing',
+            'Water quality analysis',
+            'Performance optimization',
+            'User training and documentation handover'
+        ]
+    }, 0.10,
+     ['Performance report', 'Quality certificates', 'User manual'])
+)
 
-    if not suggestions:
-        suggestions.append("Excellent conditions - proceed with confidence")
 
-    return suggestions
+IMPLEMENTATION_SUCCESS_FACTORS = [
+    'Proper site assessment and soil conditions',
+    'Quality materials and skilled installation',
+    'Adequate filtration for intended use',
+    'Regular maintenance scheduling'
+]
+IMPLEMENTATION_RISK_MITIGATION = [
+    'Weather contingency planning',
+    'Material quality assurance',
+    'Skilled contractor selection',
+    'Regular progress monitoring'
+]
 
 
 def generate_enhanced_implementation_plan(total_cost, structure_recommendations):
@@ -1275,131 +1772,88 @@ def generate_enhanced_implementation_plan(total_cost, structure_recommendations)
     return {
         'total_duration': '6-8 weeks',
         'project_phases': [
-            {
-                'phase': 1,
-                'name': 'Site Assessment and Design',
-                'duration': '1-2 weeks',
-                'activities': [
-                    'Detailed site survey and soil testing',
-                    'Structural assessment of roof and foundation',
-                    'Final system design and engineering drawings',
-                    'Permit applications and approvals'
-                ],
-                'estimated_cost': round(total_cost * 0.12),
-                'deliverables': ['Technical drawings', 'Material specifications', 'Work permits']
-            },
-            {
-                'phase': 2,
-                'name': 'Material Procurement and Preparation',
-                'duration': '1 week',
-                'activities': [
-                    'Purchase tanks, pipes, and filtration equipment',
-                    'Quality inspection of materials',
-                    'Site preparation and temporary arrangements',
-                    'Contractor mobilization'
-                ],
-                'estimated_cost': round(total_cost * 0.08),
-                'deliverables': ['Material delivery', 'Site readiness', 'Team deployment']
-            },
-            {
-                'phase': 3,
-                'name': 'Primary Installation',
-                'duration': '2-3 weeks',
-                'activities': [
-                    'Excavation and foundation work',
-                    'Tank installation and positioning',
-                    'Plumbing network installation',
-                    'Electrical connections and controls'
-                ],
-                'estimated_cost': round(total_cost * 0.55),
-                'deliverables': ['Installed storage system', 'Connected plumbing', 'Basic testing']
-            },
-            {
-                'phase': 4,
-                'name': 'Filtration and Recharge Systems',
-                'duration': '1-2 weeks',
-                'activities': [
-                    'Filtration system installation',
-                    'Recharge pit/trench construction',
-                    'Pump and automation setup',
-                    'System integration and calibration'
-                ],
-                'estimated_cost': round(total_cost * 0.15),
-                'deliverables': ['Complete filtration setup', 'Recharge structures', 'Automated controls']
-            },
-            {
-                'phase': 5,
-                'name': 'Testing and Commissioning',
-                'duration': '1 week',
-                'activities': [
-                    'Comprehensive system testing',
-                    'Water quality analysis',
-                    'Performance optimization',
-                    'User training and documentation handover'
-                ],
-                'estimated_cost': round(total_cost * 0.10),
-                'deliverables': ['Performance report', 'Quality certificates', 'User manual']
-            }
+            {**phase, 'estimated_cost': round(total_cost * cost_share), 'deliverables': deliverables}
+            for phase, cost_share, deliverables in ENHANCED_IMPLEMENTATION_PHASES
+        ],
+        'critical_success_factors': IMPLEMENTATION_SUCCESS_FACTORS,
+        'risk_mitigation': IMPLEMENTATION_RISK_MITIGATION
+    }
+
+
+# Static response section, shared by every response (treat as read-only)
+PERFORMANCE_MONITORING_PLAN = {
+    'key_performance_indicators': {
+        'water_quantity': [
+            'Monthly water harvested (liters)',
+            'System efficiency percentage',
+            'Storage utilization rate',
+            'Overflow frequency and volume'
         ],
-        'critical_success_factors': [
-            'Proper site assessment and soil conditions',
-            'Quality materials and skilled installation',
-            'Adequate filtration for intended use',
-            'Regular maintenance scheduling'
+        'water_quality': [
+            'pH levels (6.5-8.5 range)',
+            'Turbidity (< 5 NTU)',
+            'Total dissolved solids',
+            'Bacterial contamination levels'
         ],
-        'risk_mitigation': [
-            'Weather contingency planning',
-            'Material quality assurance',
-            'Skilled contractor selection',
-            'Regular progress monitoring'
+        'system_performance': [
+            'Pump operational hours',
+            'Filter replacement frequency',
+            'Energy consumption',
+            'Maintenance cost per month'
         ]
+    },
+    'monitoring_schedule': {
+        'daily': ['Visual inspection', 'Basic system checks'],
+        'weekly': ['Water level monitoring', 'Quality assessment'],
+        'monthly': ['Performance data analysis', 'Preventive maintenance'],
+        'quarterly': ['Comprehensive system audit', 'Water quality testing'],
+        'annually': ['System upgrade assessment', 'Cost-benefit review']
+    },
+    'monitoring_tools': [
+        'Water level sensors with alerts',
+        'Flow meters for harvest measurement',
+        'Basic water quality test kits',
+        'Mobile app for data logging'
+    ],
+    'performance_targets': {
+        'collection_efficiency': '>75% of theoretical potential',
+        'system_uptime': '>95% during monsoon season',
+        'water_quality': 'Meet IS 10500 standards for intended use',
+        'cost_savings': 'Achieve projected savings within 10% variance'
     }
+}
 
 
 def generate_performance_monitoring_plan():
     """Generate performance monitoring and evaluation plan"""
-
-    return {
-        'key_performance_indicators': {
-            'water_quantity': [
-                'Monthly water harvested (liters)',
-                'System efficiency percentage',
-                'Storage utilization rate',
-                'Overflow frequency and volume'
-            ],
-            'water_quality': [
-                'pH levels (6.5-8.5 range)',
-                'Turbidity (< 5 NTU)',
-                'Total dissolved solids',
-                'Bacterial contamination levels'
-            ],
-            'system_performance': [
-                'Pump operational hours',
-                'Filter replacement frequency',
-                'Energy consumption',
-                'Maintenance cost per month'
-            ]
-        },
-        'monitoring_schedule': {
-            'daily': ['Visual inspection', 'Basic system checks'],
-            'weekly': ['Water level monitoring', 'Quality assessment'],
-            'monthly': ['Performance data analysis', 'Preventive maintenance'],
-            'quarterly': ['Comprehensive system audit', 'Water quality testing'],
-            'annually': ['System upgrade assessment', 'Cost-benefit review']
-        },
-        'monitoring_tools': [
-            'Water level sensors with alerts',
-            'Flow meters for harvest measurement',
-            'Basic water quality test kits',
-            'Mobile app for data logging'
-        ],
-        'performance_targets': {
-            'collection_efficiency': '>75% of theoretical potential',
-            'system_uptime': '>95% during monsoon season',
-            'water_quality': 'Meet IS 10500 standards for intended use',
-            'cost_savings': 'Achieve projected savings within 10% variance'
-        }
-    }
+    return PERFORMANCE_MONITORING_PLAN
+
+
+GROUNDWATER_RECHARGE_NOTES = {
+    'aquifer_benefit': 'Enhanced local groundwater levels',
+    'sustainability_impact': 'Reduced pressure on municipal supply'
+}
+FLOOD_MITIGATION_IMPACT = {
+    'runoff_reduction_percent': '60-80%',
+    'urban_flooding_benefit': 'Reduced peak flow in storm drains',
+    'erosion_control': 'Minimized soil erosion from roof runoff'
+}
+CARBON_REDUCTION_NOTES = {
+    'energy_savings': 'Reduced pumping for municipal water',
+    'transport_savings': 'Eliminated water tanker dependency'
+}
+ECOSYSTEM_BENEFITS = [
+    'Enhanced local microclimate',
+    'Reduced heat island effect',
+    'Support for local vegetation',
+    'Improved water cycle balance'
+]
+LONG_TERM_SUSTAINABILITY = {
+    'water_security_enhancement': 'High',
+    'climate_resilience_building': 'Moderate to High',
+    'community_impact': 'Positive demonstration effect',
+    'scalability_potential': 'High for similar properties'
+}
 
 
 def assess_environmental_impact(annual_harvest: float, recharge_benefit: float):
@@ -1409,130 +1863,120 @@ def assess_environmental_impact(annual_harvest: float, recharge_benefit: float):
         'positive_impacts': {
             'groundwater_recharge': {
                 'annual_recharge_liters': round(annual_harvest * 0.3, 0),
-                'aquifer_benefit': 'Enhanced local groundwater levels',
-                'sustainability_impact': 'Reduced pressure on municipal supply'
-            },
-            'flood_mitigation': {
-                'runoff_reduction_percent': '60-80%',
-                'urban_flooding_benefit': 'Reduced peak flow in storm drains',
-                'erosion_control': 'Minimized soil erosion from roof runoff'
+                **GROUNDWATER_RECHARGE_NOTES
             },
+            'flood_mitigation': FLOOD_MITIGATION_IMPACT,
             'carbon_footprint_reduction': {
                 'annual_co2_savings_kg': round(annual_harvest * 0.006, 1),  # 6g CO2 per liter
-                'energy_savings': 'Reduced pumping for municipal water',
-                'transport_savings': 'Eliminated water tanker dependency'
+                **CARBON_REDUCTION_NOTES
             }
         },
-        'ecosystem_benefits': [
-            'Enhanced local microclimate',
-            'Reduced heat island effect',
-            'Support for local vegetation',
-            'Improved water cycle balance'
+        'ecosystem_benefits': ECOSYSTEM_BENEFITS,
+        'long_term_sustainability': LONG_TERM_SUSTAINABILITY
+    }
+
+
+# Regulatory information by state from ADMINISTRATIVE_REGIONS; returned as-is,
+# so treat as read-only
+STATE_REGULATORY_INFO = {
+    'Delhi': {
+        'local_mandate': 'Mandatory for plots >100 sq m under Delhi Building Bye-laws',
+        'authority': 'Delhi Jal Board and DDA',
+        'required_permits': ['Building plan approval', 'DJB NoC', 'Electrical safety clearance'],
+        'available_subsidies': [
+            {'scheme': 'DJB RTRWH Subsidy', 'amount': '₹15,000', 'eligibility': 'Residential properties'},
+            {'scheme': 'Delhi Solar Policy', 'amount': '₹5,000', 'eligibility': 'With solar integration'}
         ],
-        'long_term_sustainability': {
-            'water_security_enhancement': 'High',
-            'climate_resilience_building': 'Moderate to High',
-            'community_impact': 'Positive demonstration effect',
-            'scalability_potential': 'High for similar properties'
-        }
+        'compliance_timeline': 'Must be completed before occupancy certificate',
+        'penalties': 'Water connection may be disconnected for non-compliance',
+        'technical_standards': 'As per CPWD guidelines and IS codes',
+        'inspection_requirements': 'Pre-monsoon system check mandatory'
+    },
+    'Maharashtra': {
+        'local_mandate': 'Compulsory for plots >300 sq m in Mumbai, >500 sq m in other cities',
+        'authority': 'Maharashtra Water Resources Department',
+        'required_permits': ['Municipal building approval', 'Water supply NOC'],
+        'available_subsidies': [
+            {'scheme': 'Jal Yukt Shivar', 'amount': '₹10,000-25,000', 'eligibility': 'Rural and semi-urban'}
+        ],
+        'compliance_timeline': 'Within 6 months of building construction',
+        'technical_standards': 'Maharashtra RTRWH guidelines 2019',
+        'inspection_requirements': 'Annual compliance certificate'
     }
+}
+
+DEFAULT_REGULATORY_INFO = {
+    'local_mandate': 'Check with local municipal corporation/panchayat',
+    'authority': 'State Water Resources Department',
+    'required_permits': ['Building plan approval', 'Local body NOC'],
+    'available_subsidies': 'Contact state/district water authority',
+    'compliance_timeline': 'Usually before occupancy certificate',
+    'technical_standards': 'Follow BIS and CPWD guidelines',
+    'inspection_requirements': 'As per local regulations'
+}
 
 
 def generate_enhanced_regulatory_info(lat: float, lng: float):
     """Generate enhanced regulatory and compliance information"""
 
-    admin_region = determine_administrative_region(lat, lng)
-    state = admin_region.get('state', 'Unknown')
-
-    # State-specific regulations (simplified)
-    if 'Delhi' in state:
-        return {
-            'local_mandate': 'Mandatory for plots >100 sq m under Delhi Building Bye-laws',
-            'authority': 'Delhi Jal Board and DDA',
-            'required_permits': ['Building plan approval', 'DJB NoC', 'Electrical safety clearance'],
-            'available_subsidies': [
-                {'scheme': 'DJB RTRWH Subsidy', 'amount': '₹15,000', 'eligibility': 'Residential properties'},
-                {'scheme': 'Delhi Solar Policy', 'amount': '₹5,000', 'eligibility': 'With solar integration'}
-            ],
-            'compliance_timeline': 'Must be completed before occupancy certificate',
-            'penalties': 'Water connection may be disconnected for non-compliance',
-            'technical_standards': 'As per CPWD guidelines and IS codes',
-            'inspection_requirements': 'Pre-monsoon system check mandatory'
-        }
-    elif 'Maharashtra' in state:
-        return {
-            'local_mandate': 'Compulsory for plots >300 sq m in Mumbai, >500 sq m in other cities',
-            'authority': 'Maharashtra Water Resources Department',
-            'required_permits': ['Municipal building approval', 'Water supply NOC'],
-            'available_subsidies': [
-                {'scheme': 'Jal Yukt Shivar', 'amount': '₹10,000-25,000', 'eligibility': 'Rural and semi-urban'}
-            ],
-            'compliance_timeline': 'Within 6 months of building construction',
-            'technical_standards': 'Maharashtra RTRWH guidelines 2019',
-            'inspection_requirements': 'Annual compliance certificate'
-        }
-    else:
-        return {
-            'local_mandate': 'Check with local municipal corporation/panchayat',
-            'authority': 'State Water Resources Department',
-            'required_permits': ['Building plan approval', 'Local body NOC'],
-            'available_subsidies': 'Contact state/district water authority',
-            'compliance_timeline': 'Usually before occupancy certificate',
-            'technical_standards': 'Follow BIS and CPWD guidelines',
-            'inspection_requirements': 'As per local regulations'
-        }
+    state = determine_administrative_region(lat, lng).get('state', 'Unknown')
+    return STATE_REGULATORY_INFO.get(state, DEFAULT_REGULATORY_INFO)
 
 
 # Keep existing helper functions
-def get_peak_rainfall_months(distribution):
-    """Get peak rainfall months from distribution"""
-    sorted_months = sorted(distribution.items(), key=lambda x: x[1], reverse=True)
-    return [month for month, _ in sorted_months[:3]]
+def get_peak_rainfall_months(values: Tuple[float, ...]) -> List[str]:
+    """Get peak rainfall months from monthly_values()"""
+    return [MONTHS[i] for i in heapq.nlargest(3, range(len(MONTHS)), key=values.__getitem__)]
+
+
+# Static response section, shared by every response (treat as read-only)
+MAINTENANCE_SCHEDULE = {
+    'routine_maintenance': {
+        'weekly_during_monsoon': [
+            'Clean gutters and remove debris',
+            'Check first flush diverter operation',
+            'Inspect roof surface for damage',
+            'Monitor water levels and quality'
+        ],
+        'monthly_throughout_year': [
+            'Clean mesh filters and leaf guards',
+            'Test pump operation and pressure',
+            'Check pipe joints for leaks',
+            'Inspect storage tank exterior'
+        ],
+        'quarterly_maintenance': [
+            'Replace/clean filter media',
+            'Comprehensive system performance check',
+            'Water quality testing (pH, TDS, bacteria)',
+            'Electrical connections inspection'
+        ]
+    },
+    'annual_major_maintenance': [
+        'Complete tank cleaning and disinfection',
+        'Professional system audit and optimization',
+        'Pump servicing and electrical safety check',
+        'Structural inspection of all components',
+        'Performance evaluation and upgrade recommendations'
+    ],
+    'cost_estimates': {
+        'routine_monthly_cost': '₹500-800',
+        'quarterly_maintenance': '₹1,500-2,500',  
+        'annual_major_service': '₹8,000-12,000',
+        'total_annual_budget': '₹15,000-20,000'
+    },
+    'diy_vs_professional': {
+        'diy_tasks': 'Weekly cleaning, basic inspection, filter replacement',
+        'professional_required': 'Pump servicing, electrical work, tank cleaning, water testing'
+    }
+}
 
 
 def generate_maintenance_schedule():
     """Generate comprehensive maintenance schedule"""
-
-    return {
-        'routine_maintenance': {
-            'weekly_during_monsoon': [
-                'Clean gutters and remove debris',
-                'Check first flush diverter operation',
-                'Inspect roof surface for damage',
-                'Monitor water levels and quality'
-            ],
-            'monthly_throughout_year': [
-                'Clean mesh filters and leaf guards',
-                'Test pump operation and pressure',
-                'Check pipe joints for leaks',
-                'Inspect storage tank exterior'
-            ],
-            'quarterly_maintenance': [
-                'Replace/clean filter media',
-                'Comprehensive system performance check',
-                'Water quality testing (pH, TDS, bacteria)',
-                'Electrical connections inspection'
-            ]
-        },
-        'annual_major_maintenance': [
-            'Complete tank cleaning and disinfection',
-            'Professional system audit and optimization',
-            'Pump servicing and electrical safety check',
-            'Structural inspection of all components',
-            'Performance evaluation and upgrade recommendations'
-        ],
-        'cost_estimates': {
-            'routine_monthly_cost': '₹500-800',
-            'quarterly_maintenance': '₹1,500-2,500',  
-            'annual_major_service': '₹8,000-12,000',
-            'total_annual_budget': '₹15,000-20,000'
-        },
-        'diy_vs_professional': {
-            'diy_tasks': 'Weekly cleaning, basic inspection, filter replacement',
-            'professional_required': 'Pump servicing, electrical work, tank cleaning, water testing'
-        }
-    }
+    return MAINTENANCE_SCHEDULE
 
 
 if __name__ == '__main__':
-    app.run(debug=True, host='0.0.0.0', port=5000)
+    # Development server only; run under gunicorn for concurrent requests:
+    #   gunicorn -c setup/gunicorn.conf.py app_enhanced:app
+    app.run(debug=os.environ.get('FLASK_DEBUG', 'False').lower() == 'true', host='0.0.0.0', port=5000)
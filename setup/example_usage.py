@@ -9,10 +9,16 @@ import json
 # API base URL
 BASE_URL = 'http://localhost:5000'
 
+# Web application (app_complete_web.py) base URL
+WEB_APP_URL = 'http://localhost:8080'
+
+# One keep-alive connection shared by every call below
+SESSION = requests.Session()
+
 def test_health_check():
     """Test health check endpoint"""
     print("Testing health check...")
-    response = requests.get(f'{BASE_URL}/health')
+    response = SESSION.get(f'{BASE_URL}/health')
     print(f"Status: {response.status_code}")
     print(f"Response: {response.json()}")
     print()
@@ -45,10 +51,9 @@ def test_water_harvesting_analysis():
         }
     }
 
-    response = requests.post(
+    response = SESSION.post(
         f'{BASE_URL}/api/v1/water-harvesting/analyze',
-        json=data,
-        headers={'Content-Type': 'application/json'}
+        json=data
     )
 
     print(f"Status: {response.status_code}")
@@ -70,7 +75,7 @@ def test_rainfall_data():
     print("Testing rainfall data...")
     lat, lng = 19.0760, 72.8777  # Mumbai coordinates
 
-    response = requests.get(f'{BASE_URL}/api/v1/rainfall/{lat}/{lng}')
+    response = SESSION.get(f'{BASE_URL}/api/v1/rainfall/{lat}/{lng}')
     print(f"Status: {response.status_code}")
 
     if response.status_code == 200:
@@ -87,7 +92,7 @@ def test_soil_data():
     print("Testing soil data...")
     lat, lng = 12.9716, 77.5946  # Bangalore coordinates
 
-    response = requests.get(f'{BASE_URL}/api/v1/soil/{lat}/{lng}')
+    response = SESSION.get(f'{BASE_URL}/api/v1/soil/{lat}/{lng}')
     print(f"Status: {response.status_code}")
 
     if response.status_code == 200:
@@ -100,6 +105,31 @@ def test_soil_data():
 
     print()
 
+def test_web_api_string_household_size():
+    """Test that the web app's JSON API accepts household_size sent as a string"""
+    print("Testing web app API with a string household_size...")
+
+    data = {
+        "location": {"lat": 28.6139, "lng": 77.2090},
+        "property": {"roof_area_sqft": 1200},
+        "usage": {"household_size": "4"}
+    }
+
+    try:
+        response = SESSION.post(f'{WEB_APP_URL}/api/v1/water-harvesting/analyze', json=data)
+    except requests.exceptions.ConnectionError:
+        print(f"Skipped: web app is not running on {WEB_APP_URL}")
+        print()
+        return
+
+    print(f"Status: {response.status_code}")
+    if response.status_code == 200:
+        print("OK: string household_size accepted")
+    else:
+        print(f"Error: {response.text}")
+
+    print()
+
 def main():
     """Run all tests"""
     print("Water Harvesting API - Example Usage")
@@ -110,6 +140,7 @@ def main():
         test_water_harvesting_analysis()
         test_rainfall_data()
         test_soil_data()
+        test_web_api_string_household_size()
 
     except requests.exceptions.ConnectionError:
         print("Error: Could not connect to API server.")
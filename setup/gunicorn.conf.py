@@ -0,0 +1,24 @@
+"""
+Gunicorn configuration for the Water Harvesting API
+Usage: gunicorn -c setup/gunicorn.conf.py app:app
+       gunicorn -c setup/gunicorn.conf.py app_enhanced:app
+       PORT=8080 gunicorn -c setup/gunicorn.conf.py app_complete_web:app
+"""
+
+import multiprocessing
+import os
+
+bind = f"{os.environ.get('HOST', '0.0.0.0')}:{os.environ.get('PORT', '5000')}"
+
+# One process per core (plus headroom), each serving requests on a thread pool
+# so a slow Open-Meteo fetch does not block other requests in the same worker
+workers = int(os.environ.get('WEB_CONCURRENCY', multiprocessing.cpu_count() * 2 + 1))
+# GUNICORN_WORKER_CLASS=gevent swaps the thread pool for green threads, so many
+# requests can wait on Open-Meteo at once per process. gevent is optional and not
+# in requirements.txt; run `pip install gevent` first
+worker_class = os.environ.get('GUNICORN_WORKER_CLASS', 'gthread')
+worker_connections = int(os.environ.get('GUNICORN_WORKER_CONNECTIONS', 1000))
+threads = int(os.environ.get('GUNICORN_THREADS', 8))
+
+timeout = 30
+keepalive = 5
@@ -1,33 +1,75 @@
 #!/usr/bin/env python3
 """
 Quick Start Script for Water Harvesting API
-Run this after installing requirements to test the API
+Run this from the repository root to install requirements and test the API
 """
 
+import hashlib
+import os
 import subprocess
 import sys
 import time
 import requests
 from threading import Thread
 
+# Hash of the last requirements.txt (and interpreter) installed successfully;
+# pip is skipped while it matches
+REQUIREMENTS_STAMP = os.path.join('.cache', 'requirements.sha1')
+
+# API server started for the smoke test (paths are relative to the repository root)
+API_SERVER_SCRIPT = os.path.join('v01', 'app.py')
+
 def install_requirements():
     """Install required packages"""
     try:
+        with open('requirements.txt', 'rb') as f:
+            requirements_hash = hashlib.sha1(f.read() + sys.executable.encode()).hexdigest()
+        try:
+            with open(REQUIREMENTS_STAMP) as f:
+                if f.read() == requirements_hash:
+                    print("✅ Requirements already installed")
+                    return True
+        except OSError:
+            pass
+
         print("📦 Installing requirements...")
-        subprocess.check_call([sys.executable, '-m', 'pip', 'install', '-r', 'requirements.txt'])
+        subprocess.check_call([sys.executable, '-m', 'pip', 'install', '--disable-pip-version-check',
+                               '-r', 'requirements.txt'])
+        os.makedirs(os.path.dirname(REQUIREMENTS_STAMP), exist_ok=True)
+        with open(REQUIREMENTS_STAMP, 'w') as f:
+            f.write(requirements_hash)
         print("✅ Requirements installed successfully!")
         return True
-    except subprocess.CalledProcessError:
+    except (subprocess.CalledProcessError, OSError):
         print("❌ Failed to install requirements")
         return False
 
+def wait_for_server(server, url='http://localhost:5000/health', timeout=15):
+    """Poll the health endpoint until the server answers, exits, or the timeout passes"""
+    deadline = time.monotonic() + timeout
+    delay = 0.1
+    # One session so the polls reuse a connection once the server accepts one
+    with requests.Session() as session:
+        while time.monotonic() < deadline and server.poll() is None:
+            try:
+                if session.get(url, timeout=0.5).status_code == 200:
+                    return True
+            except requests.exceptions.RequestException:
+                pass
+            time.sleep(delay)
+            delay = min(delay * 2, 1.0)
+    return False
+
 def start_api_server():
     """Start the Flask API server"""
     try:
         print("🚀 Starting API server...")
-        subprocess.Popen([sys.executable, 'app.py'])
-        time.sleep(3)  # Give server time to start
-        return True
+        server = subprocess.Popen([sys.executable, API_SERVER_SCRIPT])
+        if not wait_for_server(server):
+            print("❌ API server did not start")
+            server.terminate()
+            return False
+        return server
     except Exception as e:
         print(f"❌ Failed to start API server: {str(e)}")
         return False
@@ -96,14 +138,30 @@ def main():
     if not install_requirements():
         return
 
-    print("\n⏳ Please start the API server manually by running:")
-    print("   python app.py")
-    print("\n🧪 Then test the API by running:")
-    print("   python example_usage.py")
+    # Start the server, run the smoke test against it, then shut it down
+    server = start_api_server()
+    if not server:
+        print("\n⏳ Please start the API server manually by running:")
+        print(f"   python {API_SERVER_SCRIPT}")
+        return
+
+    try:
+        api_ok = test_api()
+    finally:
+        server.terminate()
+        server.wait()
+
+    if not api_ok:
+        return
+
+    print("\n🚀 Start the API server by running:")
+    print(f"   python {API_SERVER_SCRIPT}")
+    print("\n🧪 Then try it out by running:")
+    print("   python setup/example_usage.py")
     print("\n📚 API Documentation available at:")
     print("   - README.md")
-    print("   - API_DOCUMENTATION.md")
-    print("   - COMPLETE_TEST_EXAMPLE.md")
+    print("   - Documentation/API_DOCUMENTATION.md")
+    print("   - Documentation/COMPLETE_TEST_EXAMPLE.md")
 
     print("\n✅ Setup completed successfully!")
     print("\n🎯 Your Water Harvesting API is ready to use!")
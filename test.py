@@ -1,4 +1,4 @@
-import requests, json
+import requests, orjson
 
 data = {
     "location": {"lat": 28.6139, "lng": 79.2090},
@@ -8,10 +8,10 @@ data = {
 }
 
 response = requests.post('http://localhost:5000/api/v1/water-harvesting/analyze', json=data)
-result = response.json()
+result = orjson.loads(response.content)
 
-with open("data2.json", "w") as json_file:
-    json.dump(result, json_file, indent=4)
+with open("data2.json", "wb") as json_file:
+    json_file.write(orjson.dumps(result, option=orjson.OPT_INDENT_2))
 
 # print(f"Annual Harvest: {result['harvesting_potential']['annual_harvestable_liters']} L")
 # print(f"Recommended Tank: {result['system_recommendations']['primary_recommendation']['tank_capacity_liters']} L") 
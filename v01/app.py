@@ -4,71 +4,150 @@ Provides personalized water harvesting recommendations for locations in India
 """
 
 import os
+import sys
 import json
+import time
+import functools
+import heapq
+from operator import itemgetter
 from datetime import datetime, timedelta
 from flask import Flask, request, jsonify
 from flask_cors import CORS
+from flask_compress import Compress
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
 import math
+from types import MappingProxyType
 from typing import Dict, List, Optional, Tuple
 import logging
 
+# Shared helpers live in the repository root, one level above this version
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from app_common import OrjsonProvider
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+
 app = Flask(__name__)
+app.json = OrjsonProvider(app)
 CORS(app)
 
+# Reject oversized request bodies before they are read (413)
+app.config['MAX_CONTENT_LENGTH'] = 64 * 1024
+
+# Compress JSON responses (the analysis payload is several KB)
+app.config['COMPRESS_MIMETYPES'] = ['application/json']
+app.config['COMPRESS_LEVEL'] = 6
+app.config['COMPRESS_MIN_SIZE'] = 500
+Compress(app)
+
+# Location lookups are cached per grid cell (2 decimals ~ 1 km) for an hour
+COORDINATE_PRECISION = 2
+LOCATION_CACHE_TTL_SECONDS = 3600
+LOCATION_CACHE_SIZE = 4096
+
+
+def _cache_window() -> int:
+    """Current TTL window; part of the cache key so entries expire"""
+    return int(time.time() // LOCATION_CACHE_TTL_SECONDS)
+
+# Shared HTTP session so upstream API calls reuse pooled keep-alive connections
+http_session = requests.Session()
+http_session.mount('https://', HTTPAdapter(pool_connections=32, pool_maxsize=32))
+
+# Month keys in calendar order, used for positional monthly aggregation
+MONTHS = ('jan', 'feb', 'mar', 'apr', 'may', 'jun',
+          'jul', 'aug', 'sep', 'oct', 'nov', 'dec')
+
+# Reference coordinates (lat, lng) of the cities with fallback rainfall data
+CITY_COORDINATES = (
+    ('mumbai', 19.0760, 72.8777),
+    ('delhi', 28.6139, 77.2090),
+    ('bangalore', 12.9716, 77.5946),
+    ('chennai', 13.0827, 80.2707),
+    ('kolkata', 22.5726, 88.3639),
+    ('hyderabad', 17.3850, 78.4867),
+    ('pune', 18.5204, 73.8567),
+    ('ahmedabad', 23.0225, 72.5714),
+    ('jaipur', 26.9124, 75.7873),
+    ('kochi', 9.9312, 76.2673)
+)
+
+# Runoff coefficients by roof material (read-only tables shared by calculators)
+RUNOFF_COEFFICIENTS = MappingProxyType({
+    'concrete': 0.85,
+    'metal': 0.90,
+    'tile': 0.75,
+    'asbestos': 0.80,
+    'thatch': 0.60,
+    'other': 0.70
+})
+
+# Collection efficiency by system quality
+COLLECTION_EFFICIENCY = MappingProxyType({
+    'advanced': 0.90,
+    'standard': 0.80,
+    'basic': 0.70
+})
+
+# Cost estimates (INR)
+COST_ESTIMATES = MappingProxyType({
+    'tank_cost_per_liter': 85,
+    'filtration_basic': 25000,
+    'filtration_advanced': 40000,
+    'pump_0_5hp': 12000,
+    'pump_1hp': 18000,
+    'installation_base': 20000,
+    'contingency_factor': 0.10
+})
+
+# Water pricing (INR per 1000 liters) by region
+WATER_PRICING = MappingProxyType({
+    'urban': 15,
+    'suburban': 12,
+    'rural': 8
+})
+
+# (runoff coefficient, collection efficiency) per (roof material, system quality)
+HARVEST_COEFFICIENTS = MappingProxyType({
+    (material, quality): (runoff, efficiency)
+    for material, runoff in RUNOFF_COEFFICIENTS.items()
+    for quality, efficiency in COLLECTION_EFFICIENCY.items()
+})
+
+# Fixed (filtration, pump, installation) costs per system type, resolved once
+SYSTEM_COMPONENT_COSTS = MappingProxyType({
+    'advanced': (COST_ESTIMATES['filtration_advanced'], COST_ESTIMATES['pump_1hp'],
+                 COST_ESTIMATES['installation_base']),
+    'standard': (COST_ESTIMATES['filtration_basic'], COST_ESTIMATES['pump_0_5hp'],
+                 COST_ESTIMATES['installation_base'])
+})
+
 class WaterHarvestingCalculator:
     """Core calculation engine for water harvesting analysis"""
 
     def __init__(self):
-        # Runoff coefficients by roof material
-        self.runoff_coefficients = {
-            'concrete': 0.85,
-            'metal': 0.90,
-            'tile': 0.75,
-            'asbestos': 0.80,
-            'thatch': 0.60,
-            'other': 0.70
-        }
-
-        # Collection efficiency by system quality
-        self.collection_efficiency = {
-            'advanced': 0.90,
-            'standard': 0.80,
-            'basic': 0.70
-        }
-
-        # Cost estimates (INR)
-        self.cost_estimates = {
-            'tank_cost_per_liter': 85,
-            'filtration_basic': 25000,
-            'filtration_advanced': 40000,
-            'pump_0_5hp': 12000,
-            'pump_1hp': 18000,
-            'installation_base': 20000,
-            'contingency_factor': 0.10
-        }
-
-        # Water pricing (INR per 1000 liters) by region
-        self.water_pricing = {
-            'urban': 15,
-            'suburban': 12,
-            'rural': 8
-        }
+        self.runoff_coefficients = RUNOFF_COEFFICIENTS
+        self.collection_efficiency = COLLECTION_EFFICIENCY
+        self.cost_estimates = COST_ESTIMATES
+        self.water_pricing = WATER_PRICING
 
     def calculate_harvestable_water(self, roof_area_sqft: float, annual_rainfall_mm: float, 
                                   roof_material: str = 'concrete', system_quality: str = 'standard') -> float:
-        """Calculate annual harvestable water volume in liters"""
+        """Calculate annual harvestable water volume in liters (expects lowercase option keys)"""
 
         # Convert sq ft to sq meters
         roof_area_sqm = roof_area_sqft * 0.092903
 
-        # Get coefficients
-        runoff_coeff = self.runoff_coefficients.get(roof_material.lower(), 0.75)
-        collection_eff = self.collection_efficiency.get(system_quality.lower(), 0.80)
+        # Get coefficients (one lookup for known combinations)
+        coefficients = HARVEST_COEFFICIENTS.get((roof_material, system_quality))
+        if coefficients is None:
+            coefficients = (self.runoff_coefficients.get(roof_material, 0.75),
+                            self.collection_efficiency.get(system_quality, 0.80))
+        runoff_coeff, collection_eff = coefficients
 
         # Calculate harvestable water (in liters)
         harvestable_liters = roof_area_sqm * annual_rainfall_mm * runoff_coeff * collection_eff
@@ -77,12 +156,8 @@ class WaterHarvestingCalculator:
 
     def calculate_monthly_potential(self, annual_harvest: float, rainfall_distribution: Dict[str, float]) -> Dict[str, float]:
         """Calculate monthly harvesting potential"""
-        monthly_harvest = {}
-
-        for month, percentage in rainfall_distribution.items():
-            monthly_harvest[month] = round(annual_harvest * (percentage / 100), 0)
-
-        return monthly_harvest
+        return {month: round(annual_harvest * (percentage / 100), 0)
+                for month, percentage in rainfall_distribution.items()}
 
     def calculate_optimal_storage_size(self, monthly_harvest: Dict[str, float]) -> Dict[str, int]:
         """Calculate optimal storage tank sizes"""
@@ -103,15 +178,9 @@ class WaterHarvestingCalculator:
         """Calculate implementation costs"""
 
         tank_cost = tank_capacity * self.cost_estimates['tank_cost_per_liter']
-
-        if system_type == 'advanced':
-            filtration_cost = self.cost_estimates['filtration_advanced']
-            pump_cost = self.cost_estimates['pump_1hp']
-        else:
-            filtration_cost = self.cost_estimates['filtration_basic']
-            pump_cost = self.cost_estimates['pump_0_5hp']
-
-        installation_cost = self.cost_estimates['installation_base']
+        filtration_cost, pump_cost, installation_cost = SYSTEM_COMPONENT_COSTS[
+            'advanced' if system_type == 'advanced' else 'standard'
+        ]
         subtotal = tank_cost + filtration_cost + pump_cost + installation_cost
         contingency = subtotal * self.cost_estimates['contingency_factor']
         total_cost = subtotal + contingency
@@ -148,118 +217,150 @@ class WaterHarvestingCalculator:
             'roi_percentage': round(roi_percentage, 1)
         }
 
+    def analyze(self, roof_area_sqft: float, rainfall_data: Dict, roof_material: str = 'concrete',
+                system_type: str = 'standard', region_type: str = 'urban') -> Tuple[float, Dict, Dict, Dict, Dict]:
+        """Run the full harvest -> storage -> cost -> financial pipeline in one call
 
-class WeatherDataService:
-    """Service to fetch weather and rainfall data"""
-
-    def __init__(self):
-        self.open_meteo_base_url = "https://api.open-meteo.com/v1"
-
-        # Fallback rainfall data for major cities
-        self.fallback_rainfall_data = {
-            'mumbai': {'annual': 2200, 'distribution': {'jan': 0.1, 'feb': 0.1, 'mar': 0.3, 'apr': 0.5, 'may': 1.8, 'jun': 18.5, 'jul': 28.2, 'aug': 26.8, 'sep': 16.4, 'oct': 4.1, 'nov': 1.3, 'dec': 0.2}},
-            'delhi': {'annual': 797, 'distribution': {'jan': 2.1, 'feb': 2.5, 'mar': 4.2, 'apr': 3.7, 'may': 6.2, 'jun': 18.6, 'jul': 44.7, 'aug': 39.2, 'sep': 22.6, 'oct': 9.2, 'nov': 3.2, 'dec': 1.9}},
-            'bangalore': {'annual': 970, 'distribution': {'jan': 0.3, 'feb': 0.5, 'mar': 2.1, 'apr': 4.8, 'may': 9.2, 'jun': 8.4, 'jul': 9.6, 'aug': 11.2, 'sep': 16.8, 'oct': 18.7, 'nov': 5.2, 'dec': 0.8}},
-            'chennai': {'annual': 1400, 'distribution': {'jan': 1.8, 'feb': 0.7, 'mar': 1.1, 'apr': 2.3, 'may': 4.2, 'jun': 4.8, 'jul': 7.2, 'aug': 9.6, 'sep': 11.2, 'oct': 24.3, 'nov': 28.6, 'dec': 12.1}},
-            'kolkata': {'annual': 1582, 'distribution': {'jan': 0.9, 'feb': 1.8, 'mar': 2.1, 'apr': 3.4, 'may': 7.2, 'jun': 19.8, 'jul': 26.4, 'aug': 25.6, 'sep': 18.9, 'oct': 7.8, 'nov': 1.2, 'dec': 0.3}},
-            'hyderabad': {'annual': 812, 'distribution': {'jan': 0.6, 'feb': 1.2, 'mar': 1.8, 'apr': 2.4, 'may': 4.2, 'jun': 11.2, 'jul': 16.8, 'aug': 17.4, 'sep': 18.2, 'oct': 12.6, 'nov': 2.1, 'dec': 0.8}},
-            'pune': {'annual': 722, 'distribution': {'jan': 0.2, 'feb': 0.3, 'mar': 0.8, 'apr': 1.2, 'may': 2.1, 'jun': 16.8, 'jul': 26.4, 'aug': 24.2, 'sep': 15.6, 'oct': 6.2, 'nov': 1.8, 'dec': 0.4}},
-            'ahmedabad': {'annual': 803, 'distribution': {'jan': 0.3, 'feb': 0.2, 'mar': 0.6, 'apr': 0.8, 'may': 1.2, 'jun': 13.4, 'jul': 28.6, 'aug': 26.8, 'sep': 14.2, 'oct': 2.4, 'nov': 0.8, 'dec': 0.2}},
-            'jaipur': {'annual': 650, 'distribution': {'jan': 1.8, 'feb': 1.2, 'mar': 2.1, 'apr': 2.8, 'may': 4.2, 'jun': 16.2, 'jul': 32.4, 'aug': 28.6, 'sep': 18.4, 'oct': 3.8, 'nov': 1.2, 'dec': 0.8}},
-            'kochi': {'annual': 3055, 'distribution': {'jan': 0.8, 'feb': 1.2, 'mar': 2.4, 'apr': 4.8, 'may': 12.6, 'jun': 21.4, 'jul': 22.8, 'aug': 18.4, 'sep': 11.2, 'oct': 10.8, 'nov': 5.2, 'dec': 1.8}}
-        }
+        Returns (annual_harvest, monthly_harvest, storage_sizes, cost_analysis, financial_analysis).
+        """
+        annual_harvest = self.calculate_harvestable_water(
+            roof_area_sqft, rainfall_data['annual'], roof_material, system_type
+        )
+        monthly_harvest = self.calculate_monthly_potential(annual_harvest, rainfall_data['distribution'])
+        storage_sizes = self.calculate_optimal_storage_size(monthly_harvest)
+        cost_analysis = self.calculate_system_cost(storage_sizes['optimal_liters'], system_type)
+        financial_analysis = self.calculate_financial_analysis(
+            annual_harvest, cost_analysis['total_cost'], region_type
+        )
+        return annual_harvest, monthly_harvest, storage_sizes, cost_analysis, financial_analysis
 
-    def get_city_from_coordinates(self, lat: float, lng: float) -> str:
-        """Determine nearest major city from coordinates"""
-        cities = {
-            'mumbai': (19.0760, 72.8777),
-            'delhi': (28.6139, 77.2090),
-            'bangalore': (12.9716, 77.5946),
-            'chennai': (13.0827, 80.2707),
-            'kolkata': (22.5726, 88.3639),
-            'hyderabad': (17.3850, 78.4867),
-            'pune': (18.5204, 73.8567),
-            'ahmedabad': (23.0225, 72.5714),
-            'jaipur': (26.9124, 75.7873),
-            'kochi': (9.9312, 76.2673)
-        }
 
-        min_distance = float('inf')
-        nearest_city = 'delhi'
+# Fallback rainfall for major cities: city -> (annual mm, monthly % in MONTHS order)
+FALLBACK_RAINFALL = MappingProxyType({
+    'mumbai': (2200, (0.1, 0.1, 0.3, 0.5, 1.8, 18.5, 28.2, 26.8, 16.4, 4.1, 1.3, 0.2)),
+    'delhi': (797, (2.1, 2.5, 4.2, 3.7, 6.2, 18.6, 44.7, 39.2, 22.6, 9.2, 3.2, 1.9)),
+    'bangalore': (970, (0.3, 0.5, 2.1, 4.8, 9.2, 8.4, 9.6, 11.2, 16.8, 18.7, 5.2, 0.8)),
+    'chennai': (1400, (1.8, 0.7, 1.1, 2.3, 4.2, 4.8, 7.2, 9.6, 11.2, 24.3, 28.6, 12.1)),
+    'kolkata': (1582, (0.9, 1.8, 2.1, 3.4, 7.2, 19.8, 26.4, 25.6, 18.9, 7.8, 1.2, 0.3)),
+    'hyderabad': (812, (0.6, 1.2, 1.8, 2.4, 4.2, 11.2, 16.8, 17.4, 18.2, 12.6, 2.1, 0.8)),
+    'pune': (722, (0.2, 0.3, 0.8, 1.2, 2.1, 16.8, 26.4, 24.2, 15.6, 6.2, 1.8, 0.4)),
+    'ahmedabad': (803, (0.3, 0.2, 0.6, 0.8, 1.2, 13.4, 28.6, 26.8, 14.2, 2.4, 0.8, 0.2)),
+    'jaipur': (650, (1.8, 1.2, 2.1, 2.8, 4.2, 16.2, 32.4, 28.6, 18.4, 3.8, 1.2, 0.8)),
+    'kochi': (3055, (0.8, 1.2, 2.4, 4.8, 12.6, 21.4, 22.8, 18.4, 11.2, 10.8, 5.2, 1.8))
+})
+DEFAULT_FALLBACK_CITY = 'delhi'
 
-        for city, (city_lat, city_lng) in cities.items():
-            distance = math.sqrt((lat - city_lat)**2 + (lng - city_lng)**2)
-            if distance < min_distance:
-                min_distance = distance
-                nearest_city = city
+OPEN_METEO_BASE_URL = "https://api.open-meteo.com/v1"
 
-        return nearest_city
 
-    def get_rainfall_data(self, lat: float, lng: float) -> Dict:
-        """Get rainfall data with fallback options"""
+def process_open_meteo_data(data: Dict) -> Dict:
+    """Process Open-Meteo historical data; raises ValueError if it is missing or malformed"""
+    try:
+        daily_data = data.get('daily') or {}
+        precipitation = daily_data.get('precipitation_sum') or []
+        dates = daily_data.get('time') or []
+
+        # Accumulate into a fixed 12-slot list indexed by month number.
+        # Dates are ISO formatted (YYYY-MM-DD), so the month is a fixed slice;
+        # days without a reading (None) are skipped.
+        monthly_totals = [0] * 12
+        for date_str, amount in zip(dates, precipitation):
+            if amount is not None:
+                monthly_totals[int(date_str[5:7]) - 1] += amount
+    except (AttributeError, TypeError, IndexError) as e:
+        raise ValueError(f"Malformed Open-Meteo data: {e}") from e
+
+    if not precipitation or not dates:
+        raise ValueError("Open-Meteo data has no daily precipitation")
+
+    annual_total = sum(monthly_totals)
+
+    if annual_total > 0:
+        distribution = {month: round((total / annual_total * 100), 1)
+                        for month, total in zip(MONTHS, monthly_totals)}
+    else:
+        distribution = dict.fromkeys(MONTHS, 0)
 
-        try:
-            # Try Open-Meteo API first
-            response = requests.get(
-                f"{self.open_meteo_base_url}/historical-weather",
-                params={
-                    'latitude': lat,
-                    'longitude': lng,
-                    'start_date': '2020-01-01',
-                    'end_date': '2023-12-31',
-                    'daily': 'precipitation_sum',
-                    'timezone': 'Asia/Kolkata'
-                },
-                timeout=10
-            )
-
-            if response.status_code == 200:
-                data = response.json()
-                return self._process_open_meteo_data(data)
-
-        except Exception as e:
-            logger.warning(f"Failed to fetch from Open-Meteo: {str(e)}")
+    return {
+        'annual': round(annual_total, 0),
+        'distribution': distribution
+    }
 
-        # Fallback to city-based data
-        nearest_city = self.get_city_from_coordinates(lat, lng)
-        return self.fallback_rainfall_data.get(nearest_city, self.fallback_rainfall_data['delhi'])
 
-    def _process_open_meteo_data(self, data: Dict) -> Dict:
-        """Process Open-Meteo historical data"""
-        try:
-            daily_data = data.get('daily', {})
-            precipitation = daily_data.get('precipitation_sum', [])
-            dates = daily_data.get('time', [])
+@functools.lru_cache(maxsize=LOCATION_CACHE_SIZE)
+def _fetch_cell_rainfall_data(lat: float, lng: float, cache_window: int) -> Dict:
+    """Fetch Open-Meteo rainfall for a grid cell; failures raise, so only successes are cached.
+
+    cache_window only partitions the cache.
+    """
+    response = http_session.get(
+        f"{OPEN_METEO_BASE_URL}/historical-weather",
+        params={
+            'latitude': lat,
+            'longitude': lng,
+            'start_date': '2020-01-01',
+            'end_date': '2023-12-31',
+            'daily': 'precipitation_sum',
+            'timezone': 'Asia/Kolkata'
+        },
+        timeout=10
+    )
 
-            if not precipitation or not dates:
-                return self.fallback_rainfall_data['delhi']
+    if response.status_code != 200:
+        raise requests.HTTPError(f"Open-Meteo returned HTTP {response.status_code}")
 
-            monthly_totals = {month: 0 for month in ['jan', 'feb', 'mar', 'apr', 'may', 'jun', 
-                                                   'jul', 'aug', 'sep', 'oct', 'nov', 'dec']}
+    return process_open_meteo_data(response.json())
 
-            month_names = ['jan', 'feb', 'mar', 'apr', 'may', 'jun', 
-                          'jul', 'aug', 'sep', 'oct', 'nov', 'dec']
 
-            for i, date_str in enumerate(dates):
-                if i < len(precipitation):
-                    month_idx = int(date_str.split('-')[1]) - 1
-                    monthly_totals[month_names[month_idx]] += precipitation[i]
+class WeatherDataService:
+    """Service to fetch weather and rainfall data"""
 
-            annual_total = sum(monthly_totals.values())
+    def __init__(self):
+        self.open_meteo_base_url = OPEN_METEO_BASE_URL
 
-            distribution = {}
-            for month, total in monthly_totals.items():
-                distribution[month] = round((total / annual_total * 100), 1) if annual_total > 0 else 0
+    def get_city_from_coordinates(self, lat: float, lng: float) -> str:
+        """Determine nearest major city from coordinates"""
+        nearest = min(
+            CITY_COORDINATES,
+            key=lambda city: (lat - city[1])**2 + (lng - city[2])**2
+        )
+        return nearest[0]
 
-            return {
-                'annual': round(annual_total, 0),
-                'distribution': distribution
-            }
+    def get_rainfall_data(self, lat: float, lng: float) -> Dict:
+        """Get rainfall data with fallback options (Open-Meteo data cached per grid cell)"""
+        lat = round(lat, COORDINATE_PRECISION)
+        lng = round(lng, COORDINATE_PRECISION)
 
-        except Exception as e:
-            logger.error(f"Error processing Open-Meteo data: {str(e)}")
-            return self.fallback_rainfall_data['delhi']
+        try:
+            # Try Open-Meteo API first
+            return _fetch_cell_rainfall_data(lat, lng, _cache_window())
+        except (requests.RequestException, ValueError) as e:
+            logger.warning("Failed to fetch from Open-Meteo: %s", e)
 
+        # Fallback to city-based data
+        nearest_city = self.get_city_from_coordinates(lat, lng)
+        return self._fallback_rainfall_data(nearest_city)
+
+    @functools.lru_cache(maxsize=len(FALLBACK_RAINFALL))
+    def _fallback_rainfall_data(self, city: str) -> Dict:
+        """Expand a compact FALLBACK_RAINFALL row into the rainfall data shape (once per city)"""
+        annual, distribution = FALLBACK_RAINFALL.get(city, FALLBACK_RAINFALL[DEFAULT_FALLBACK_CITY])
+        return {'annual': annual, 'distribution': dict(zip(MONTHS, distribution))}
+
+
+# Soil regions as inclusive (lat_lo, lat_hi, lng_lo, lng_hi, soil_type) boxes,
+# checked in order; strict bounds are encoded with math.nextafter
+_INF = math.inf
+SOIL_REGION_RULES = (
+    (20, 30, 68, math.nextafter(74, -_INF), 'desert'),
+    (20, 30, 74, 78, 'alluvial'),
+    (18, 25, 72, 85, 'black'),
+    (8, 18, 75, 80, 'red'),
+    (-_INF, math.nextafter(18, -_INF), math.nextafter(75, _INF), _INF, 'red'),
+    (math.nextafter(25, _INF), _INF, math.nextafter(85, _INF), _INF, 'alluvial'),
+    (math.nextafter(28, _INF), _INF, -_INF, _INF, 'mountain'),
+)
+DEFAULT_SOIL_TYPE = 'alluvial'
 
 class SoilDataService:
     """Service to get soil and groundwater information"""
@@ -275,24 +376,16 @@ class SoilDataService:
         }
 
     def get_soil_type(self, lat: float, lng: float) -> Dict:
-        """Get soil type based on geographical location"""
-
-        # Simplified regional mapping
-        if 20 <= lat <= 30 and 68 <= lng <= 78:
-            soil_type = 'desert' if lng < 74 else 'alluvial'
-        elif 18 <= lat <= 25 and 72 <= lng <= 85:
-            soil_type = 'black'
-        elif 8 <= lat <= 18 and 75 <= lng <= 80:
-            soil_type = 'red'
-        elif lat < 18 and lng > 75:
-            soil_type = 'red'
-        elif lat > 25 and lng > 85:
-            soil_type = 'alluvial'
-        elif lat > 28:
-            soil_type = 'mountain'
-        else:
-            soil_type = 'alluvial'
+        """Get soil type based on geographical location (cached per grid cell)"""
+        return self._get_cell_soil_type(
+            round(lat, COORDINATE_PRECISION), round(lng, COORDINATE_PRECISION), _cache_window()
+        )
+
+    @functools.lru_cache(maxsize=LOCATION_CACHE_SIZE)
+    def _get_cell_soil_type(self, lat: float, lng: float, cache_window: int) -> Dict:
+        """Classify soil for a grid cell; cache_window only partitions the cache"""
 
+        soil_type = self.classify_soil(lat, lng)
         soil_info = self.soil_data.get(soil_type, self.soil_data['alluvial'])
 
         return {
@@ -303,6 +396,14 @@ class SoilDataService:
             'aquifer_prospects': self._assess_aquifer_prospects(soil_type)
         }
 
+    @staticmethod
+    def classify_soil(lat: float, lng: float) -> str:
+        """Simplified regional mapping: first matching box in SOIL_REGION_RULES"""
+        for lat_lo, lat_hi, lng_lo, lng_hi, soil_type in SOIL_REGION_RULES:
+            if lat_lo <= lat <= lat_hi and lng_lo <= lng <= lng_hi:
+                return soil_type
+        return DEFAULT_SOIL_TYPE
+
     def _estimate_groundwater_depth(self, lat: float, lng: float) -> str:
         """Estimate groundwater depth based on region"""
         if 20 <= lat <= 30 and lng < 75:
@@ -336,6 +437,15 @@ soil_service = SoilDataService()
 
 
 # API Routes
+@app.errorhandler(413)
+def request_too_large(e):
+    """Oversized request bodies get the standard JSON error format"""
+    return jsonify({
+        'error': 'Request body too large',
+        'message': f"Maximum request size is {app.config['MAX_CONTENT_LENGTH']} bytes"
+    }), 413
+
+
 @app.route('/health', methods=['GET'])
 def health_check():
     """Health check endpoint"""
@@ -346,119 +456,155 @@ def health_check():
     })
 
 
-@app.route('/api/v1/water-harvesting/analyze', methods=['POST'])
-def analyze_water_harvesting():
-    """Main API endpoint for water harvesting analysis"""
+# Upper bound on sites accepted by the batch endpoint
+MAX_BATCH_SITES = 100
 
-    try:
-        # Get request data
-        data = request.get_json()
 
-        # Validate required fields
-        if not data:
-            return jsonify({'error': 'No data provided'}), 400
+def build_analysis(data: Dict) -> Tuple[Dict, int]:
+    """Validate one analysis request body and build its response as (payload, HTTP status)"""
 
-        # Extract location
-        location = data.get('location', {})
-        lat = location.get('lat')
-        lng = location.get('lng')
+    # Validate required fields
+    if not data:
+        return {'error': 'No data provided'}, 400
 
-        if not lat or not lng:
-            return jsonify({'error': 'Latitude and longitude are required'}), 400
+    # Extract location
+    location = data.get('location', {})
+    lat = location.get('lat')
+    lng = location.get('lng')
 
-        # Extract property details
-        property_details = data.get('property', {})
-        roof_area_sqft = property_details.get('roof_area_sqft')
+    if not lat or not lng:
+        return {'error': 'Latitude and longitude are required'}, 400
 
-        if not roof_area_sqft:
-            return jsonify({'error': 'Roof area is required'}), 400
+    # Extract property details
+    property_details = data.get('property', {})
+    roof_area_sqft = property_details.get('roof_area_sqft')
 
-        # Extract usage patterns
-        usage = data.get('usage', {})
-        household_size = usage.get('household_size', 4)
+    if not roof_area_sqft:
+        return {'error': 'Roof area is required'}, 400
 
-        # Extract preferences
-        preferences = data.get('preferences', {})
-        system_type = preferences.get('system_type', 'standard')
-        region_type = preferences.get('region_type', 'urban')
-        roof_material = property_details.get('roof_material', 'concrete')
+    # Extract usage patterns
+    usage = data.get('usage', {})
+    household_size = usage.get('household_size', 4)
 
-        # Get external data
-        logger.info(f"Analyzing location: {lat}, {lng}")
+    # Extract preferences; option names are lowercased once here, and the
+    # calculator expects canonical (lowercase) keys from this point on
+    preferences = data.get('preferences', {})
+    system_type = (preferences.get('system_type') or 'standard').lower()
+    region_type = (preferences.get('region_type') or 'urban').lower()
+    roof_material = (property_details.get('roof_material') or 'concrete').lower()
 
-        # Fetch weather data
-        rainfall_data = weather_service.get_rainfall_data(lat, lng)
+    # Get external data
+    logger.info("Analyzing location: %s, %s", lat, lng)
 
-        # Fetch soil data
-        soil_data = soil_service.get_soil_type(lat, lng)
+    # Fetch weather data
+    rainfall_data = weather_service.get_rainfall_data(lat, lng)
 
-        # Calculate harvestable water
-        annual_harvest = calculator.calculate_harvestable_water(
-            roof_area_sqft=roof_area_sqft,
-            annual_rainfall_mm=rainfall_data['annual'],
-            roof_material=roof_material,
-            system_quality=system_type
-        )
+    # Fetch soil data
+    soil_data = soil_service.get_soil_type(lat, lng)
 
-        # Calculate monthly potential
-        monthly_harvest = calculator.calculate_monthly_potential(
-            annual_harvest, rainfall_data['distribution']
-        )
+    # Harvest, storage, cost and financial analysis
+    (annual_harvest, monthly_harvest, storage_sizes,
+     cost_analysis, financial_analysis) = calculator.analyze(
+        roof_area_sqft, rainfall_data, roof_material, system_type, region_type
+    )
 
-        # Calculate storage requirements
-        storage_sizes = calculator.calculate_optimal_storage_size(monthly_harvest)
+    # Generate recommendations
+    recommendations = generate_system_recommendations(
+        roof_area_sqft, annual_harvest, storage_sizes, cost_analysis, soil_data
+    )
 
-        # Calculate costs
-        optimal_capacity = storage_sizes['optimal_liters']
-        cost_analysis = calculator.calculate_system_cost(optimal_capacity, system_type)
+    # Generate implementation plan
+    implementation_plan = generate_implementation_plan(cost_analysis['total_cost'])
 
-        # Calculate financial analysis
-        financial_analysis = calculator.calculate_financial_analysis(
-            annual_harvest, cost_analysis['total_cost'], region_type
-        )
+    # Build response
+    response = {
+        'status': 'success',
+        'timestamp': datetime.now().isoformat(),
+        'location': {
+            'coordinates': {'lat': lat, 'lng': lng},
+            'address': location.get('address', f'Location {lat}, {lng}'),
+            'region_type': region_type
+        },
+        'climate_analysis': {
+            'annual_rainfall_mm': rainfall_data['annual'],
+            'rainfall_distribution': rainfall_data['distribution'],
+            'peak_months': get_peak_rainfall_months(rainfall_data['distribution']),
+            'collection_efficiency': 0.80 if system_type == 'standard' else 0.90
+        },
+        'soil_and_geology': soil_data,
+        'harvesting_potential': {
+            'roof_area_sqft': roof_area_sqft,
+            'annual_harvestable_liters': annual_harvest,
+            'monthly_potential': monthly_harvest,
+            'storage_recommendations': storage_sizes
+        },
+        'system_recommendations': recommendations,
+        'cost_analysis': cost_analysis,
+        'financial_analysis': financial_analysis,
+        'implementation_plan': implementation_plan,
+        'maintenance_schedule': generate_maintenance_schedule(),
+        'regulatory_info': generate_regulatory_info(lat, lng)
+    }
 
-        # Generate recommendations
-        recommendations = generate_system_recommendations(
-            roof_area_sqft, annual_harvest, storage_sizes, cost_analysis, soil_data
-        )
+    return response, 200
+
+
+@app.route('/api/v1/water-harvesting/analyze', methods=['POST'])
+def analyze_water_harvesting():
+    """Main API endpoint for water harvesting analysis"""
+
+    try:
+        data = orjson.loads(request.get_data(cache=False))
+    except orjson.JSONDecodeError:
+        return jsonify({'error': 'Request body must be valid JSON'}), 400
+
+    try:
+        payload, status = build_analysis(data)
+        return jsonify(payload), status
+
+    except Exception as e:
+        logger.error("Error in water harvesting analysis: %s", e)
+        return jsonify({'error': 'Internal server error', 'message': str(e)}), 500
+
+
+@app.route('/api/v1/water-harvesting/analyze-batch', methods=['POST'])
+def analyze_water_harvesting_batch():
+    """Analyze several sites in one request; each site uses the /analyze body format"""
+
+    try:
+        data = orjson.loads(request.get_data(cache=False))
+    except orjson.JSONDecodeError:
+        return jsonify({'error': 'Request body must be valid JSON'}), 400
 
-        # Generate implementation plan
-        implementation_plan = generate_implementation_plan(cost_analysis['total_cost'])
+    try:
+        sites = data.get('sites') if isinstance(data, dict) else None
+
+        if not sites or not isinstance(sites, list):
+            return jsonify({'error': 'A non-empty list of sites is required'}), 400
+
+        if len(sites) > MAX_BATCH_SITES:
+            return jsonify({'error': f'At most {MAX_BATCH_SITES} sites can be analyzed per batch'}), 400
+
+        # Sites in the same grid cell share cached rainfall/soil lookups
+        # Each result carries the HTTP status and body /analyze would return for that site
+        results = []
+        for site in sites:
+            try:
+                payload, status = build_analysis(site)
+            except Exception as e:
+                logger.error("Error in batch site analysis: %s", e)
+                payload, status = {'error': 'Internal server error', 'message': str(e)}, 500
+            results.append({'status': status, 'body': payload})
 
-        # Build response
-        response = {
+        return jsonify({
             'status': 'success',
             'timestamp': datetime.now().isoformat(),
-            'location': {
-                'coordinates': {'lat': lat, 'lng': lng},
-                'address': location.get('address', f'Location {lat}, {lng}'),
-                'region_type': region_type
-            },
-            'climate_analysis': {
-                'annual_rainfall_mm': rainfall_data['annual'],
-                'rainfall_distribution': rainfall_data['distribution'],
-                'peak_months': get_peak_rainfall_months(rainfall_data['distribution']),
-                'collection_efficiency': 0.80 if system_type == 'standard' else 0.90
-            },
-            'soil_and_geology': soil_data,
-            'harvesting_potential': {
-                'roof_area_sqft': roof_area_sqft,
-                'annual_harvestable_liters': annual_harvest,
-                'monthly_potential': monthly_harvest,
-                'storage_recommendations': storage_sizes
-            },
-            'system_recommendations': recommendations,
-            'cost_analysis': cost_analysis,
-            'financial_analysis': financial_analysis,
-            'implementation_plan': implementation_plan,
-            'maintenance_schedule': generate_maintenance_schedule(),
-            'regulatory_info': generate_regulatory_info(lat, lng)
-        }
-
-        return jsonify(response)
+            'count': len(results),
+            'results': results
+        })
 
     except Exception as e:
-        logger.error(f"Error in water harvesting analysis: {str(e)}")
+        logger.error("Error in batch water harvesting analysis: %s", e)
         return jsonify({'error': 'Internal server error', 'message': str(e)}), 500
 
 
@@ -505,114 +651,123 @@ def generate_system_recommendations(roof_area, annual_harvest, storage_sizes, co
     }
 
 
+# Implementation phases as (phase template, share of total cost)
+IMPLEMENTATION_PHASES = (
+    ({
+        'phase': 1,
+        'name': 'Planning and Permits',
+        'duration': '1-2 weeks',
+        'activities': [
+            'Site survey and measurements',
+            'Permit applications',
+            'Material procurement',
+            'Contractor selection'
+        ]
+    }, 0.15),
+    ({
+        'phase': 2,
+        'name': 'Installation',
+        'duration': '2-3 weeks',
+        'activities': [
+            'Excavation for underground tank',
+            'Tank installation and waterproofing',
+            'Plumbing and pipe laying',
+            'Electrical connections'
+        ]
+    }, 0.65),
+    ({
+        'phase': 3,
+        'name': 'Testing and Commissioning',
+        'duration': '1 week',
+        'activities': [
+            'System testing and leak checks',
+            'Filtration system setup',
+            'Pump installation and testing',
+            'User training and handover'
+        ]
+    }, 0.20)
+)
+
+# Static response sections, shared by every response (treat as read-only)
+MAINTENANCE_SCHEDULE = {
+    'monthly_tasks': [
+        'Visual inspection of gutters and downpipes',
+        'Check first flush diverter',
+        'Clean leaf guards and mesh filters',
+        'Test pump operation'
+    ],
+    'quarterly_tasks': [
+        'Clean storage tank (external)',
+        'Replace/clean filter media',
+        'Check pipe joints and connections',
+        'Water quality testing'
+    ],
+    'annual_tasks': [
+        'Complete tank cleaning and disinfection',
+        'Professional system audit',
+        'Replace worn components',
+        'Pump servicing'
+    ],
+    'estimated_annual_cost': 4500
+}
+
+DEFAULT_REGULATORY_INFO = {
+    'local_mandate': 'Check with local municipal corporation',
+    'required_permits': ['Building plan approval', 'Plumbing permit'],
+    'available_subsidies': 'Contact local water authority',
+    'compliance_timeline': 'Usually required before occupancy certificate',
+    'penalty_non_compliance': 'May affect water connection approval'
+}
+
+
 def generate_implementation_plan(total_cost):
     """Generate phased implementation plan"""
 
     return {
         'total_duration': '4-6 weeks',
         'phases': [
-            {
-                'phase': 1,
-                'name': 'Planning and Permits',
-                'duration': '1-2 weeks',
-                'activities': [
-                    'Site survey and measurements',
-                    'Permit applications',
-                    'Material procurement',
-                    'Contractor selection'
-                ],
-                'estimated_cost': round(total_cost * 0.15)
-            },
-            {
-                'phase': 2,
-                'name': 'Installation',
-                'duration': '2-3 weeks',
-                'activities': [
-                    'Excavation for underground tank',
-                    'Tank installation and waterproofing',
-                    'Plumbing and pipe laying',
-                    'Electrical connections'
-                ],
-                'estimated_cost': round(total_cost * 0.65)
-            },
-            {
-                'phase': 3,
-                'name': 'Testing and Commissioning',
-                'duration': '1 week',
-                'activities': [
-                    'System testing and leak checks',
-                    'Filtration system setup',
-                    'Pump installation and testing',
-                    'User training and handover'
-                ],
-                'estimated_cost': round(total_cost * 0.20)
-            }
+            {**phase, 'estimated_cost': round(total_cost * cost_share)}
+            for phase, cost_share in IMPLEMENTATION_PHASES
         ]
     }
 
 
 def generate_maintenance_schedule():
     """Generate maintenance schedule"""
-
-    return {
-        'monthly_tasks': [
-            'Visual inspection of gutters and downpipes',
-            'Check first flush diverter',
-            'Clean leaf guards and mesh filters',
-            'Test pump operation'
-        ],
-        'quarterly_tasks': [
-            'Clean storage tank (external)',
-            'Replace/clean filter media',
-            'Check pipe joints and connections',
-            'Water quality testing'
-        ],
-        'annual_tasks': [
-            'Complete tank cleaning and disinfection',
-            'Professional system audit',
-            'Replace worn components',
-            'Pump servicing'
-        ],
-        'estimated_annual_cost': 4500
-    }
+    return MAINTENANCE_SCHEDULE
 
 
 def generate_regulatory_info(lat, lng):
     """Generate regulatory information based on location"""
 
-    # Simplified state-based regulations
-    state_regulations = {
-        'delhi': {
-            'mandate': 'Mandatory for plots >100 sq m',
-            'subsidy': 'Up to ₹15,000 for residential',
-            'authority': 'Delhi Jal Board'
-        },
-        'karnataka': {
-            'mandate': 'Mandatory for plots >60×40 feet',
-            'subsidy': 'Up to ₹10,000 for residential',
-            'authority': 'Karnataka Urban Water Supply'
-        },
-        'tamil nadu': {
-            'mandate': 'Mandatory for all new buildings',
-            'subsidy': 'Up to ₹12,000 for residential',
-            'authority': 'Tamil Nadu Water Supply'
-        }
-    }
-
     # Default regulatory info
-    return {
-        'local_mandate': 'Check with local municipal corporation',
-        'required_permits': ['Building plan approval', 'Plumbing permit'],
-        'available_subsidies': 'Contact local water authority',
-        'compliance_timeline': 'Usually required before occupancy certificate',
-        'penalty_non_compliance': 'May affect water connection approval'
-    }
+    return DEFAULT_REGULATORY_INFO
 
 
 def get_peak_rainfall_months(distribution):
     """Get peak rainfall months from distribution"""
-    sorted_months = sorted(distribution.items(), key=lambda x: x[1], reverse=True)
-    return [month for month, _ in sorted_months[:3]]
+    return [month for month, _ in heapq.nlargest(3, distribution.items(), key=itemgetter(1))]
+
+
+@functools.lru_cache(maxsize=None)
+def _recharge_bonus(recharge_suitability: str) -> int:
+    """Soil suitability bonus; memoized over the handful of suitability texts"""
+    suitability = recharge_suitability.lower()
+    if 'excellent' in suitability:
+        return 30
+    elif 'good' in suitability:
+        return 20
+    return 10
+
+
+@functools.lru_cache(maxsize=None)
+def _depth_bonus(groundwater_depth: str) -> int:
+    """Groundwater depth bonus; memoized over the handful of depth bands"""
+    if '5-15' in groundwater_depth:
+        return 20
+    elif '10-25' in groundwater_depth:
+        return 15
+    return 10
 
 
 def calculate_suitability_score(annual_harvest, soil_data):
@@ -620,26 +775,21 @@ def calculate_suitability_score(annual_harvest, soil_data):
 
     base_score = min(100, (annual_harvest / 10000) * 50)  # Up to 50 points for harvest potential
 
-    # Soil suitability bonus
-    if 'excellent' in soil_data['recharge_suitability'].lower():
-        soil_bonus = 30
-    elif 'good' in soil_data['recharge_suitability'].lower():
-        soil_bonus = 20
-    else:
-        soil_bonus = 10
-
-    # Groundwater depth consideration
-    if '5-15' in soil_data['groundwater_depth']:
-        depth_bonus = 20
-    elif '10-25' in soil_data['groundwater_depth']:
-        depth_bonus = 15
-    else:
-        depth_bonus = 10
+    soil_bonus = _recharge_bonus(soil_data['recharge_suitability'])
+    depth_bonus = _depth_bonus(soil_data['groundwater_depth'])
 
     total_score = min(100, base_score + soil_bonus + depth_bonus)
     return round(total_score, 1)
 
 
+def _cacheable(response):
+    """Let clients cache a location lookup for the cache TTL and revalidate it by ETag (304)"""
+    response.cache_control.public = True
+    response.cache_control.max_age = LOCATION_CACHE_TTL_SECONDS
+    response.add_etag()
+    return response.make_conditional(request)
+
+
 @app.route('/api/v1/rainfall/<float:lat>/<float:lng>', methods=['GET'])
 def get_rainfall_data(lat, lng):
     """Get rainfall data for specific coordinates"""
@@ -647,11 +797,11 @@ def get_rainfall_data(lat, lng):
     try:
         rainfall_data = weather_service.get_rainfall_data(lat, lng)
 
-        return jsonify({
+        return _cacheable(jsonify({
             'status': 'success',
             'location': {'lat': lat, 'lng': lng},
             'rainfall_data': rainfall_data
-        })
+        }))
 
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -664,15 +814,16 @@ def get_soil_data(lat, lng):
     try:
         soil_data = soil_service.get_soil_type(lat, lng)
 
-        return jsonify({
+        return _cacheable(jsonify({
             'status': 'success',
             'location': {'lat': lat, 'lng': lng},
             'soil_data': soil_data
-        })
+        }))
 
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 
 if __name__ == '__main__':
-    app.run(debug=True, host='0.0.0.0', port=5000)
+    # Development server only; production runs under gunicorn (setup/gunicorn.conf.py)
+    app.run(debug=os.environ.get('FLASK_DEBUG', 'False').lower() == 'true', host='0.0.0.0', port=5000)